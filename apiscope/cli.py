@@ -1,37 +1,119 @@
 # apiscope/cli.py
+import importlib
+import sys
+from pathlib import Path
+from typing import Optional
+
 import click
 
 from .core.config import GLOBAL_CONFIG
-from .commands.init import init_command
-from .commands.list import list_command
-from .commands.search import search_command
-from .commands.describe import describe_command
-from .commands.note import note_command
+from .core.daemon import forward
+from .core.output import DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS, flush_output, set_output_format
+from .core.profiling import instrument, timed
+
+
+# Subcommands as "module:attribute", imported the first time they are used
+# so that an invocation only loads the command it runs
+COMMANDS = {
+    "init": "apiscope.commands.init:init_command",
+    "list": "apiscope.commands.list:list_command",
+    "search": "apiscope.commands.search:search_command",
+    "describe": "apiscope.commands.describe:describe_command",
+    "fetch": "apiscope.commands.fetch:fetch_command",
+    "note": "apiscope.commands.note:note_command",
+    "serve": "apiscope.commands.serve:serve_command",
+    "rpc": "apiscope.commands.rpc:rpc_command",
+}
+
+
+class ApiscopeGroup(click.Group):
+    """
+    Command group that loads subcommands lazily and hands read-only
+    commands to a running daemon.
+    """
 
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
 
-@click.group()
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module_name, attribute = self.lazy_commands[cmd_name].split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            self.add_command(command, name=cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def main(self, args=None, **kwargs):
+        argv = list(sys.argv[1:] if args is None else args)
+        exit_code = forward(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+        return super().main(args=argv, **kwargs)
+
+
+@click.group(cls=ApiscopeGroup, lazy_commands=COMMANDS)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS),
+    default=DEFAULT_OUTPUT_FORMAT,
+    envvar="APISCOPE_FORMAT",
+    show_default=True,
+    help="Output format: LogLight text, one JSON document, JSON lines, "
+         "or payloads only"
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    default=False,
+    help="Report time and peak memory growth of each step on stderr"
+)
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write step timings to FILE as a Chrome trace"
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Run under cProfile and write a dump to .apiscope/profiles/"
+)
 @click.pass_context
-def cli(ctx: click.Context) -> None:
+def cli(
+    ctx: click.Context,
+    output_format: str,
+    timings: bool,
+    trace: Optional[Path],
+    profile: bool
+) -> None:
     """
     LLM API Scope - Index, search, and query API documentation.
     """
+    set_output_format(output_format)
+    ctx.call_on_close(flush_output)
+    if timings or trace is not None or profile:
+        # Close callbacks run last-registered first, so the timings are
+        # reported before the json document is flushed
+        ctx.call_on_close(
+            instrument(ctx.invoked_subcommand or "apiscope", timings, trace, profile)
+        )
+
     # Try to load config automatically
-    try:
-        GLOBAL_CONFIG.load()
-    except RuntimeError:
-        # Not initialized yet, that's okay for init command
-        pass
+    with timed("Discover and parse configuration"):
+        try:
+            GLOBAL_CONFIG.load()
+        except RuntimeError:
+            # Not initialized yet, that's okay for init command
+            pass
 
     # Store in context for commands that need explicit access
     ctx.obj = GLOBAL_CONFIG
 
 
-# Register commands using decorator pattern
-cli.add_command(init_command, name="init")
-cli.add_command(list_command, name="list")
-cli.add_command(search_command, name="search")
-cli.add_command(describe_command, name="describe")
-cli.add_command(note_command, name="note")
-
 if __name__ == "__main__":
     cli()
@@ -4,13 +4,17 @@ Generate structured JSON documentation for a specific API endpoint.
 Uses LogLight-style output for consistent, concise logging.
 """
 import json
-from typing import Any, Tuple, Dict, Optional
+from typing import IO, Any, Tuple, Dict, List, Optional
 
 import click
 
-from ..core.output import OutputBuilder
+from ..core.output import OutputBuilder, get_output_format
 from ..core.config import GLOBAL_CONFIG
-from ..core.parser import get_spec, ParserError
+from ..core.describe_store import DescribeStore
+from ..core.index import HTTP_METHODS
+from ..core.parser import SpecSource, open_spec, ParserError
+from ..core.refs import get_ref_cache
+from ..core.router import PathRouter
 
 
 def _parse_path_method(path_method: str) -> Tuple[str, str]:
@@ -45,10 +49,23 @@ def _parse_path_method(path_method: str) -> Tuple[str, str]:
     return path, method
 
 
+def _add_ref_info(result: Dict[str, Any], ref: str) -> None:
+    """Record a $ref and the kind of component it points to in result."""
+    result["$ref"] = ref
+    if "#/components/schemas/" in ref:
+        result["ref_type"] = "schema"
+        result["schema_name"] = ref.split("/")[-1]
+    elif "#/components/parameters/" in ref:
+        result["ref_type"] = "parameter"
+    elif "#/components/responses/" in ref:
+        result["ref_type"] = "response"
+
+
 def _extract_schema_basics(spec: Any, schema: Any) -> Dict[str, Any]:
     """
     Extract basic schema information for LLM understanding.
-    Returns essential fields without deep recursion.
+    Returns essential fields without deep recursion. Resolved references
+    are memoized per spec and cycles stop at the repeated reference.
 
     Args:
         spec: OpenAPI object for reference resolution
@@ -66,39 +83,31 @@ def _extract_schema_basics(spec: Any, schema: Any) -> Dict[str, Any]:
         # Handle references first - resolve to actual content
         if "$ref" in schema:
             ref = str(schema["$ref"])
-            try:
-                # Parse reference path: remove #/ prefix and split by /
-                if ref.startswith("#/"):
-                    path_parts = ref[2:].split("/")  # Remove #/ and split
-                else:
-                    path_parts = ref.split("/")
-
-                # Navigate to the referenced schema using SchemaPath / operator
-                resolved = spec.spec
-                for part in path_parts:
-                    resolved = resolved / part
-
-                # Recursively extract info from resolved schema
-                result = _extract_schema_basics(spec, resolved)
-                # Keep original reference info for context
-                result["$ref"] = ref
-                if "#/components/schemas/" in ref:
-                    result["ref_type"] = "schema"
-                    result["schema_name"] = ref.split("/")[-1]
-                elif "#/components/parameters/" in ref:
-                    result["ref_type"] = "parameter"
-                elif "#/components/responses/" in ref:
-                    result["ref_type"] = "response"
-            except Exception:
-                # Fallback to reference info only if resolution fails
-                result["$ref"] = ref
-                if "#/components/schemas/" in ref:
-                    result["ref_type"] = "schema"
-                    result["schema_name"] = ref.split("/")[-1]
-                elif "#/components/parameters/" in ref:
-                    result["ref_type"] = "parameter"
-                elif "#/components/responses/" in ref:
-                    result["ref_type"] = "response"
+            refs = get_ref_cache(spec)
+
+            cached = refs.get_summary(ref)
+            if cached is not None:
+                result = cached
+            elif refs.is_active(ref):
+                # Self-referential schema: stop at the repeated reference
+                result = {"circular": True}
+                _add_ref_info(result, ref)
+            else:
+                summary = None
+                refs.enter(ref)
+                try:
+                    try:
+                        resolved = refs.resolve(spec.spec, ref)
+                        # Recursively extract info from resolved schema
+                        result = _extract_schema_basics(spec, resolved)
+                    except Exception:
+                        # Fallback to reference info only if resolution fails
+                        result = {}
+                    # Keep original reference info for context
+                    _add_ref_info(result, ref)
+                    summary = result
+                finally:
+                    refs.leave(ref, summary)
 
         # Handle arrays
         elif "items" in schema:
@@ -159,23 +168,25 @@ def _extract_operation_info(spec: Any, path: str, method: str) -> dict:
     Raises:
         KeyError: If path or method not found
     """
+    # Check existence first: SchemaPath navigation only fails when the
+    # operation is read, with the bare missing key as the message
+    paths = spec.spec.get("paths", {})
+    if path not in paths:
+        available_paths = list(paths.keys())
+        display_paths = available_paths[:5]
+        extra = f" (+{len(available_paths)-5} more)" if len(available_paths) > 5 else ""
+        raise KeyError(f"Path '{path}' not found. Available: {', '.join(display_paths)}{extra}")
+
+    path_obj = paths[path]
+    if method not in path_obj:
+        available_methods = list(path_obj.keys())
+        raise KeyError(f"Method '{method}' not found for path '{path}'. Available: {', '.join(available_methods)}")
+
     # Try SchemaPath navigation first
     try:
         operation = spec.spec / "paths" / path / method
     except (KeyError, TypeError):
         # Fall back to dictionary navigation
-        paths = spec.spec.get("paths", {})
-        if path not in paths:
-            available_paths = list(paths.keys())
-            display_paths = available_paths[:5]
-            extra = f" (+{len(available_paths)-5} more)" if len(available_paths) > 5 else ""
-            raise KeyError(f"Path '{path}' not found. Available: {', '.join(display_paths)}{extra}")
-
-        path_obj = paths[path]
-        if method not in path_obj:
-            available_methods = list(path_obj.keys())
-            raise KeyError(f"Method '{method}' not found for path '{path}'. Available: {', '.join(available_methods)}")
-
         operation = path_obj[method]
 
     # Build structured result
@@ -281,9 +292,297 @@ def _extract_operation_info(spec: Any, path: str, method: str) -> dict:
     return result
 
 
+def _render_operations(spec: Any) -> List[Tuple[str, str, bytes]]:
+    """
+    Render the describe JSON of every operation in a specification.
+
+    Operations that fail to render are left out; describe then falls back
+    to extracting them from the parsed spec.
+
+    Returns:
+        List of (path, method, compact JSON bytes)
+    """
+    documents = []
+    for path, path_obj in spec.spec.get("paths", {}).items():
+        for method in path_obj.keys():
+            if method not in HTTP_METHODS:
+                continue
+            try:
+                operation_info = _extract_operation_info(spec, str(path), str(method))
+            except Exception:
+                continue
+            document = json.dumps(operation_info, ensure_ascii=False).encode("utf-8")
+            documents.append((str(path), str(method), document))
+    return documents
+
+
+def _build_describe_store(store: DescribeStore, source: SpecSource) -> int:
+    """
+    Render all operations of a spec version into the describe store.
+
+    Returns:
+        Number of stored operations.
+
+    Raises:
+        ParserError: If the specification cannot be loaded.
+    """
+    spec = source.load()
+    documents = _render_operations(spec)
+    store.save(source.name, source.digest, documents, PathRouter.spec_routes(spec))
+    return len(documents)
+
+
+def warm_describe_store(source: SpecSource) -> int:
+    """
+    Make sure the describe store holds the current version of a spec.
+
+    Returns:
+        Number of stored operations.
+
+    Raises:
+        ParserError: If the specification cannot be loaded.
+    """
+    with DescribeStore(GLOBAL_CONFIG.describe_store_path) as store:
+        if store.has(source.digest):
+            return store.count(source.digest)
+        return _build_describe_store(store, source)
+
+
+def _lookup_document(
+    store: DescribeStore,
+    digest: str,
+    path: str,
+    method: str,
+    output: Optional[OutputBuilder] = None
+) -> Tuple[Optional[bytes], str, Optional[Dict[str, str]]]:
+    """
+    Look up the rendered document of an operation.
+
+    Concrete request paths (/repos/acme/api) are resolved to their
+    template using the routes stored with the spec version.
+
+    Returns:
+        Tuple of (JSON bytes or None if not stored, path template,
+        path parameters if the path was resolved)
+    """
+    document = store.get(digest, path, method)
+    if document is not None:
+        return document, path, None
+
+    routes = store.routes(digest)
+    if routes is None or path in routes[0]:
+        return None, path, None
+
+    if output:
+        output.action(f"Resolving request path: {path}")
+    route = PathRouter(*routes).resolve(path)
+    if route is None:
+        if output:
+            output.note("No path template matches")
+        return None, path, None
+
+    if output:
+        output.result(f"Matched template: {route.template}")
+    return store.get(digest, route.template, method), route.template, route.params
+
+
+def _format_document(
+    document: bytes,
+    path_params: Optional[Dict[str, str]],
+    indent: Optional[int]
+) -> str:
+    """
+    Turn a stored document into output text.
+
+    Stored documents are compact JSON, so they are only re-encoded when
+    path parameters must be added or indentation was requested.
+    """
+    if not path_params and indent is None:
+        return document.decode("utf-8")
+
+    operation_info = json.loads(document)
+    if path_params:
+        operation_info["pathParameters"] = path_params
+    return json.dumps(operation_info, indent=indent, ensure_ascii=False)
+
+
+def describe_endpoint(
+    store: DescribeStore,
+    source: SpecSource,
+    path_method: str
+) -> Tuple[bytes, Optional[Dict[str, str]]]:
+    """
+    Describe one endpoint of an already opened spec without logging.
+    Shared by batch describe and the JSON-RPC server.
+
+    Returns:
+        Tuple of (JSON bytes, path parameters if the path was resolved)
+
+    Raises:
+        ValueError: If the identifier is invalid
+        KeyError: If the endpoint does not exist
+        ParserError: If the spec has to be parsed and cannot be loaded
+    """
+    path, method = _parse_path_method(path_method)
+    document, path, path_params = _lookup_document(store, source.digest, path, method)
+    if document is None:
+        try:
+            operation_info = _extract_operation_info(source.load(), path, method)
+        except KeyError as e:
+            raise KeyError(f"No operation matches '{method.upper()} {path}': {e.args[0]}") from e
+        document = json.dumps(operation_info, ensure_ascii=False).encode("utf-8")
+    return document, path_params
+
+
+def _describe_single(
+    output: OutputBuilder,
+    name: str,
+    path_method: str,
+    force: bool,
+    pretty: bool
+) -> None:
+    """Describe one endpoint, printing the process log and then its JSON."""
+    # Parse input parameters
+    output.action("Parsing endpoint identifier")
+    try:
+        path, method = _parse_path_method(path_method)
+        output.result(f"Parsed: path='{path}', method='{method.upper()}'")
+    except ValueError as e:
+        output.error(f"Invalid format: {e}")
+        output.note("Use format: path:method (e.g., /pet:PUT)")
+        output.complete("Describe")
+        output.emit()
+        raise click.ClickException("Describe failed")
+
+    # Get the specification; it is only parsed to render a new version
+    output.action(f"Loading specification: {name}")
+    try:
+        source = open_spec(name, force)
+        output.result("Specification loaded successfully")
+        with DescribeStore(GLOBAL_CONFIG.describe_store_path) as store:
+            if not store.has(source.digest):
+                output.action("Rendering documentation for all endpoints")
+                count = _build_describe_store(store, source)
+                output.result(f"Describe store ready: {count} endpoint(s)")
+            document, path, path_params = _lookup_document(
+                store, source.digest, path, method, output
+            )
+    except ParserError as e:
+        output.error(f"Failed to load specification: {e}")
+        output.complete("Describe")
+        output.emit()
+        raise click.ClickException("Describe failed")
+
+    # Extract operation information
+    output.action(f"Locating endpoint: {path}:{method.upper()}")
+    if document is None:
+        # Not rendered: describe from the parsed spec, which also
+        # reports the available paths/methods when it does not exist
+        try:
+            operation_info = _extract_operation_info(source.load(), path, method)
+        except (KeyError, ParserError) as e:
+            # KeyError's str() adds quotes around the message
+            message = str(e.args[0]) if isinstance(e, KeyError) and e.args else str(e)
+            output.error(f"Endpoint not found: {message}")
+            output.complete("Describe")
+            output.emit()
+            raise click.ClickException("Describe failed")
+        document = json.dumps(operation_info, ensure_ascii=False).encode("utf-8")
+    output.result("Endpoint found")
+
+    # Generate JSON output
+    output.action("Generating JSON documentation")
+
+    # JSON lines output must stay on one line
+    indent = 2 if pretty and get_output_format() != "ndjson" else None
+    json_output = _format_document(document, path_params, indent)
+
+    output.result("JSON documentation generated")
+    output.complete("Describe")
+
+    # Output process log first, then JSON
+    output.data(json_output)
+    output.emit()
+
+
+def _describe_batch(
+    output: OutputBuilder,
+    name: str,
+    path_methods: List[str],
+    force: bool,
+    pretty: bool,
+    ndjson: bool
+) -> None:
+    """
+    Describe several endpoints against one loaded spec.
+
+    Results are printed in input order as a JSON array, or one JSON object
+    per line with ndjson. Endpoints that cannot be described appear as
+    {"request": ..., "error": ...} entries and make the command fail after
+    all results are printed.
+    """
+    output.action(f"Loading specification: {name}")
+    try:
+        source = open_spec(name, force)
+        output.result("Specification loaded successfully")
+    except ParserError as e:
+        output.error(f"Failed to load specification: {e}")
+        output.complete("Describe")
+        output.emit()
+        raise click.ClickException("Describe failed")
+
+    output.action(f"Describing {len(path_methods)} endpoint(s)")
+    entries: List[str] = []
+    failures = 0
+    # Structured formats carry each result as its own payload
+    separate = ndjson or get_output_format() in ("json", "ndjson")
+    indent = 2 if pretty and not ndjson and get_output_format() != "ndjson" else None
+
+    with DescribeStore(GLOBAL_CONFIG.describe_store_path) as store:
+        if not store.has(source.digest):
+            output.action("Rendering documentation for all endpoints")
+            count = _build_describe_store(store, source)
+            output.result(f"Describe store ready: {count} endpoint(s)")
+
+        for path_method in path_methods:
+            try:
+                document, path_params = describe_endpoint(store, source, path_method)
+                entries.append(_format_document(document, path_params, indent))
+            except (ValueError, KeyError, ParserError) as e:
+                failures += 1
+                # KeyError's str() adds quotes around the message
+                message = str(e.args[0]) if isinstance(e, KeyError) and e.args else str(e)
+                output.error(f"{path_method}: {message}")
+                error = {"request": path_method, "error": message}
+                entries.append(json.dumps(error, indent=indent, ensure_ascii=False))
+
+    output.result(f"Described {len(path_methods) - failures}/{len(path_methods)} endpoint(s)")
+    output.complete("Describe")
+
+    # Output process log first, then JSON
+    if separate:
+        for entry in entries:
+            output.data(entry)
+    elif pretty:
+        output.data("[\n" + ",\n".join(entries) + "\n]" if entries else "[]")
+    else:
+        output.data("[" + ", ".join(entries) + "]")
+    output.emit()
+
+    if failures:
+        raise click.ClickException(f"{failures} endpoint(s) could not be described")
+
+
 @click.command()
 @click.argument("name", type=str)
-@click.argument("path_method", type=str)
+@click.argument("path_methods", nargs=-1, type=str)
+@click.option(
+    "--input", "-i",
+    "input_file",
+    type=click.File("r"),
+    default=None,
+    help="Read PATH_METHOD identifiers from a file, one per line ('-' for stdin)"
+)
 @click.option(
     "--force",
     is_flag=True,
@@ -296,12 +595,28 @@ def _extract_operation_info(spec: Any, path: str, method: str) -> dict:
     default=False,
     help="Pretty-print JSON output with indentation"
 )
-def describe_command(name: str, path_method: str, force: bool, pretty: bool):
+@click.option(
+    "--ndjson",
+    is_flag=True,
+    default=False,
+    help="Print one JSON object per line instead of a JSON array"
+)
+def describe_command(
+    name: str,
+    path_methods: Tuple[str, ...],
+    input_file: Optional[IO[str]],
+    force: bool,
+    pretty: bool,
+    ndjson: bool
+):
     """
-    Generate structured JSON documentation for a specific API endpoint.
+    Generate structured JSON documentation for API endpoints.
 
     NAME: Name of the API specification from configuration
-    PATH_METHOD: Endpoint identifier in format "path:method"
+    PATH_METHODS: Endpoint identifiers in format "path:method"
+
+    A single identifier prints one JSON object. Several identifiers (or
+    --input) print a JSON array, or NDJSON with --ndjson.
     """
     output = OutputBuilder()
     output.section("Describe")
@@ -315,56 +630,24 @@ def describe_command(name: str, path_method: str, force: bool, pretty: bool):
         output.emit()
         return
 
-    try:
-        # Parse input parameters
-        output.action("Parsing endpoint identifier")
-        try:
-            path, method = _parse_path_method(path_method)
-            output.result(f"Parsed: path='{path}', method='{method.upper()}'")
-        except ValueError as e:
-            output.error(f"Invalid format: {e}")
-            output.note("Use format: path:method (e.g., /pet:PUT)")
-            output.complete("Describe")
-            output.emit()
-            raise click.ClickException("Describe failed")
+    identifiers = list(path_methods)
+    if input_file is not None:
+        for line in input_file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                identifiers.append(line)
 
-        # Get the specification
-        output.action(f"Loading specification: {name}")
-        try:
-            spec = get_spec(name, force)
-            output.result("Specification loaded successfully")
-        except ParserError as e:
-            output.error(f"Failed to load specification: {e}")
-            output.complete("Describe")
-            output.emit()
-            raise click.ClickException("Describe failed")
-
-        # Extract operation information
-        output.action(f"Locating endpoint: {path}:{method.upper()}")
-        try:
-            operation_info = _extract_operation_info(spec, path, method)
-            output.result("Endpoint found")
-        except KeyError as e:
-            output.error(f"Endpoint not found: {e}")
-            output.complete("Describe")
-            output.emit()
-            raise click.ClickException("Describe failed")
+    if not identifiers:
+        raise click.UsageError("Provide at least one PATH_METHOD or use --input")
 
-        # Generate JSON output
-        output.action("Generating JSON documentation")
-
-        # Convert to JSON with appropriate formatting
-        indent = 2 if pretty else None
-        json_output = json.dumps(operation_info, indent=indent, ensure_ascii=False)
-
-        output.result("JSON documentation generated")
-        output.complete("Describe")
-
-        # Output process log first, then JSON
-        output.emit()
-        print()  # Add blank line for separation
-        print(json_output)
+    try:
+        if len(identifiers) == 1 and input_file is None and not ndjson:
+            _describe_single(output, name, identifiers[0], force, pretty)
+        else:
+            _describe_batch(output, name, identifiers, force, pretty, ndjson)
 
+    except click.ClickException:
+        raise
     except Exception as e:
         # Catch any unexpected errors
         output.error(f"Unexpected error: {e}")
@@ -0,0 +1,205 @@
+# apiscope/commands/fetch.py
+"""
+Warm the cache for every configured API specification.
+Uses LogLight-style output for consistent, concise logging.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+from ..core.output import OutputBuilder
+from ..core.config import GLOBAL_CONFIG
+from ..core.httpcache import HttpCache
+from ..core.index import get_endpoint_index
+from ..core.parser import (
+    DEFAULT_FETCH_CONCURRENCY,
+    FetchResult,
+    fetch_remote_specs,
+    open_spec,
+)
+from .describe import warm_describe_store
+
+
+def _warm_spec(name: str) -> Tuple[float, Optional[str]]:
+    """
+    Load, index and render one specification so its snapshot, search index
+    and describe store are written.
+
+    Runs in a worker process. Returns (seconds, error message or None);
+    it never raises.
+    """
+    start = time.perf_counter()
+    try:
+        source = open_spec(name)
+        get_endpoint_index(source)
+        warm_describe_store(source)
+    except Exception as e:
+        # Report any failure for this spec alone; an exception escaping the
+        # worker would abort the pool map and hide every other spec's result
+        return time.perf_counter() - start, str(e) or type(e).__name__
+    return time.perf_counter() - start, None
+
+
+def _format_size(size: int) -> str:
+    """Format a byte count for the timing table."""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size} B"
+
+
+def _format_table(rows: List[List[str]]) -> List[str]:
+    """Left-align rows into fixed-width columns."""
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return [
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in rows
+    ]
+
+
+@click.command()
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Force refresh cache for remote specifications"
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_FETCH_CONCURRENCY,
+    show_default=True,
+    help="Maximum number of concurrent downloads"
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of parser processes (default: CPU count)"
+)
+def fetch_command(force: bool, concurrency: int, workers: Optional[int]):
+    """
+    Download and parse every configured API specification.
+
+    Remote specifications are downloaded concurrently, then all
+    specifications are parsed in a process pool so later commands start
+    from a warm cache.
+    """
+    output = OutputBuilder()
+    output.section("Fetch")
+
+    # Check if configuration is initialized
+    if not GLOBAL_CONFIG.is_initialized:
+        output.action("Checking configuration state")
+        output.note("Configuration not initialized")
+        output.note("Run 'apiscope init' first")
+        output.complete("Fetch")
+        output.emit()
+        return
+
+    try:
+        output.action("Reading configuration")
+        specs = GLOBAL_CONFIG.get_classified_specs()
+
+        names = []
+        for name, (spec_type, source) in specs.items():
+            if spec_type == "UNKNOWN":
+                output.note(f"Skipping '{name}': invalid source {source}")
+            else:
+                names.append(name)
+
+        if not names:
+            output.note("No API specifications to fetch")
+            output.complete("Fetch")
+            output.emit()
+            return
+
+        output.result(f"Found {len(names)} API specification(s)")
+
+        # 1. Download remote specifications concurrently
+        urls = [specs[name][1] for name in names if specs[name][0] == "URL"]
+        downloads: Dict[str, FetchResult] = {}
+        if urls:
+            output.action(f"Downloading {len(urls)} remote specification(s)")
+            output.progress(f"Fetching with concurrency {concurrency}...")
+            start = time.perf_counter()
+            for fetched in fetch_remote_specs(urls, force, concurrency):
+                downloads[fetched.url] = fetched
+            output.result(f"Downloads finished in {time.perf_counter() - start:.2f}s")
+
+        # 2. Parse everything that is now available locally
+        parse_names = [
+            name for name in names
+            if specs[name][0] == "FILE" or downloads[specs[name][1]].ok
+        ]
+        parses: Dict[str, Tuple[float, Optional[str]]] = {}
+        if parse_names:
+            output.action(f"Parsing and indexing {len(parse_names)} specification(s)")
+            start = time.perf_counter()
+            max_workers = min(workers or len(parse_names), len(parse_names))
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                for name, parsed in zip(parse_names, pool.map(_warm_spec, parse_names)):
+                    parses[name] = parsed
+            output.result(f"Parsing finished in {time.perf_counter() - start:.2f}s")
+
+        # 3. Report per-spec timings
+        rows = [["NAME", "TYPE", "FETCH", "STATUS", "SIZE", "PARSE"]]
+        failures = 0
+        for name in names:
+            spec_type, source = specs[name]
+            fetched = downloads.get(source)
+
+            fetch_time = f"{fetched.seconds:.2f}s" if fetched else "-"
+            status = fetched.status if fetched else "local"
+            size = _format_size(fetched.size) if fetched and fetched.ok else "-"
+
+            if name in parses:
+                parse_seconds, parse_error = parses[name]
+                parse_time = f"{parse_seconds:.2f}s"
+                if parse_error:
+                    status = "invalid"
+            else:
+                parse_time = "-"
+
+            rows.append([name, spec_type, fetch_time, status, size, parse_time])
+
+            if fetched and not fetched.ok:
+                failures += 1
+                output.error(f"{name}: {fetched.error}")
+            elif name in parses and parses[name][1]:
+                failures += 1
+                output.error(f"{name}: {parses[name][1]}")
+
+        output.raw("---")
+        for line in _format_table(rows):
+            output.raw(line)
+        output.raw("---")
+
+        with HttpCache(GLOBAL_CONFIG.http_cache_path) as cache:
+            stats = cache.stats()
+        output.result(
+            f"HTTP cache: {stats['entries']} entries, "
+            f"{_format_size(stats['stored_size'])} stored "
+            f"({_format_size(stats['size'])} uncompressed)"
+        )
+
+        if failures:
+            output.note(f"{failures} specification(s) could not be fetched")
+        else:
+            output.result(f"All {len(names)} specification(s) ready")
+
+        output.complete("Fetch")
+
+    except Exception as e:
+        output.error(f"Unexpected error during fetch: {e}")
+        output.complete("Fetch")
+        output.emit()
+        raise click.ClickException("Fetch failed")
+
+    output.emit()
+
+    if failures:
+        raise click.ClickException("Fetch incomplete")
@@ -3,8 +3,10 @@
 List all configured API specifications.
 Uses LogLight-style output for consistent, concise logging.
 """
+import json
+
 import click
-from ..core.output import OutputBuilder
+from ..core.output import OutputBuilder, get_output_format
 from ..core.config import GLOBAL_CONFIG
 
 @click.command()
@@ -14,6 +16,9 @@ def list_command():
 
     Displays each specification with its type and source.
     Provides guidance for invalid formats.
+
+    Formats other than text get one {"specs": [{"name", "type", "source"}]}
+    payload instead of a line per specification.
     """
     output = OutputBuilder()
     output.section("Listing API Specifications")
@@ -33,6 +38,15 @@ def list_command():
         specs = GLOBAL_CONFIG.get_classified_specs()
         output.result(f"Configuration file: {GLOBAL_CONFIG.file}")
 
+        structured = get_output_format() != "text"
+        if structured:
+            output.data(json.dumps({
+                "specs": [
+                    {"name": name, "type": spec_type, "source": source}
+                    for name, (spec_type, source) in specs.items()
+                ]
+            }, ensure_ascii=False))
+
         if not specs:
             output.action("Checking configured APIs")
             output.note("No API specifications found")
@@ -48,20 +62,21 @@ def list_command():
         # Display found specifications
         output.action(f"Found {len(specs)} API specification(s)")
 
-        has_unknown = False
+        has_unknown = any(spec_type == "UNKNOWN" for spec_type, _ in specs.values())
 
-        for name, (spec_type, cleaned_source) in specs.items():
-            # Format for display - truncate long sources
-            display_source = cleaned_source
-            if len(cleaned_source) > 60:
-                display_source = cleaned_source[:57] + "..."
+        # Structured formats list them in the payload
+        if not structured:
+            for name, (spec_type, cleaned_source) in specs.items():
+                # Format for display - truncate long sources
+                display_source = cleaned_source
+                if len(cleaned_source) > 60:
+                    display_source = cleaned_source[:57] + "..."
 
-            # Choose marker based on type
-            if spec_type == "UNKNOWN":
-                output.note(f"{name}, {spec_type}, {display_source}")
-                has_unknown = True
-            else:
-                output.result(f"{name}, {spec_type}, {display_source}")
+                # Choose marker based on type
+                if spec_type == "UNKNOWN":
+                    output.note(f"{name}, {spec_type}, {display_source}")
+                else:
+                    output.result(f"{name}, {spec_type}, {display_source}")
 
         # Provide guidance for unknown entries
         if has_unknown:
@@ -2,20 +2,17 @@
 import click
 import sys
 import json
-from pathlib import Path
 from datetime import datetime
-import hashlib
 import math
 
-from ...core.output import OutputBuilder
+from ...core.output import OutputBuilder, get_output_format
 from ...core.config import GlobalConfig
 from .constants import (
     DEFAULT_MAX_NOTES,
     DEFAULT_MAX_BYTES,
     README_CONTENT,
     TEMPLATES,
-    TYPE_NAMES,
-    PATTERNS
+    TYPE_NAMES
 )
 from .utils import (
     ensure_readme,
@@ -23,13 +20,16 @@ from .utils import (
     get_auth_lock_path,
     get_auth_file_path
 )
+from .manifest import NoteManifest
 from .core import (
+    PATTERN_AUTOMATON,
+    NoteError,
+    add_annotation,
     find_temporal_clusters,
     find_cognitive_clusters,
     validate_auth_structure,
-    validate_auth_file
+    write_note
 )
-from ...core.trie import build_pattern_trie, match_patterns_in_sequence
 from ...core.clustering import calculate_temporal_concentration
 
 
@@ -63,113 +63,77 @@ def note_command(ctx):
 def write(ctx, author, note_type, context):
     """Do you have something you want to record?"""
     config = ctx.obj
-    notes_dir = config.home / "notes"
-    lock_dir = notes_dir / ".lock"
 
     output = OutputBuilder()
 
-    # Check if author has completed identity authentication
-    auth_path = get_auth_file_path(config, author)
-    if not validate_auth_file(auth_path):
-        output.error(f"Author '{author}' has not completed identity authentication.")
-        output.note(f"Run 'apiscope note auth --name {author} --json {{...}}' to establish your digital identity first.")
+    try:
+        written = write_note(config, author, note_type, context)
+    except NoteError as e:
+        output.error(str(e))
+        for hint in e.hints:
+            output.note(hint)
         output.emit(to_stderr=True)
         ctx.exit(1)
 
-    # Step 1: compute lock file path (based on author hash)
-    author_hash = hashlib.sha256(author.encode()).hexdigest()[:16]
-    lock_path = lock_dir / f"{author_hash}.lock"
-
-    # Step 2: check if lock exists → phase 2, otherwise phase 1
-    if lock_path.exists():
-        # ---------- PHASE 2: complete the note ----------
-        # 2a. read timestamp and type from lock
-        lock_data = lock_path.read_text().strip().split('|')
-        if len(lock_data) != 2:
-            output.error("Invalid lock file format. You may need to remove the lock file and start over.")
-            output.emit(to_stderr=True)
-            ctx.exit(1)
-
-        timestamp, locked_type = lock_data
-
-        # 2b. verify type matches
-        if locked_type != note_type:
-            output.error(f"Unfinished draft (type {locked_type}) exists.")
-            output.note(f"Consider: does your current content (type {note_type}) belong to that draft?")
-            output.note(f"If yes, complete it: apiscope note write --author {author} --type {locked_type} \"<your content>\"")
-            output.note(f"If not, first finish the draft (with its own content), then create a new {note_type} note.")
-            output.emit(to_stderr=True)
-            ctx.exit(1)
-
-        # 2c. reconstruct note path
-        note_path = notes_dir / author / f"{timestamp}.{note_type}.note.txt"
-
-        # 2c. validate note file: must exist and be empty
-        if not note_path.exists():
-            output.error(f"Note file {note_path} does not exist. You may need to remove the lock file and start over.")
-            output.emit(to_stderr=True)
-            ctx.exit(1)
-
-        if note_path.stat().st_size != 0:
-            output.error(f"Note file {note_path} is not empty. Check the file content and remove the lock manually.")
-            output.emit(to_stderr=True)
-            ctx.exit(1)
-
-        # 2d. parse timestamp to human-readable format
-        dt = datetime.strptime(timestamp, "%Y%m%d_%H%M%S")
-        human_time = dt.strftime("%Y-%m-%d %H:%M:%S")
-
-        # 2e. build content using template
-        template = TEMPLATES[note_type]["context_template"]
-        content = template.format(
-            author=author,
-            time=human_time,
-            context=context
-        )
-
-        # 2f. write content to file
-        with open(note_path, "w", encoding="utf-8") as f:
-            f.write(content + "\n")
-
-        # 2i. remove lock file
-        lock_path.unlink()
-
-        # 2j. output success message
+    if written["phase"] == "recorded":
         output.section("Note Recorded")
-        output.result(f"Note recorded: {note_path}")
+        output.result(f"Note recorded: {written['path']}")
         output.complete("Note Recorded")
         output.emit()
-
     else:
-        # ---------- PHASE 1: create empty note and lock ----------
-        # 1a. generate timestamp
-        now = datetime.now()
-        timestamp = now.strftime("%Y%m%d_%H%M%S")
-
-        # 1b. ensure author directory exists
-        author_dir = notes_dir / author
-        author_dir.mkdir(parents=True, exist_ok=True)
-
-        # 1c. build note path
-        note_path = author_dir / f"{timestamp}.{note_type}.note.txt"
-
-        # 1d. create empty note file
-        note_path.touch()
-
-        # 1e. write timestamp and type to lock file
-        lock_path.write_text(f"{timestamp}|{note_type}")
-
-        # 1f. output guiding questions
+        # Draft created: output guiding questions
         output.section("Note Creation")
         output.action("Validating author and note type")
         output.result(f"Author: {author}")
         output.result(f"Note type: {note_type}")
-        question = TEMPLATES[note_type]["question_template"].format(context=context)
-        output.note(question)
+        output.note(written["question"])
         output.complete("Note Creation")
         output.emit()
 
 
+def _read_document(author, note_files, page_map, max_notes, max_bytes):
+    """Build the 'note read' payload of the structured output formats.
+
+    Notes are listed in reading order with the same limits as the text
+    output: at most max_notes notes and max_bytes bytes of note content,
+    the last note cut short if needed.
+    """
+    notes = []
+    total_bytes = 0
+    truncated = False
+    for note_file in note_files:
+        if len(notes) >= max_notes:
+            truncated = True
+            break
+        try:
+            content = note_file.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            continue  # Deleted since the manifest was synced
+
+        encoded = content.encode()
+        if total_bytes + len(encoded) > max_bytes:
+            content = encoded[:max_bytes - total_bytes].decode("utf-8", "ignore")
+            truncated = True
+        total_bytes += len(content.encode())
+
+        parts = note_file.name.split('.')
+        try:
+            time = datetime.strptime(parts[0], "%Y%m%d_%H%M%S").isoformat()
+        except ValueError:
+            time = None
+        notes.append({
+            "page": page_map[note_file],
+            "path": str(note_file.resolve()),
+            "type": parts[1] if len(parts) == 4 else None,
+            "time": time,
+            "content": content,
+        })
+        if truncated:
+            break
+
+    return {"author": author, "total": len(note_files), "truncated": truncated, "notes": notes}
+
+
 @note_command.command()
 @click.pass_context
 @click.option("--author", required=True, help="Whose notes do you want to read?")
@@ -193,7 +157,8 @@ def read(ctx, author, max_notes, max_bytes, reverse):
         output.emit(to_stderr=True)
         ctx.exit(1)
 
-    note_files = sorted(author_dir.glob("*.note.txt"))
+    with NoteManifest(notes_dir) as manifest:
+        note_files = [author_dir / entry.name for entry in manifest.notes(author)]
     if not note_files:
         output.error(f"No notes found for author '{author}'.")
         output.emit(to_stderr=True)
@@ -204,6 +169,26 @@ def read(ctx, author, max_notes, max_bytes, reverse):
     if reverse:
         note_files = list(reversed(note_files))
 
+    # Show process information with LogLight markers
+    process_output = OutputBuilder()
+    process_output.section("Reading Notes")
+    process_output.action("Loading notes for author")
+    process_output.result(f"Author: {author}")
+    process_output.action("Processing note files")
+
+    # Add progress indicator for large operations
+    if len(note_files) > 5:
+        process_output.progress(f"Reading {len(note_files)} notes...")
+    process_output.emit(to_stderr=True)
+
+    if get_output_format() != "text":
+        output.data(json.dumps(
+            _read_document(author, note_files, page_map, max_notes_val, max_bytes_val),
+            ensure_ascii=False,
+        ))
+        output.emit()
+        return
+
     output_lines = []
     total_bytes = 0
     note_count = 0
@@ -221,6 +206,12 @@ def read(ctx, author, max_notes, max_bytes, reverse):
             limited_by_notes = True
             break
 
+        try:
+            with open(note_file, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            continue  # Deleted since the manifest was synced
+
         # Add note separator as subheader
         page = page_map[note_file]
         sep_line = f"## Note {page}"
@@ -232,9 +223,6 @@ def read(ctx, author, max_notes, max_bytes, reverse):
         output_lines.append("")
         total_bytes += sep_bytes
 
-        with open(note_file, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
         content_truncated = False
         for line in lines:
             line = line.rstrip("\n")
@@ -288,18 +276,6 @@ def read(ctx, author, max_notes, max_bytes, reverse):
     output_lines.append("  ```")
     output_lines.append("- For full documentation, see `.apiscope/notes/README.md` or run `apiscope note readme`")
 
-    # Show process information with LogLight markers
-    process_output = OutputBuilder()
-    process_output.section("Reading Notes")
-    process_output.action("Loading notes for author")
-    process_output.result(f"Author: {author}")
-    process_output.action("Processing note files")
-
-    # Add progress indicator for large operations
-    if len(note_files) > 5:
-        process_output.progress(f"Reading {len(note_files)} notes...")
-    process_output.emit(to_stderr=True)
-
     # Show content information without LogLight markers
     content_output = OutputBuilder()
     for line in output_lines:
@@ -322,35 +298,14 @@ def add(ctx, path, annotation_type, context):
     output = OutputBuilder()
     clean_empty_notes(notes_dir)
 
-    note_path = Path(path).resolve()
-    if not note_path.is_file():
-        output.error(f"Note file '{note_path}' does not exist.")
-        output.emit(to_stderr=True)
-        ctx.exit(1)
-
-    # Optional: verify the note file is within the notes directory
     try:
-        note_path.relative_to(notes_dir)
-    except ValueError:
-        output.error(f"Note file must be within the project notes directory: {notes_dir}")
+        added = add_annotation(config, path, annotation_type, context)
+    except NoteError as e:
+        output.error(str(e))
         output.emit(to_stderr=True)
         ctx.exit(1)
 
-    # Generate current timestamp
-    now = datetime.now()
-    timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
-
-    # Construct annotation line
-    annotation = f"{annotation_type}: {timestamp} - {context}"
-
-    # Append to file
-    try:
-        with open(note_path, "a", encoding="utf-8") as f:
-            f.write(annotation + "\n")
-    except Exception as e:
-        output.error(f"Failed to write annotation: {e}")
-        output.emit(to_stderr=True)
-        ctx.exit(1)
+    note_path = added["path"]
 
     output.section("Adding Annotation")
     output.action("Validating note file")
@@ -380,21 +335,20 @@ def stats(ctx, author):
         output.emit(to_stderr=True)
         ctx.exit(1)
 
-    note_files = sorted(author_dir.glob("*.note.txt"))
+    # Type and timestamp come from the manifest; no note needs reading
+    with NoteManifest(notes_dir) as manifest:
+        note_files = manifest.notes(author)
+        moments = manifest.moments(author)
     if not note_files:
         output.error(f"No notes found for author '{author}'.")
         output.emit(to_stderr=True)
         ctx.exit(1)
 
     notes = []
-    for f in note_files:
-        suffixes = f.suffixes
-        if len(suffixes) != 3 or suffixes[1:] != ['.note', '.txt']:
-            continue
-        typ = suffixes[0][1:]
-        timestamp_str = f.stem.split('.')[0]
+    for entry in note_files:
+        typ = entry.type
         try:
-            dt = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
+            dt = datetime.strptime(entry.timestamp, "%Y%m%d_%H%M%S")
         except ValueError:
             continue
         if typ not in TYPE_NAMES:
@@ -406,7 +360,7 @@ def stats(ctx, author):
         output.emit(to_stderr=True)
         ctx.exit(1)
 
-    # Sort just in case (already sorted by glob)
+    # Sort just in case (already sorted by file name)
     notes.sort(key=lambda x: x[0])
 
     # Global statistics
@@ -421,50 +375,58 @@ def stats(ctx, author):
         type_counts[typ] += 1
 
     # Temporal concentration index
-    data_points = [{'time': t} for t, _ in notes]
-    C = calculate_temporal_concentration(data_points, time_key='time')
+    # (from the running moments; a note dated in the future needs the
+    # per-note calculation, which clamps its existence time to 0)
+    now = datetime.now()
+    C = moments.concentration(now)
+    if C is None:
+        data_points = [{'time': t} for t, _ in notes]
+        C = calculate_temporal_concentration(data_points, time_key='time', current_time=now)
 
     # Find temporal clusters (time-based segmentation)
     temporal_segments = find_temporal_clusters(notes)
 
-    # Build trie for pattern matching
-    trie_root = build_pattern_trie(PATTERNS)
+    # Note types coded once as small ints; the whole history and every
+    # segment (a slice of it) are matched on the codes
+    automaton = PATTERN_AUTOMATON
+    all_types = [typ for _, typ in notes]
+    all_codes = automaton.encode(all_types)
 
     # Find cognitive clusters (pattern-based analysis across all notes)
-    all_types = [typ for _, typ in notes]
-    cognitive_matches = match_patterns_in_sequence(all_types, trie_root)
+    cognitive_matches = [name for _, _, name in automaton.find_codes(all_codes)]
 
     # Process temporal segments with per-segment pattern matching
+    # (segments are consecutive runs of the time-sorted notes)
     segment_info = []
+    segment_codes = all_codes[:0]
+    offset = 0
     for seg_notes, seg_start, seg_end in temporal_segments:
-        types = [typ for _, typ in seg_notes]
-        matches = match_patterns_in_sequence(types, trie_root)
+        segment_codes = all_codes[offset:offset + len(seg_notes)]
+        offset += len(seg_notes)
+        matches = [name for _, _, name in automaton.find_codes(segment_codes)]
         segment_info.append((seg_notes, seg_start, seg_end, matches))
 
     # Determine ongoing segment analysis (based on last temporal segment)
     ongoing_lines = []
+    partial = []  # Patterns the ongoing segment may still complete
     if segment_info:
         last_seg_notes, last_start, last_end, last_matches = segment_info[-1]
         last_types = [typ for _, typ in last_seg_notes]
 
         # Analyze ongoing pattern for the last temporal segment
         if last_types:
-            node = trie_root
-            for typ in last_types:
-                if typ in node['children']:
-                    node = node['children'][typ]
-                else:
-                    break
-            if node['patterns']:
+            state = automaton.walk(segment_codes)
+            if automaton.patterns_at(state):
                 ongoing_lines.append("No ongoing segment.")
             else:
-                possible_patterns = node.get('prefix_patterns', [])
+                possible_patterns = automaton.prefixes_at(state)
                 if possible_patterns:
-                    next_types = list(node['children'].keys())
+                    next_types = automaton.next_elements(state)
                     next_names = [TYPE_NAMES[t] for t in next_types]
                     ongoing_lines.append("Partial match:")
                     for pname in sorted(set(possible_patterns)):
                         ongoing_lines.append(f"  - {pname} (next: {', '.join(next_names)})")
+                        partial.append({"pattern": pname, "next": next_names})
                 else:
                     ongoing_lines.append("No ongoing segment.")
         else:
@@ -488,6 +450,37 @@ def stats(ctx, author):
         process_output.progress(f"Analyzing {len(note_files)} notes for patterns...")
     process_output.emit(to_stderr=True)
 
+    if get_output_format() != "text":
+        ongoing = None
+        if partial:
+            ongoing = {
+                "start": last_start.isoformat() if last_start else None,
+                "end": last_end.isoformat() if last_end else None,
+                "types": last_types,
+                "partial": partial,
+            }
+        output.data(json.dumps({
+            "author": author,
+            "total": n,
+            "start": first_time.isoformat(),
+            "end": last_time.isoformat(),
+            "temporal_concentration": round(C, 4),
+            "types": type_counts,
+            "segments": [
+                {
+                    "start": seg_start.isoformat(),
+                    "end": seg_end.isoformat(),
+                    "types": [typ for _, typ in seg_notes],
+                    "patterns": matches,
+                }
+                for seg_notes, seg_start, seg_end, matches in segment_info
+            ],
+            "patterns": cognitive_matches,
+            "ongoing": ongoing,
+        }, ensure_ascii=False))
+        output.emit()
+        return
+
     # Show content information in README-like format
     content_output = OutputBuilder()
     content_output.raw(f"# Note Statistics for {author}")
@@ -31,6 +31,7 @@ Before recording notes, you must establish your digital identity through self-re
   - `.lock/`: lock files for two-phase operations
     - `<hash>.lock`: note creation locks
     - `<hash>.auth.lock`: identity authentication locks
+  - `.manifest.db`: index of note files (rebuilt automatically if deleted)
   - `<author>/`: subdirectory for each author
     - `auth.json`: verified identity file (required for note creation)
     - `<timestamp>.<TYPE>.note.txt`: individual notes
@@ -3,9 +3,25 @@ import json
 from datetime import datetime
 from pathlib import Path
 import hashlib
+from typing import Any, Dict, List, Optional
 from ...core.clustering import analyze_temporal_patterns, calculate_temporal_concentration
-from ...core.trie import build_pattern_trie, match_patterns_in_sequence
-from .constants import PATTERNS, TYPE_NAMES
+from ...core.trie import build_pattern_trie, get_automaton, match_patterns_in_sequence
+from .constants import PATTERNS, TEMPLATES, TYPE_NAMES
+from .manifest import NoteManifest
+from .utils import get_auth_file_path
+
+
+# Trie and matching automaton of the cognitive patterns, compiled once
+PATTERN_TRIE = build_pattern_trie(PATTERNS)
+PATTERN_AUTOMATON = get_automaton(PATTERN_TRIE)
+
+
+class NoteError(Exception):
+    """Note operation failure, with optional hints on how to recover."""
+
+    def __init__(self, message: str, hints: Optional[List[str]] = None):
+        super().__init__(message)
+        self.hints = hints or []
 
 
 def find_temporal_clusters(notes):
@@ -51,9 +67,8 @@ def find_cognitive_clusters(notes):
     # Extract types from all notes
     all_types = [typ for _, typ in notes]
 
-    # Build trie and match patterns across all notes
-    trie_root = build_pattern_trie(PATTERNS)
-    matches = match_patterns_in_sequence(all_types, trie_root)
+    # Match patterns across all notes
+    matches = match_patterns_in_sequence(all_types, PATTERN_TRIE)
 
     return matches
 
@@ -131,3 +146,187 @@ def validate_auth_file(auth_path: Path) -> bool:
         return True
     except (json.JSONDecodeError, KeyError, TypeError, ValueError):
         return False
+
+
+# Note operations shared by the CLI and the JSON-RPC server
+def write_note(config, author: str, note_type: str, context: str) -> Dict[str, Any]:
+    """Run one phase of the two-phase note write.
+
+    The first call creates an empty note and a lock and returns the guiding
+    question; the second call with the same type fills the note in.
+
+    Args:
+        config: GlobalConfig of the project
+        author: Authenticated author name
+        note_type: Note type (key of TEMPLATES)
+        context: Note content
+
+    Returns:
+        {'phase': 'draft', 'author', 'type', 'question'} after the first
+        phase, {'phase': 'recorded', 'path'} after the second
+
+    Raises:
+        NoteError: If the author is not authenticated or the draft state
+            is inconsistent
+    """
+    notes_dir = config.home / "notes"
+    lock_dir = notes_dir / ".lock"
+
+    # Check if author has completed identity authentication
+    auth_path = get_auth_file_path(config, author)
+    if not validate_auth_file(auth_path):
+        raise NoteError(
+            f"Author '{author}' has not completed identity authentication.",
+            [f"Run 'apiscope note auth --name {author} --json {{...}}' to establish your digital identity first."]
+        )
+
+    # Compute lock file path (based on author hash)
+    author_hash = hashlib.sha256(author.encode()).hexdigest()[:16]
+    lock_path = lock_dir / f"{author_hash}.lock"
+
+    if lock_path.exists():
+        # ---------- PHASE 2: complete the note ----------
+        lock_data = lock_path.read_text().strip().split('|')
+        if len(lock_data) != 2:
+            raise NoteError("Invalid lock file format. You may need to remove the lock file and start over.")
+
+        timestamp, locked_type = lock_data
+
+        if locked_type != note_type:
+            raise NoteError(f"Unfinished draft (type {locked_type}) exists.", [
+                f"Consider: does your current content (type {note_type}) belong to that draft?",
+                f"If yes, complete it: apiscope note write --author {author} --type {locked_type} \"<your content>\"",
+                f"If not, first finish the draft (with its own content), then create a new {note_type} note.",
+            ])
+
+        note_path = notes_dir / author / f"{timestamp}.{note_type}.note.txt"
+
+        # Note file must exist and be empty
+        if not note_path.exists():
+            raise NoteError(f"Note file {note_path} does not exist. You may need to remove the lock file and start over.")
+
+        if note_path.stat().st_size != 0:
+            raise NoteError(f"Note file {note_path} is not empty. Check the file content and remove the lock manually.")
+
+        dt = datetime.strptime(timestamp, "%Y%m%d_%H%M%S")
+        human_time = dt.strftime("%Y-%m-%d %H:%M:%S")
+
+        template = TEMPLATES[note_type]["context_template"]
+        content = template.format(
+            author=author,
+            time=human_time,
+            context=context
+        )
+
+        with open(note_path, "w", encoding="utf-8") as f:
+            f.write(content + "\n")
+
+        with NoteManifest(notes_dir) as manifest:
+            manifest.record(author, note_path.name, note_path.stat().st_size)
+
+        lock_path.unlink()
+
+        return {"phase": "recorded", "path": str(note_path)}
+
+    # ---------- PHASE 1: create empty note and lock ----------
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+
+    author_dir = notes_dir / author
+    author_dir.mkdir(parents=True, exist_ok=True)
+
+    note_path = author_dir / f"{timestamp}.{note_type}.note.txt"
+    with NoteManifest(notes_dir) as manifest:
+        with manifest.changing(author):
+            note_path.touch()
+            manifest.record(author, note_path.name, 0)
+
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    lock_path.write_text(f"{timestamp}|{note_type}")
+
+    return {
+        "phase": "draft",
+        "author": author,
+        "type": note_type,
+        "question": TEMPLATES[note_type]["question_template"].format(context=context),
+    }
+
+
+def add_annotation(config, path: str, annotation_type: str, context: str) -> Dict[str, str]:
+    """Append a REFERENCE/NOTE/TIP annotation to a note file.
+
+    Returns:
+        {'path': resolved note path, 'annotation': appended line}
+
+    Raises:
+        NoteError: If the note does not exist, is outside the notes
+            directory or cannot be written
+    """
+    notes_dir = config.home / "notes"
+
+    note_path = Path(path).resolve()
+    if not note_path.is_file():
+        raise NoteError(f"Note file '{note_path}' does not exist.")
+
+    # Verify the note file is within the notes directory
+    try:
+        relative = note_path.relative_to(notes_dir)
+    except ValueError:
+        raise NoteError(f"Note file must be within the project notes directory: {notes_dir}")
+
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    annotation = f"{annotation_type}: {timestamp} - {context}"
+
+    try:
+        with open(note_path, "a", encoding="utf-8") as f:
+            f.write(annotation + "\n")
+    except Exception as e:
+        raise NoteError(f"Failed to write annotation: {e}")
+
+    if len(relative.parts) == 2:
+        with NoteManifest(notes_dir) as manifest:
+            manifest.record(relative.parts[0], relative.name, note_path.stat().st_size)
+
+    return {"path": str(note_path), "annotation": annotation}
+
+
+def list_notes(config, author: str) -> List[Dict[str, Any]]:
+    """List an author's notes with their content, oldest first.
+
+    Returns:
+        List of {'page', 'path', 'type', 'time', 'content'}; 'time' is ISO
+        formatted, or None for files with an unexpected name
+
+    Raises:
+        NoteError: If the author has no notes
+    """
+    notes_dir = config.home / "notes"
+    author_dir = notes_dir / author
+    note_files = []
+    if author_dir.is_dir():
+        with NoteManifest(notes_dir) as manifest:
+            note_files = [author_dir / entry.name for entry in manifest.notes(author)]
+    if not note_files:
+        raise NoteError(f"No notes found for author '{author}'.")
+
+    notes = []
+    for page, note_file in enumerate(note_files, 1):
+        try:
+            content = note_file.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            continue  # Deleted since the manifest was synced
+        parts = note_file.name.split('.')
+        try:
+            time = datetime.strptime(parts[0], "%Y%m%d_%H%M%S").isoformat()
+        except ValueError:
+            time = None
+        notes.append({
+            "page": page,
+            "path": str(note_file.resolve()),
+            "type": parts[1] if len(parts) == 4 else None,
+            "time": time,
+            "content": content,
+        })
+    if not notes:
+        raise NoteError(f"No notes found for author '{author}'.")
+    return notes
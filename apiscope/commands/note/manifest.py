@@ -0,0 +1,294 @@
+"""Persistent index of note files for the note command module.
+
+The manifest is a SQLite database at .apiscope/notes/.manifest.db with one
+row per note file (author, timestamp, type, size, state). 'write' and 'add'
+update it as they change notes, so reading and cleaning notes query it
+instead of globbing and stat()ing every note of every author. It also keeps
+running moments of each author's note times, from which 'stats' gets the
+temporal concentration in constant time.
+
+Notes created or deleted by hand are picked up through the author
+directory's mtime: when it differs from the one recorded at the last scan,
+that author's directory is scanned again. A missing manifest is rebuilt
+from a full scan.
+
+Editing a note in place does not change the directory's mtime and is not
+detected. Timestamps, types and the moments derived from them come from
+file names, so they stay correct; the recorded size does not. Drafts are
+stat()ed again before they are deleted, but a recorded note emptied by
+hand is not cleaned up as a draft until the next rescan of its author.
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+
+from ...core.clustering import TemporalMoments
+from ...core.database import connect
+from .constants import TYPE_NAMES
+
+MANIFEST_NAME = ".manifest.db"
+SCHEMA_VERSION = 2
+
+STATE_DRAFT = "draft"  # Empty file created by the first phase of 'write'
+STATE_RECORDED = "recorded"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    author TEXT NOT NULL,
+    name TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    type TEXT,
+    size INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (author, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_notes_state ON notes (state);
+CREATE TABLE IF NOT EXISTS authors (
+    author TEXT PRIMARY KEY,
+    dir_mtime INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS moments (
+    author TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    m2 REAL NOT NULL,
+    latest REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class NoteEntry:
+    """One note file as recorded in the manifest."""
+    author: str
+    name: str  # File name, e.g. 20250321_143015.OBS.note.txt
+    timestamp: str
+    type: Optional[str]
+    size: int
+    state: str
+
+
+def _parse_name(name: str):
+    """Split a note file name into (timestamp, type or None)."""
+    parts = name.split('.')
+    return parts[0], parts[1] if len(parts) == 4 else None
+
+
+def _note_time(timestamp: str, note_type: Optional[str]) -> Optional[float]:
+    """Get the POSIX time of a note counted by 'stats', else None."""
+    if note_type not in TYPE_NAMES:
+        return None
+    try:
+        return datetime.strptime(timestamp, "%Y%m%d_%H%M%S").timestamp()
+    except ValueError:
+        return None
+
+
+def _dir_mtime(path: Path) -> Optional[int]:
+    """Get the mtime of a directory, or None if it does not exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+class NoteManifest:
+    """Index of all note files under the notes directory.
+
+    Usage:
+        with NoteManifest(notes_dir) as manifest:
+            with manifest.changing(author):
+                note_path.touch()
+                manifest.record(author, note_path.name, 0)
+            entries = manifest.notes(author)
+    """
+
+    def __init__(self, notes_dir: Path) -> None:
+        self._notes_dir = notes_dir
+        notes_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = connect(notes_dir / MANIFEST_NAME)
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            with self._conn:
+                self._conn.executescript(SCHEMA)
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.rebuild()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "NoteManifest":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # Scanning
+
+    def rebuild(self) -> None:
+        """Scan every author directory, replacing the whole manifest."""
+        with self._conn:
+            self._conn.execute("DELETE FROM notes")
+            self._conn.execute("DELETE FROM authors")
+            self._conn.execute("DELETE FROM moments")
+        for author_dir in self._notes_dir.iterdir():
+            if author_dir.is_dir() and not author_dir.name.startswith('.'):
+                self._scan_author(author_dir.name)
+
+    def _scan_author(self, author: str) -> None:
+        """Replace the rows of one author with the files on disk."""
+        author_dir = self._notes_dir / author
+        mtime = _dir_mtime(author_dir)
+        rows = []
+        if mtime is not None:
+            for note_file in author_dir.glob("*.note.txt"):
+                try:
+                    size = note_file.stat().st_size
+                except OSError:
+                    continue
+                timestamp, note_type = _parse_name(note_file.name)
+                state = STATE_RECORDED if size else STATE_DRAFT
+                rows.append((author, note_file.name, timestamp, note_type, size, state))
+
+        with self._conn:
+            self._conn.execute("DELETE FROM notes WHERE author = ?", (author,))
+            self._conn.executemany(
+                "INSERT INTO notes (author, name, timestamp, type, size, state)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if mtime is None:
+                self._conn.execute("DELETE FROM authors WHERE author = ?", (author,))
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO authors (author, dir_mtime) VALUES (?, ?)",
+                    (author, mtime),
+                )
+        self._recount(author)
+
+    def sync_all(self) -> None:
+        """Sync every author directory (one stat() per author)."""
+        for author_dir in self._notes_dir.iterdir():
+            if author_dir.is_dir() and not author_dir.name.startswith('.'):
+                self.sync(author_dir.name)
+
+    def sync(self, author: str) -> None:
+        """Scan an author again if the directory changed behind our back."""
+        row = self._conn.execute(
+            "SELECT dir_mtime FROM authors WHERE author = ?", (author,)
+        ).fetchone()
+        recorded = row[0] if row is not None else None
+        if _dir_mtime(self._notes_dir / author) != recorded:
+            self._scan_author(author)
+
+    # Lookups
+
+    def notes(self, author: str) -> List[NoteEntry]:
+        """Get an author's notes, ordered by file name (oldest first)."""
+        self.sync(author)
+        rows = self._conn.execute(
+            "SELECT author, name, timestamp, type, size, state FROM notes"
+            " WHERE author = ? ORDER BY name",
+            (author,),
+        ).fetchall()
+        return [NoteEntry(*row) for row in rows]
+
+    def drafts(self) -> List[NoteEntry]:
+        """Get the empty notes of all authors."""
+        self.sync_all()
+        rows = self._conn.execute(
+            "SELECT author, name, timestamp, type, size, state FROM notes"
+            " WHERE state = ?",
+            (STATE_DRAFT,),
+        ).fetchall()
+        return [NoteEntry(*row) for row in rows]
+
+    def moments(self, author: str) -> TemporalMoments:
+        """Get the running moments of an author's note times."""
+        self.sync(author)
+        return self._stored_moments(author)
+
+    # Updates
+
+    @contextmanager
+    def changing(self, author: str) -> Iterator[None]:
+        """Create or delete note files of an author within this block.
+
+        The author is synced first, so that once the block has recorded its
+        changes with record()/remove(), they are the only ones since the
+        last scan and the directory's new mtime can be stored. Without this,
+        record() and remove() leave the stored mtime alone and the next
+        lookup rescans the directory.
+        """
+        self.sync(author)
+        yield
+        self._mark_current(author)
+
+    def record(self, author: str, name: str, size: int) -> None:
+        """Record a note file written by 'write' or 'add'."""
+        timestamp, note_type = _parse_name(name)
+        state = STATE_RECORDED if size else STATE_DRAFT
+        is_new = self._conn.execute(
+            "SELECT 1 FROM notes WHERE author = ? AND name = ?", (author, name)
+        ).fetchone() is None
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO notes (author, name, timestamp, type, size, state)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (author, name, timestamp, note_type, size, state),
+            )
+            note_time = _note_time(timestamp, note_type)
+            if is_new and note_time is not None:
+                moments = self._stored_moments(author)
+                moments.add(note_time)
+                self._store_moments(author, moments)
+
+    def remove(self, author: str, name: str) -> None:
+        """Forget a deleted note file."""
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM notes WHERE author = ? AND name = ?", (author, name)
+            )
+        # Running moments cannot drop a value (the latest time is a max)
+        self._recount(author)
+
+    def _stored_moments(self, author: str) -> TemporalMoments:
+        """Get the moments row of an author without syncing."""
+        row = self._conn.execute(
+            "SELECT count, mean, m2, latest FROM moments WHERE author = ?", (author,)
+        ).fetchone()
+        return TemporalMoments(*row) if row is not None else TemporalMoments()
+
+    def _store_moments(self, author: str, moments: TemporalMoments) -> None:
+        """Write the moments row of an author (inside a transaction)."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO moments (author, count, mean, m2, latest)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (author, moments.count, moments.mean, moments.m2, moments.latest),
+        )
+
+    def _recount(self, author: str) -> None:
+        """Recompute an author's moments from the recorded notes."""
+        rows = self._conn.execute(
+            "SELECT timestamp, type FROM notes WHERE author = ? ORDER BY name", (author,)
+        ).fetchall()
+        note_times = (_note_time(timestamp, note_type) for timestamp, note_type in rows)
+        moments = TemporalMoments.from_times(t for t in note_times if t is not None)
+        with self._conn:
+            self._store_moments(author, moments)
+
+    def _mark_current(self, author: str) -> None:
+        """Store the author directory's mtime after our own change."""
+        mtime = _dir_mtime(self._notes_dir / author)
+        with self._conn:
+            if mtime is None:
+                self._conn.execute("DELETE FROM authors WHERE author = ?", (author,))
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO authors (author, dir_mtime) VALUES (?, ?)",
+                    (author, mtime),
+                )
@@ -32,15 +32,25 @@ def clean_empty_notes(notes_dir: Path):
                 timestamp = content.split('|')[0]
                 active_locks.add(timestamp)
 
-    for author_dir in notes_dir.iterdir():
-        if not author_dir.is_dir() or author_dir.name.startswith('.'):
-            continue
-        for note_file in author_dir.glob("*.note.txt"):
-            if note_file.stat().st_size == 0:
-                stem = note_file.stem
-                timestamp = stem.split('.')[0]
-                if timestamp not in active_locks:
+    # Only drafts can be empty, so the manifest saves stat()ing every note
+    from .manifest import NoteManifest
+
+    with NoteManifest(notes_dir) as manifest:
+        for entry in manifest.drafts():
+            if entry.timestamp in active_locks:
+                continue
+            note_file = notes_dir / entry.author / entry.name
+            try:
+                size = note_file.stat().st_size
+            except FileNotFoundError:
+                manifest.remove(entry.author, entry.name)
+                continue
+            if size == 0:
+                with manifest.changing(entry.author):
                     note_file.unlink()
+                    manifest.remove(entry.author, entry.name)
+            else:
+                manifest.record(entry.author, entry.name, size)
 
 
 def get_auth_lock_path(config, author: str) -> Path:
@@ -0,0 +1,332 @@
+# apiscope/commands/rpc.py
+"""
+Serve apiscope operations as JSON-RPC 2.0 over stdin/stdout.
+Each line on stdin is one request and each line on stdout one response, so
+agent frameworks get structured results instead of LogLight text.
+"""
+import asyncio
+import fnmatch
+import json
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import click
+
+from ..core.output import OutputBuilder, set_output_format
+from ..core.config import GLOBAL_CONFIG
+from ..core.describe_store import DescribeStore
+from ..core.index import get_endpoint_index
+from ..core.parser import ParserError, SpecSource, open_spec
+from .describe import describe_endpoint, warm_describe_store
+from .note.core import NoteError, add_annotation, list_notes, write_note
+from .note.constants import TEMPLATES
+from .search import DISPLAY_LIMIT, PATTERN_CHARS, _open_indexes, _search_across_specs
+
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SERVER_ERROR = -32000  # apiscope errors (unknown spec, missing endpoint, ...)
+
+
+class _RpcError(Exception):
+    """Error returned to the client as a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+# Specs are loaded and rendered under a per-spec lock; reference caches of a
+# loaded spec are not safe to use from several threads at once. Loaded specs
+# are shared by content, so the lock is keyed by content hash: two names of
+# the same spec get the same lock.
+_spec_locks: Dict[str, threading.Lock] = {}
+_spec_locks_guard = threading.Lock()
+
+
+def _spec_lock(source: SpecSource) -> threading.Lock:
+    """Get the lock serializing work on one loaded spec."""
+    with _spec_locks_guard:
+        return _spec_locks.setdefault(source.digest, threading.Lock())
+
+
+def _param(params: Dict[str, Any], key: str, kind: type, default: Any = ...) -> Any:
+    """Get a typed parameter, raising INVALID_PARAMS if missing or mistyped."""
+    if key not in params:
+        if default is ...:
+            raise _RpcError(INVALID_PARAMS, f"Missing parameter '{key}'")
+        return default
+    value = params[key]
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise _RpcError(INVALID_PARAMS, f"Parameter '{key}' must be {kind.__name__}")
+    return value
+
+
+def _open(name: str, force: bool = False) -> SpecSource:
+    """Resolve a spec, mapping parser errors to JSON-RPC errors."""
+    try:
+        return open_spec(name, force)
+    except ParserError as e:
+        raise _RpcError(SERVER_ERROR, str(e))
+
+
+# Methods
+
+def _list(params: Dict[str, Any]) -> Dict[str, Any]:
+    """List configured specifications."""
+    specs = GLOBAL_CONFIG.get_classified_specs()
+    return {
+        "specs": [
+            {"name": name, "type": spec_type, "source": source}
+            for name, (spec_type, source) in specs.items()
+        ]
+    }
+
+
+def _search_specs(pattern: str, keywords: str, limit: int, force: bool) -> Dict[str, Any]:
+    """Search every spec matching a glob, merged into one ranking."""
+    specs = GLOBAL_CONFIG.get_classified_specs()
+    names = [name for name in fnmatch.filter(specs, pattern) if specs[name][0] != "UNKNOWN"]
+    if not names:
+        raise _RpcError(SERVER_ERROR, f"No configured specification matches '{pattern}'")
+
+    indexes, errors = _open_indexes(names, force)
+    total, matches, fuzzy = _search_across_specs(indexes, keywords, OutputBuilder(), limit)
+    return {"spec": pattern, "total": total, "fuzzy": fuzzy, "results": matches, "errors": errors}
+
+
+def _search(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Ranked endpoint search, falling back to fuzzy matching."""
+    name = _param(params, "spec", str)
+    keywords = _param(params, "keywords", str)
+    limit = _param(params, "limit", int, DISPLAY_LIMIT)
+    fuzzy_fallback = _param(params, "fuzzy", bool, True)
+    force = _param(params, "force", bool, False)
+
+    if any(char in name for char in PATTERN_CHARS):
+        return _search_specs(name, keywords, limit, force)
+
+    source = _open(name, force)
+    with _spec_lock(source):
+        try:
+            index = get_endpoint_index(source)
+        except ParserError as e:
+            raise _RpcError(SERVER_ERROR, str(e))
+
+    keyword_list = [k.lower() for k in keywords.split() if k]
+    total, ranked = index.search(keyword_list, limit)
+
+    fuzzy = False
+    if total == 0 and keyword_list and fuzzy_fallback:
+        total, ranked = index.fuzzy_search(keyword_list, limit)
+        fuzzy = total > 0
+
+    return {
+        "spec": name,
+        "total": total,
+        "fuzzy": fuzzy,
+        "results": [index.operation(op_id) for op_id in ranked],
+    }
+
+
+def _describe(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe one endpoint ('endpoint') or several ('endpoints')."""
+    name = _param(params, "spec", str)
+    force = _param(params, "force", bool, False)
+    if "endpoints" in params:
+        endpoints = _param(params, "endpoints", list)
+        if not all(isinstance(endpoint, str) for endpoint in endpoints):
+            raise _RpcError(INVALID_PARAMS, "Parameter 'endpoints' must be a list of strings")
+        single = False
+    else:
+        endpoints = [_param(params, "endpoint", str)]
+        single = True
+
+    documents: List[Dict[str, Any]] = []
+    source = _open(name, force)
+    with _spec_lock(source):
+        try:
+            warm_describe_store(source)
+        except ParserError as e:
+            raise _RpcError(SERVER_ERROR, str(e))
+
+        with DescribeStore(GLOBAL_CONFIG.describe_store_path) as store:
+            for path_method in endpoints:
+                try:
+                    document, path_params = describe_endpoint(store, source, path_method)
+                except (ValueError, KeyError, ParserError) as e:
+                    message = str(e.args[0]) if isinstance(e, KeyError) and e.args else str(e)
+                    if single:
+                        raise _RpcError(SERVER_ERROR, message)
+                    documents.append({"request": path_method, "error": message})
+                    continue
+
+                operation_info = json.loads(document)
+                if path_params:
+                    operation_info["pathParameters"] = path_params
+                documents.append(operation_info)
+
+    if single:
+        return documents[0]
+    return {"results": documents}
+
+
+def _note_call(function: Callable[..., Any], *args: Any) -> Any:
+    """Run a note operation, mapping NoteError to a JSON-RPC error."""
+    try:
+        return function(GLOBAL_CONFIG, *args)
+    except NoteError as e:
+        raise _RpcError(SERVER_ERROR, str(e), {"hints": e.hints} if e.hints else None)
+
+
+def _note_write(params: Dict[str, Any]) -> Dict[str, Any]:
+    """One phase of the two-phase note write."""
+    note_type = _param(params, "type", str)
+    if note_type not in TEMPLATES:
+        raise _RpcError(INVALID_PARAMS, f"Parameter 'type' must be one of: {', '.join(TEMPLATES)}")
+    return _note_call(write_note, _param(params, "author", str), note_type, _param(params, "context", str))
+
+
+def _note_add(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Append an annotation to a note."""
+    annotation_type = _param(params, "type", str)
+    if annotation_type not in ("REFERENCE", "NOTE", "TIP"):
+        raise _RpcError(INVALID_PARAMS, "Parameter 'type' must be one of: REFERENCE, NOTE, TIP")
+    return _note_call(add_annotation, _param(params, "path", str), annotation_type, _param(params, "context", str))
+
+
+def _note_read(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Read an author's notes, oldest first (newest first with 'reverse')."""
+    notes = _note_call(list_notes, _param(params, "author", str))
+    if _param(params, "reverse", bool, False):
+        notes.reverse()
+    limit = _param(params, "limit", int, None)
+    return {"total": len(notes), "notes": notes[:limit] if limit is not None else notes}
+
+
+METHODS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "list": _list,
+    "search": _search,
+    "describe": _describe,
+    "note.write": _note_write,
+    "note.add": _note_add,
+    "note.read": _note_read,
+}
+
+
+# Transport
+
+def _response(request_id: Any, result: Any = None, error: Optional[_RpcError] = None) -> Dict[str, Any]:
+    """Build a JSON-RPC response object."""
+    response: Dict[str, Any] = {"jsonrpc": "2.0", "id": request_id}
+    if error is None:
+        response["result"] = result
+    else:
+        response["error"] = {"code": error.code, "message": str(error)}
+        if error.data is not None:
+            response["error"]["data"] = error.data
+    return response
+
+
+def _write(response: Dict[str, Any]) -> None:
+    """Write one response line (only called from the event loop thread)."""
+    sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+async def _handle(line: bytes) -> None:
+    """Handle one request line; notifications get no response."""
+    try:
+        message = json.loads(line)
+    except ValueError as e:
+        _write(_response(None, error=_RpcError(PARSE_ERROR, f"Parse error: {e}")))
+        return
+
+    if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+        _write(_response(None, error=_RpcError(INVALID_REQUEST, "Invalid request")))
+        return
+
+    request_id = message.get("id")
+    is_notification = "id" not in message
+
+    try:
+        method = METHODS.get(message["method"])
+        if method is None:
+            raise _RpcError(METHOD_NOT_FOUND, f"Method not found: {message['method']}")
+        params = message.get("params", {})
+        if not isinstance(params, dict):
+            raise _RpcError(INVALID_PARAMS, "Params must be an object")
+        result = await asyncio.to_thread(method, params)
+        response = _response(request_id, result)
+    except _RpcError as e:
+        response = _response(request_id, error=e)
+    except Exception as e:
+        response = _response(request_id, error=_RpcError(INTERNAL_ERROR, f"Internal error: {e}"))
+
+    if not is_notification:
+        _write(response)
+
+
+async def _serve_stdio() -> None:
+    """Read requests until EOF, handling them concurrently."""
+    pending = set()
+    while True:
+        line = await asyncio.to_thread(sys.stdin.buffer.readline)
+        if not line:
+            break
+        if not line.strip():
+            continue
+
+        # Pick up configuration edits made during the session (load() only
+        # parses apiscope.ini again when its mtime changed). Worker threads
+        # read the configuration without a lock, so it is only reloaded
+        # while no request is in flight.
+        if not pending:
+            try:
+                GLOBAL_CONFIG.load()
+            except RuntimeError:
+                pass
+        task = asyncio.create_task(_handle(line))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    if pending:
+        await asyncio.gather(*pending)
+
+
+@click.command()
+def rpc_command():
+    """
+    Serve search, describe, list and note operations as JSON-RPC on stdio.
+
+    Reads one JSON-RPC 2.0 request per line from stdin and writes one
+    response per line to stdout until stdin is closed. Specs and indexes
+    stay loaded for the whole session.
+
+    Methods: list, search, describe, note.write, note.add, note.read
+    """
+    # Check if configuration is initialized
+    if not GLOBAL_CONFIG.is_initialized:
+        output = OutputBuilder()
+        output.section("RPC")
+        output.action("Checking configuration state")
+        output.note("Configuration not initialized")
+        output.note("Run 'apiscope init' first")
+        output.complete("RPC")
+        output.emit(to_stderr=True)
+        raise click.ClickException("RPC failed")
+
+    # stdout carries only JSON-RPC responses: nothing may be collected for
+    # a json document flushed after the session, and the close-time output
+    # of --timings/--trace/--profile goes to stderr
+    set_output_format("none")
+    try:
+        asyncio.run(_serve_stdio())
+    except KeyboardInterrupt:
+        pass
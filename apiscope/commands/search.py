@@ -3,80 +3,344 @@
 Search for endpoints in an API specification.
 Uses LogLight-style output for consistent, concise logging.
 """
+import fnmatch
+import heapq
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import click
-from typing import List, Dict, Any
+from typing import List, Dict, Optional, Tuple
 
-from ..core.output import OutputBuilder
+from ..core.output import OutputBuilder, get_output_format
 from ..core.config import GLOBAL_CONFIG
-from ..core.parser import get_spec, ParserError
+from ..core.index import EndpointIndex, get_endpoint_index, load_index, save_index
+from ..core.parser import SpecSource, open_spec, ParserError
 
 
 # Display limit - using 16 for binary-friendly boundary
 DISPLAY_LIMIT = 16
 
+# A NAME containing these is a glob over configured spec names
+PATTERN_CHARS = "*?["
+
+# Threads resolving specs and reading persisted indexes
+MAX_OPEN_THREADS = 16
+
 
 def _search_endpoints(
-    spec: Any,
+    index: EndpointIndex,
     keywords: str,
-    output: OutputBuilder
-) -> List[Dict[str, str]]:
+    output: OutputBuilder,
+    limit: Optional[int] = DISPLAY_LIMIT
+) -> Tuple[int, List[Dict[str, str]]]:
     """
     Search for endpoints matching keywords in the specification.
 
     Args:
-        spec: OpenAPI object
+        index: EndpointIndex of the specification
         keywords: Search keywords (space-separated, all must match)
         output: OutputBuilder for logging
+        limit: Number of top-ranked matches to return (None for all)
 
     Returns:
-        List of matching endpoints, each as dict with 'path' and 'method'
+        Tuple of (total match count, best matches first), each match as
+        dict with 'path', 'method', 'summary', 'operation_id' and 'score'
     """
-    matches = []
     keyword_list = [k.lower() for k in keywords.split() if k]
 
     if not keyword_list:
         output.note("No keywords provided, returning all endpoints")
-        keyword_list = []
 
     output.action("Searching in specification")
 
-    # Use SchemaPath navigation
-    paths = spec.spec.get("paths", {})
+    # Rank by relevance; only the returned top-k are materialized
+    total, scored = index.search_scored(keyword_list, limit)
+    return total, [dict(index.operation(op_id), score=score) for op_id, score in scored]
+
+
+def _fuzzy_search_endpoints(
+    index: EndpointIndex,
+    keywords: str,
+    output: OutputBuilder,
+    limit: Optional[int] = DISPLAY_LIMIT
+) -> Tuple[int, List[Dict[str, str]]]:
+    """
+    Search for endpoints approximately matching keywords.
+
+    Used when the exact search finds nothing, typically because of a typo.
+
+    Args:
+        index: EndpointIndex of the specification
+        keywords: Search keywords (space-separated, all must match)
+        output: OutputBuilder for logging
+        limit: Number of top-ranked matches to return (None for all)
+
+    Returns:
+        Tuple of (total match count, most similar first), same match
+        format as _search_endpoints()
+    """
+    keyword_list = [k.lower() for k in keywords.split() if k]
+
+    output.action("Searching for similar terms")
+
+    total, scored = index.fuzzy_search_scored(keyword_list, limit)
+    return total, [dict(index.operation(op_id), score=score) for op_id, score in scored]
+
+
+def _index_spec(name: str) -> Optional[str]:
+    """
+    Build and persist the search index of one specification.
+
+    Runs in a worker process. Returns an error message or None.
+    """
+    try:
+        get_endpoint_index(open_spec(name))
+    except ParserError as e:
+        return str(e)
+    return None
+
 
-    for path, path_obj in paths.items():
-        for method, operation in path_obj.items():
-            # Build searchable text from operation fields
-            search_text = []
+def _index_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Get a process pool for building search indexes.
+
+    Forking a process that runs other threads (the rpc server's event loop,
+    stdin reader and request workers) can deadlock on locks held by those
+    threads at fork time, so such processes start fresh interpreters.
+    """
+    context = multiprocessing.get_context("spawn") if threading.active_count() > 1 else None
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
 
-            # Use direct indexing to get actual values
-            if "summary" in operation:
-                search_text.append(str(operation["summary"]).lower())
 
-            if "description" in operation:
-                search_text.append(str(operation["description"]).lower())
+def _open_indexes(
+    names: List[str],
+    force: bool,
+    output: Optional[OutputBuilder] = None
+) -> Tuple[Dict[str, EndpointIndex], Dict[str, str]]:
+    """
+    Get the search indexes of several specifications.
+
+    Specs are resolved and their persisted indexes read in a thread pool,
+    which is mostly file and network I/O. Specs that still need parsing
+    are indexed in a process pool like 'apiscope fetch' does, because
+    parsing is CPU-bound.
+
+    Returns:
+        Tuple of (indexes by spec name in the order of names, error
+        messages by name of the specs that could not be loaded)
+    """
+    def open_one(name: str) -> Tuple[SpecSource, Optional[EndpointIndex]]:
+        source = open_spec(name, force)
+        return source, load_index(source.digest)
+
+    sources: Dict[str, SpecSource] = {}
+    indexes: Dict[str, EndpointIndex] = {}
+    errors: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=min(len(names), MAX_OPEN_THREADS)) as pool:
+        futures = {name: pool.submit(open_one, name) for name in names}
+    for name, future in futures.items():
+        try:
+            sources[name], index = future.result()
+        except ParserError as e:
+            errors[name] = str(e)
+            continue
+        if index is not None:
+            indexes[name] = index
+
+    missing = [name for name in sources if name not in indexes]
+    if missing:
+        if output:
+            output.action(f"Building search index for {len(missing)} specification(s)")
+        if len(missing) == 1:
+            try:
+                indexes[missing[0]] = get_endpoint_index(sources[missing[0]])
+            except ParserError as e:
+                errors[missing[0]] = str(e)
+        else:
+            max_workers = min(len(missing), os.cpu_count() or 1)
+            with _index_pool(max_workers) as pool:
+                build_errors = list(pool.map(_index_spec, missing))
+            for name, error in zip(missing, build_errors):
+                index = load_index(sources[name].digest) if error is None else None
+                if index is None:
+                    errors[name] = error or "Search index was not written"
+                else:
+                    indexes[name] = index
+
+    ordered = {name: indexes[name] for name in names if name in indexes}
+    return ordered, {name: errors[name] for name in names if name in errors}
+
+
+def _search_across_specs(
+    indexes: Dict[str, EndpointIndex],
+    keywords: str,
+    output: OutputBuilder,
+    limit: Optional[int] = DISPLAY_LIMIT
+) -> Tuple[int, List[Dict[str, str]], bool]:
+    """
+    Search several specifications and merge the results into one ranking.
+
+    Scores come from each spec's own index, so they are comparable as long
+    as the specs are of similar size. Equal scores keep configuration
+    order, then each spec's own order. When nothing matches exactly in any
+    spec, all of them are searched approximately instead.
+
+    Returns:
+        Tuple of (total match count, best matches first, fuzzy), each
+        match as in _search_endpoints() plus 'spec'
+    """
+    keyword_list = [k.lower() for k in keywords.split() if k]
 
-            if "operationId" in operation:
-                search_text.append(str(operation["operationId"]).lower())
+    if not keyword_list:
+        output.note("No keywords provided, returning all endpoints")
 
-            # Also include the path itself in search
-            search_text.append(path.lower())
+    output.action(f"Searching in {len(indexes)} specification(s)")
+    results = {name: index.search_scored(keyword_list, limit) for name, index in indexes.items()}
+
+    fuzzy = False
+    if keyword_list and not any(total for total, _ in results.values()):
+        output.note("No exact matches, trying fuzzy search")
+        output.action("Searching for similar terms")
+        results = {
+            name: index.fuzzy_search_scored(keyword_list, limit)
+            for name, index in indexes.items()
+        }
+        fuzzy = any(total for total, _ in results.values())
+
+    candidates = [
+        (score, -position, -rank, name, op_id)
+        for position, (name, (_, scored)) in enumerate(results.items())
+        for rank, (op_id, score) in enumerate(scored)
+    ]
+    if limit is None:
+        top = sorted(candidates, reverse=True)
+    else:
+        top = heapq.nlargest(limit, candidates)
+
+    total = sum(total for total, _ in results.values())
+    matches = [
+        dict(indexes[name].operation(op_id), score=score, spec=name)
+        for score, *_, name, op_id in top
+    ]
+    return total, matches, fuzzy
+
+
+def _add_results(
+    output: OutputBuilder,
+    name: str,
+    total: int,
+    matches: List[Dict[str, str]],
+    fuzzy: bool
+) -> None:
+    """
+    Add the displayed matches to the output.
 
-            # Check if all keywords match
-            text_to_search = " ".join(search_text)
-            all_keywords_match = all(
-                keyword in text_to_search
-                for keyword in keyword_list
+    The text format lists them as lines between '---' separators (none
+    when nothing matched); the other formats get one JSON payload with
+    {"spec", "total", "fuzzy", "results"}, each result with 'path',
+    'method', 'summary' and 'score' (plus 'spec' for a glob search).
+    """
+    if get_output_format() != "text":
+        results = []
+        for match in matches:
+            result = {"spec": match["spec"]} if "spec" in match else {}
+            result.update(
+                path=match["path"],
+                method=match["method"],
+                summary=match["summary"],
+                score=round(match["score"], 4),
             )
+            results.append(result)
+        output.data(json.dumps(
+            {"spec": name, "total": total, "fuzzy": fuzzy, "results": results},
+            ensure_ascii=False,
+        ))
+        return
+
+    if not matches:
+        return
+    output.raw("---")
+    for match in matches:
+        display_parts = [match["spec"]] if "spec" in match else []
+        display_parts.append(f"{match['path']}:{match['method']}")
+        if match["summary"]:
+            summary = match["summary"]
+            # Slightly longer limit since we have more space
+            if len(summary) > 80:
+                summary = summary[:77] + "..."
+            display_parts.append(f"- {summary}")
+        output.raw(" ".join(display_parts))
+    output.raw("---")
+
+
+def _search_specs(output: OutputBuilder, pattern: str, keywords: str, force: bool) -> None:
+    """Search every configured spec whose name matches a glob pattern."""
+    # 1. Resolve the pattern to spec names
+    output.action(f"Resolving specifications: {pattern}")
+    specs = GLOBAL_CONFIG.get_classified_specs()
+    names = [
+        name for name in fnmatch.filter(specs, pattern)
+        if specs[name][0] != "UNKNOWN"
+    ]
+    if not names:
+        output.error(f"No configured specification matches '{pattern}'")
+        output.note("Run 'apiscope list' to view configured APIs")
+        output.complete("Search")
+        output.emit()
+        raise click.ClickException("Search failed")
+    output.result(f"Matched {len(names)} specification(s): {', '.join(names)}")
+
+    # 2. Get the search indexes
+    indexes, errors = _open_indexes(names, force, output)
+    for name, error in errors.items():
+        output.error(f"Failed to load specification {name}: {error}")
+    if not indexes:
+        output.complete("Search")
+        output.emit()
+        raise click.ClickException("Search failed")
+    endpoint_count = sum(len(index) for index in indexes.values())
+    output.result(f"Search indexes ready: {endpoint_count} endpoint(s)")
+
+    # 3. Search and merge
+    output.action(f"Searching for: '{keywords}'")
+    total_matches, matches, fuzzy = _search_across_specs(indexes, keywords, output)
+
+    display_count = min(total_matches, DISPLAY_LIMIT)
+    keyword_list = [k for k in keywords.split() if k]
+    output.result(f"Search stats: {len(keyword_list)} keyword(s), {total_matches} result(s)")
+
+    if fuzzy:
+        quality = "Approximate matches - check keyword spelling"
+    else:
+        quality = _get_search_quality(total_matches, display_count)
+    output.note(f"Search quality: {quality}")
+
+    if total_matches == 0:
+        output.result("No matching endpoints found")
+        output.note("Try different keywords or check the specifications")
+        _add_results(output, pattern, total_matches, [], fuzzy)
+        output.complete("Search")
+        return
 
-            if all_keywords_match:
-                matches.append({
-                    "path": path,
-                    "method": method.upper(),
-                    "summary": str(operation["summary"]) if "summary" in operation else "",
-                    "operation_id": str(operation["operationId"]) if "operationId" in operation else ""
-                })
+    label = "similar" if fuzzy else "matching"
+    shown = f" - showing top {display_count}" if display_count < total_matches else ""
+    output.result(f"Found {total_matches} {label} endpoint(s) in {len(indexes)} specification(s){shown}")
 
-    return matches
+    _add_results(output, pattern, total_matches, matches[:display_count], fuzzy)
+
+    if total_matches > DISPLAY_LIMIT:
+        output.note(f"{total_matches - DISPLAY_LIMIT} more matches not shown")
+
+    output.action("Next steps")
+    if total_matches == 1:
+        example = f"{matches[0]['path']}:{matches[0]['method']}"
+        output.note(f"Use 'apiscope describe {matches[0]['spec']} {example}' for details")
+    else:
+        output.note("Use 'apiscope describe <name> <path:method>' with the name shown first")
+
+    output.complete("Search")
 
 
 def _get_search_quality(total_matches: int, display_count: int) -> str:
@@ -115,7 +379,8 @@ def search_command(name: str, keywords: str, force: bool):
     """
     Search within an API specification for endpoints matching keywords.
 
-    NAME: Name of the API specification from configuration
+    NAME: Name of the API specification from configuration, or a glob
+    over names ('*' for all, 'billing-*') to search several at once
     KEYWORDS: Space-separated keywords to search for (all must match)
     """
     output = OutputBuilder()
@@ -130,12 +395,32 @@ def search_command(name: str, keywords: str, force: bool):
         output.emit()
         return
 
+    if any(char in name for char in PATTERN_CHARS):
+        try:
+            _search_specs(output, name, keywords, force)
+        except click.ClickException:
+            raise
+        except Exception as e:
+            output.error(f"Unexpected error during search: {e}")
+            output.complete("Search")
+            output.emit()
+            raise click.ClickException("Search failed")
+        output.emit()
+        return
+
     try:
-        # 1. Get the specification
+        # 1. Get the search index (built from the specification on first use)
         output.action(f"Loading specification: {name}")
         try:
-            spec = get_spec(name, force)
-            output.result("Specification loaded successfully")
+            source = open_spec(name, force)
+            index = load_index(source.digest)
+            if index is None:
+                spec = source.load()
+                output.result("Specification loaded successfully")
+                output.action("Building search index")
+                index = EndpointIndex.build(spec)
+                save_index(source.digest, index)
+            output.result(f"Search index ready: {len(index)} endpoint(s)")
         except ParserError as e:
             output.error(f"Failed to load specification: {e}")
             output.complete("Search")
@@ -144,10 +429,16 @@ def search_command(name: str, keywords: str, force: bool):
 
         # 2. Search for endpoints
         output.action(f"Searching for: '{keywords}'")
-        matches = _search_endpoints(spec, keywords, output)
+        total_matches, matches = _search_endpoints(index, keywords, output)
+
+        # Fall back to typo-tolerant matching when nothing matches exactly
+        fuzzy = False
+        if total_matches == 0 and keywords.split():
+            output.note("No exact matches, trying fuzzy search")
+            total_matches, matches = _fuzzy_search_endpoints(index, keywords, output)
+            fuzzy = total_matches > 0
 
         # 3. Process and display results
-        total_matches = len(matches)
         display_count = min(total_matches, DISPLAY_LIMIT)
 
         # Add search statistics
@@ -155,40 +446,31 @@ def search_command(name: str, keywords: str, force: bool):
         output.result(f"Search stats: {len(keyword_list)} keyword(s), {total_matches} result(s)")
 
         # Assess search quality
-        quality = _get_search_quality(total_matches, display_count)
+        if fuzzy:
+            quality = "Approximate matches - check keyword spelling"
+        else:
+            quality = _get_search_quality(total_matches, display_count)
         output.note(f"Search quality: {quality}")
 
         if total_matches == 0:
             output.result("No matching endpoints found")
             output.note("Try different keywords or check the specification")
+            _add_results(output, name, total_matches, [], fuzzy)
         else:
             # Enhanced result count display
-            if display_count < total_matches:
-                output.result(f"Found {total_matches} matching endpoint(s) - showing first {display_count}")
+            if fuzzy:
+                shown = f" - showing top {display_count}" if display_count < total_matches else ""
+                output.result(f"Found {total_matches} similar endpoint(s){shown}")
+            elif display_count < total_matches:
+                output.result(f"Found {total_matches} matching endpoint(s) - showing top {display_count}")
                 # Only show broad search warning when significantly over limit
                 if total_matches > DISPLAY_LIMIT * 2:
                     output.note(f"Keyword '{keywords}' is too broad. Try more specific terms.")
             else:
                 output.result(f"Found {total_matches} matching endpoint(s)")
 
-            # Add visual separator
-            output.raw("---")
-
             # Display matching results
-            for i, match in enumerate(matches[:display_count], 1):
-                display_parts = [f"{match['path']}:{match['method']}"]
-
-                if match["summary"]:
-                    summary = match["summary"]
-                    # Slightly longer limit since we have more space
-                    if len(summary) > 80:
-                        summary = summary[:77] + "..."
-                    display_parts.append(f"- {summary}")
-
-                output.raw(" ".join(display_parts))
-
-            # Add visual separator
-            output.raw("---")
+            _add_results(output, name, total_matches, matches[:display_count], fuzzy)
 
             # Provide guidance based on result count
             if total_matches > DISPLAY_LIMIT:
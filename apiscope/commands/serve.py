@@ -0,0 +1,217 @@
+# apiscope/commands/serve.py
+"""
+Run a long-lived daemon that answers CLI invocations from memory.
+Uses LogLight-style output for consistent, concise logging.
+"""
+import io
+import json
+import os
+import socketserver
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Dict, List, Optional
+
+import click
+
+from ..core.output import OutputBuilder, get_output_format, log_output, set_output_format
+from ..core.config import GLOBAL_CONFIG
+from ..core.daemon import (
+    FORWARDED_COMMANDS,
+    NO_DAEMON_ENV,
+    _command_name,
+    get_socket_path,
+    request,
+)
+
+
+# How often the serve loop wakes up to check for a stop request
+POLL_INTERVAL = 0.5
+
+
+def _invoke_cli(argv: List[str]) -> int:
+    """
+    Run one CLI invocation in this process.
+
+    Returns:
+        Exit code, following click's standalone mode conventions.
+    """
+    from ..cli import cli  # Imported late: cli imports this module
+
+    try:
+        cli.main(args=argv, prog_name="apiscope", standalone_mode=False)
+        return 0
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        return 1
+
+
+def _run_forwarded(argv: List[str], cwd: Optional[str], stdin: Optional[str]) -> Dict[str, Any]:
+    """
+    Run a forwarded invocation with the client's working directory and stdin.
+
+    Requests are handled one at a time, so swapping process-wide state
+    (cwd, standard streams, output format) is safe.
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    previous_cwd = os.getcwd()
+    previous_stdin = sys.stdin
+    previous_format = get_output_format()
+
+    try:
+        if cwd:
+            os.chdir(cwd)
+        sys.stdin = io.StringIO(stdin or "")
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            exit_code = _invoke_cli(argv)
+    finally:
+        os.chdir(previous_cwd)
+        sys.stdin = previous_stdin
+        # The request's --format must not outlive it
+        set_output_format(previous_format)
+
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "exit_code": exit_code,
+    }
+
+
+class _DaemonServer(socketserver.UnixStreamServer):
+    """Unix socket server handling one request at a time."""
+
+    stop_requested = False
+
+    def server_bind(self) -> None:
+        """Bind with a umask that creates the socket file owner-only.
+
+        A chmod() after bind() would leave a window in which other users
+        could connect and run commands as the daemon's user.
+        """
+        previous = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answer a single JSON-line request."""
+
+    server: _DaemonServer
+
+    def handle(self) -> None:
+        try:
+            message = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+
+        control = message.get("control")
+        if control == "ping":
+            reply: Dict[str, Any] = {"ok": True}
+        elif control == "stop":
+            self.server.stop_requested = True
+            reply = {"ok": True}
+        elif isinstance(message.get("argv"), list):
+            argv = [str(arg) for arg in message["argv"]]
+            command = _command_name(argv)
+            if command in FORWARDED_COMMANDS:
+                reply = _run_forwarded(argv, message.get("cwd"), message.get("stdin"))
+            else:
+                # Clients only forward these, but the socket accepts any
+                # argv: 'serve' would block this loop, 'init' or 'note'
+                # would change state inside the daemon
+                reply = {"error": f"Command not served by the daemon: {command}"}
+        else:
+            reply = {"error": "Invalid request"}
+
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+@click.command()
+@click.option(
+    "--stop",
+    is_flag=True,
+    default=False,
+    help="Stop the daemon serving this project"
+)
+def serve_command(stop: bool):
+    """
+    Serve search, describe and list from a long-lived process.
+
+    While the daemon runs, those commands are forwarded to it over a Unix
+    socket and reuse its in-memory specs and indexes. Specs are reloaded
+    when the configuration or their content changes. Stop with Ctrl+C or
+    'apiscope serve --stop'.
+    """
+    output = OutputBuilder()
+    output.section("Serve")
+
+    # Check if configuration is initialized
+    if not GLOBAL_CONFIG.is_initialized:
+        output.action("Checking configuration state")
+        output.note("Configuration not initialized")
+        output.note("Run 'apiscope init' first")
+        output.complete("Serve")
+        output.emit()
+        return
+
+    socket_path = get_socket_path(GLOBAL_CONFIG.root)
+
+    if stop:
+        output.action("Stopping daemon")
+        if request(socket_path, {"control": "stop"}) is not None:
+            output.result("Daemon stopped")
+        else:
+            output.note("No daemon is running")
+        output.complete("Serve")
+        output.emit()
+        return
+
+    output.action("Checking for a running daemon")
+    if request(socket_path, {"control": "ping"}) is not None:
+        output.note(f"Daemon already running on {socket_path}")
+        output.complete("Serve")
+        output.emit()
+        return
+
+    try:
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        socket_path.unlink(missing_ok=True)  # Left over from a crashed daemon
+        server = _DaemonServer(str(socket_path), _RequestHandler)
+    except OSError as e:
+        output.error(f"Failed to listen on {socket_path}: {e}")
+        output.complete("Serve")
+        output.emit()
+        raise click.ClickException("Serve failed")
+
+    # Commands run inside the daemon must not forward to it again
+    os.environ[NO_DAEMON_ENV] = "1"
+    server.timeout = POLL_INTERVAL
+
+    output.result(f"Listening on {socket_path}")
+    output.note("Forwarding: " + ", ".join(FORWARDED_COMMANDS))
+    output.note("Press Ctrl+C to stop")
+    output.emit()
+
+    try:
+        while not server.stop_requested:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+
+    log_output("[=]", "Serve Complete")
@@ -2,12 +2,31 @@
 
 See docs/time-clustering-algorithm.md for detailed mathematical framework
 of note existence time indexing and memory fragmentation probability calculation.
+
+Times are converted once to an array('d') of epoch seconds. Gaps, the
+split mask and segment boundaries are computed on that array, and segments
+carry the index range of their points in the sorted order.
 """
-from typing import List, Dict, Any, Union
+from array import array
+from operator import itemgetter
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from dataclasses import dataclass
 from datetime import datetime
 import math
 
 
+def _epoch_seconds(points: List[Dict[str, Any]], time_key: str = 'time') -> array:
+    """Convert the times of data points to an array of epoch seconds."""
+    return array('d', map(datetime.timestamp, map(itemgetter(time_key), points)))
+
+
+def _sort_by_time(data_points: List[Dict[str, Any]], time_key: str = 'time'):
+    """Sort data points by time (stable), returning (points, epoch seconds)."""
+    seconds = _epoch_seconds(data_points, time_key)
+    order = sorted(range(len(seconds)), key=seconds.__getitem__)
+    return [data_points[i] for i in order], array('d', (seconds[i] for i in order))
+
+
 def analyze_temporal_patterns(
     data_points: List[Dict[str, Any]],
     time_key: str = 'time',
@@ -42,21 +61,20 @@ def analyze_temporal_patterns(
         current_time = datetime.now()
 
     # Sort by time to ensure proper ordering
-    sorted_points = sorted(data_points, key=lambda x: x[time_key])
+    sorted_points, seconds = _sort_by_time(data_points, time_key)
 
     # Calculate concentration using the mathematical framework
-    concentration = calculate_temporal_concentration(
-        data_points, time_key, current_time
-    )
+    concentration = _concentration_from_seconds(seconds, current_time.timestamp())
 
     # Perform time-based clustering for temporal ranges
-    clusters = _cluster_by_temporal_gaps(sorted_points, time_key, data_key)
+    clusters = _segments_from_bounds(
+        sorted_points, seconds, _gap_boundaries(seconds), time_key
+    )
 
     # Calculate additional metadata
     n = len(data_points)
-    times = [point[time_key] for point in data_points]
-    min_time = min(times)
-    max_time = max(times)
+    min_time = sorted_points[0][time_key]
+    max_time = sorted_points[-1][time_key]
     total_timespan = (max_time - min_time).total_seconds()
 
     metadata = {
@@ -75,75 +93,88 @@ def analyze_temporal_patterns(
     }
 
 
-def _cluster_by_temporal_gaps(
-    sorted_points: List[Dict[str, Any]],
-    time_key: str = 'time',
-    data_key: str = 'data'
-) -> List[Dict[str, Any]]:
-    """Internal function to cluster data points based on significant time gaps."""
-    n = len(sorted_points)
+def _gap_boundaries(seconds: array) -> List[Tuple[int, int]]:
+    """Split sorted epoch seconds at significant gaps.
+
+    A gap is significant when it is larger than the mean gap plus one
+    sample standard deviation.
+
+    Returns:
+        (start, end) index ranges of the segments, end exclusive
+    """
+    n = len(seconds)
+    if n == 0:
+        return []
     if n == 1:
-        return [{
-            'points': sorted_points,
-            'start_time': sorted_points[0][time_key],
-            'end_time': sorted_points[0][time_key],
-            'count': 1,
-            'timespan_seconds': 0
-        }]
-
-    # Calculate time deltas between consecutive points
-    deltas = []
-    for i in range(n - 1):
-        current_time = sorted_points[i][time_key]
-        next_time = sorted_points[i + 1][time_key]
-        delta = (next_time - current_time).total_seconds()
-        deltas.append(delta)
-
-    # Calculate mean and standard deviation of deltas
+        return [(0, 1)]
+
+    deltas = array('d', (seconds[i + 1] - seconds[i] for i in range(n - 1)))
     mu = sum(deltas) / len(deltas)
     if len(deltas) > 1:
         sigma = math.sqrt(sum((x - mu) ** 2 for x in deltas) / (len(deltas) - 1))
     else:
         sigma = 0.0
+    threshold = mu + sigma
+    splits = [i + 1 for i, delta in enumerate(deltas) if delta > threshold] if sigma > 0 else []
 
-    # Split segments where delta > mean + 1*std (significant time gap)
-    segments = []
-    start_idx = 0
-
-    for i, delta in enumerate(deltas):
-        if sigma > 0 and delta > mu + sigma:
-            # Create segment from start_idx to i+1
-            segment_points = sorted_points[start_idx:i + 1]
-            segment_start = segment_points[0][time_key]
-            segment_end = segment_points[-1][time_key]
-            timespan = (segment_end - segment_start).total_seconds()
-            segments.append({
-                'points': segment_points,
-                'start_time': segment_start,
-                'end_time': segment_end,
-                'count': len(segment_points),
-                'timespan_seconds': timespan
-            })
-            start_idx = i + 1
-
-    # Add the final segment
-    if start_idx < n:
-        final_segment_points = sorted_points[start_idx:]
-        if final_segment_points:
-            segment_start = final_segment_points[0][time_key]
-            segment_end = final_segment_points[-1][time_key]
-            timespan = (segment_end - segment_start).total_seconds()
-            segments.append({
-                'points': final_segment_points,
-                'start_time': segment_start,
-                'end_time': segment_end,
-                'count': len(final_segment_points),
-                'timespan_seconds': timespan
-            })
+    starts = [0] + splits
+    ends = splits + [n]
+    return list(zip(starts, ends))
 
+
+def _segments_from_bounds(
+    sorted_points: List[Dict[str, Any]],
+    seconds: array,
+    bounds: List[Tuple[int, int]],
+    time_key: str = 'time'
+) -> List[Dict[str, Any]]:
+    """Build segment dicts for index ranges of the sorted points."""
+    segments = []
+    for start, end in bounds:
+        segments.append({
+            'points': sorted_points[start:end],
+            'start_index': start,
+            'end_index': end,
+            'start_time': sorted_points[start][time_key],
+            'end_time': sorted_points[end - 1][time_key],
+            'count': end - start,
+            'timespan_seconds': float(seconds[end - 1] - seconds[start])
+        })
     return segments
 
 
+def _cluster_by_temporal_gaps(
+    sorted_points: List[Dict[str, Any]],
+    time_key: str = 'time',
+    data_key: str = 'data'
+) -> List[Dict[str, Any]]:
+    """Internal function to cluster data points based on significant time gaps."""
+    seconds = _epoch_seconds(sorted_points, time_key)
+    return _segments_from_bounds(sorted_points, seconds, _gap_boundaries(seconds), time_key)
+
+
+def _concentration_from_seconds(seconds: array, current_timestamp: float) -> float:
+    """Concentration index for epoch seconds, clamping future times to 0."""
+    n = len(seconds)
+    if n <= 1:
+        return 0.0
+
+    # Existence times d_i(T) = T - t_i, clamped to be non-negative
+    existence_times = [max(current_timestamp - t_ts, 0) for t_ts in seconds]
+    total_existence_time = sum(existence_times)
+    if total_existence_time == 0:
+        return 0.0
+    uniform_weight = 1.0 / n
+    sum_squared_deviations = sum(
+        (et / total_existence_time - uniform_weight) ** 2 for et in existence_times
+    )
+
+    concentration = (n / (n - 1)) * sum_squared_deviations
+
+    # Clamp to [0, 1] range to handle floating point precision issues
+    return max(0.0, min(1.0, concentration))
+
+
 def calculate_temporal_concentration(data_points: List[Dict[str, Any]], time_key: str = 'time', current_time: datetime = None) -> float:
     """Calculate temporal concentration index using existence weights and normalized variance.
 
@@ -153,6 +184,9 @@ def calculate_temporal_concentration(data_points: List[Dict[str, Any]], time_key
     - Existence weights: w_i(T) = d_i(T) / D(T) = (T - t_i) / (nT - sum(t_i))
     - Normalized variance: C_norm = (n / (n-1)) * sum((w_i - 1/n)^2)
 
+    Existence times of notes later than the observation time are clamped
+    to 0.
+
     Args:
         data_points: List of dictionaries containing time attributes
         time_key: Key name for the time attribute
@@ -167,33 +201,73 @@ def calculate_temporal_concentration(data_points: List[Dict[str, Any]], time_key
     if current_time is None:
         current_time = datetime.now()
 
-    n = len(data_points)
-    times = [point[time_key] for point in data_points]
-
-    # Convert all times to timestamps for calculation
-    time_timestamps = [t.timestamp() for t in times]
-    current_timestamp = current_time.timestamp()
-
-    # Calculate existence times: d_i(T) = T - t_i
-    existence_times = [current_timestamp - t_ts for t_ts in time_timestamps]
-
-    # Ensure all existence times are non-negative
-    existence_times = [max(et, 0) for et in existence_times]
+    return _concentration_from_seconds(
+        _epoch_seconds(data_points, time_key), current_time.timestamp()
+    )
 
-    # Calculate total existence time: D(T) = sum(d_i(T)) = nT - sum(t_i)
-    total_existence_time = sum(existence_times)
 
-    # Handle edge case where all notes are from the future or same time
-    if total_existence_time == 0:
-        return 0.0
+@dataclass
+class TemporalMoments:
+    """Running moments of note times for constant-time concentration.
 
-    # Calculate existence weights: w_i(T) = d_i(T) / D(T)
-    weights = [et / total_existence_time for et in existence_times]
+    With all existence times non-negative (T >= latest), the normalized
+    variance only depends on n, the mean generation time and the sum of
+    squared deviations M2 = sum((t_i - mean)^2):
 
-    # Calculate normalized variance: C_norm = (n / (n-1)) * sum((w_i - 1/n)^2)
-    uniform_weight = 1.0 / n
-    sum_squared_deviations = sum((w - uniform_weight) ** 2 for w in weights)
-    concentration = (n / (n - 1)) * sum_squared_deviations
+        D(T) = n * (T - mean)
+        sum((w_i - 1/n)^2) = M2 / D(T)^2
+        C_norm = (n / (n-1)) * M2 / D(T)^2
 
-    # Clamp to [0, 1] range to handle floating point precision issues
-    return max(0.0, min(1.0, concentration))
+    mean and M2 are updated with Welford's method, so adding a note is O(1)
+    and stays exact for timestamps far from the origin. Times are POSIX
+    timestamps (datetime.timestamp()).
+    """
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    latest: float = float('-inf')
+
+    @classmethod
+    def from_times(cls, timestamps: Iterable[float]) -> "TemporalMoments":
+        """Build moments from a sequence of timestamps."""
+        moments = cls()
+        for timestamp in timestamps:
+            moments.add(timestamp)
+        return moments
+
+    def add(self, timestamp: float) -> None:
+        """Add one note time."""
+        self.count += 1
+        delta = timestamp - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (timestamp - self.mean)
+        self.latest = max(self.latest, timestamp)
+
+    def concentration(self, current_time: datetime = None) -> Optional[float]:
+        """Calculate the temporal concentration index at an observation time.
+
+        Args:
+            current_time: Current observation time (defaults to datetime.now())
+
+        Returns:
+            Concentration index between 0.0 and 1.0, or None if a note is
+            later than current_time; its existence time would be clamped
+            to 0, so calculate_temporal_concentration() must be used
+        """
+        if self.count <= 1:
+            return 0.0
+
+        if current_time is None:
+            current_time = datetime.now()
+        current_timestamp = current_time.timestamp()
+        if current_timestamp < self.latest:
+            return None
+
+        # Total existence time: D(T) = nT - sum(t_i)
+        total_existence_time = self.count * (current_timestamp - self.mean)
+        if total_existence_time <= 0:
+            return 0.0
+
+        n = self.count
+        concentration = (n / (n - 1)) * self.m2 / (total_existence_time ** 2)
+        return max(0.0, min(1.0, concentration))
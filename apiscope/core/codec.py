@@ -0,0 +1,149 @@
+# apiscope/core/codec.py
+
+"""
+Compression codecs for cached specification bodies.
+
+zlib is always available. zstd is used when the optional 'zstandard'
+package is installed: it compresses large specs better and decodes faster.
+Decompression is exposed as a readable stream so the YAML/JSON loader can
+consume a cached body chunk by chunk, without materializing the whole
+decompressed text first.
+"""
+
+# Standard library
+import io
+import zlib
+from typing import BinaryIO
+
+# Optional third-party libraries
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Constants
+CHUNK_SIZE = 64 * 1024
+ZLIB_LEVEL = 9
+ZSTD_LEVEL = 10
+
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD = "zstd"
+DEFAULT_CODEC = CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+# Errors raised by the decompressors on corrupted input
+DECOMPRESS_ERRORS = (zlib.error,) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+class CodecError(Exception):
+    """Unknown or unavailable codec, or corrupted data."""
+    pass
+
+
+def is_available(codec: str) -> bool:
+    """Check whether a codec can be used in this environment."""
+    if codec == CODEC_ZLIB:
+        return True
+    if codec == CODEC_ZSTD:
+        return zstandard is not None
+    return False
+
+
+def _check_codec(codec: str) -> None:
+    """Raise CodecError if codec cannot be used."""
+    if not is_available(codec):
+        raise CodecError(f"Codec '{codec}' is not available")
+
+
+def compress(raw: bytes, codec: str = DEFAULT_CODEC) -> bytes:
+    """
+    Compress bytes with the given codec.
+
+    Args:
+        raw: Uncompressed data.
+        codec: Codec name (zlib or zstd).
+
+    Returns:
+        Compressed data.
+    """
+    _check_codec(codec)
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return zlib.compress(raw, ZLIB_LEVEL)
+
+
+class _DecompressingReader(io.RawIOBase):
+    """
+    Raw stream that decompresses a compressed source incrementally.
+
+    Works with any decompressor object with decompress(), flush() and eof
+    (zlib.decompressobj() and zstandard's decompressobj()). Corrupted data,
+    and a source that ends before the end of the compressed stream, raise
+    CodecError.
+    """
+
+    def __init__(self, source: BinaryIO, decompressor) -> None:
+        self._source = source
+        self._decompressor = decompressor
+        self._pending = b""
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            if self._eof:
+                return 0
+
+            chunk = self._source.read(CHUNK_SIZE)
+            try:
+                if chunk:
+                    self._pending = self._decompressor.decompress(chunk)
+                    continue
+                self._pending = self._decompressor.flush()
+            except DECOMPRESS_ERRORS as e:
+                raise CodecError(f"Corrupted data: {e}")
+            if not self._decompressor.eof:
+                raise CodecError("Truncated data: compressed stream does not end")
+            self._eof = True
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._source.close()
+        super().close()
+
+
+def open_reader(source: BinaryIO, codec: str) -> BinaryIO:
+    """
+    Wrap a compressed binary stream in a decompressing reader.
+
+    Closing the returned reader also closes the source.
+
+    Args:
+        source: Readable stream of compressed data.
+        codec: Codec the data was compressed with.
+
+    Returns:
+        Buffered binary stream of decompressed data.
+    """
+    _check_codec(codec)
+    if codec == CODEC_ZSTD:
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+    else:
+        decompressor = zlib.decompressobj()
+    return io.BufferedReader(_DecompressingReader(source, decompressor), CHUNK_SIZE)
+
+
+def open_text_reader(
+    source: BinaryIO,
+    codec: str,
+    encoding: str = "utf-8"
+) -> io.TextIOWrapper:
+    """Wrap a compressed binary stream in a decompressing text reader."""
+    return io.TextIOWrapper(open_reader(source, codec), encoding=encoding)
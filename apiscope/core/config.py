@@ -4,6 +4,7 @@ Configuration state management for apiscope.
 Maintains a single source of truth for project configuration.
 """
 import configparser
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Optional, Tuple
@@ -11,14 +12,37 @@ from typing import Dict, Optional, Tuple
 # Configuration section name
 SECTION_NAME = "specs"
 
+CONFIG_FILE_NAME = "apiscope.ini"
+
+# Names the project root directly, skipping discovery
+ROOT_ENV = "APISCOPE_ROOT"
+
+
+def _config_mtime(root: Path) -> Optional[int]:
+    """Get the mtime of a root's apiscope.ini, or None if there is none."""
+    try:
+        return (root / CONFIG_FILE_NAME).stat().st_mtime_ns
+    except OSError:
+        return None
+
+
 def find_project_root() -> Optional[Path]:
     """
     Find project root by looking for .git directory AND apiscope.ini.
     Returns None if either is missing (e.g., before initialization).
+
+    $APISCOPE_ROOT names the root directly when it holds both, which skips
+    the walk up from the working directory.
     """
+    explicit = os.environ.get(ROOT_ENV)
+    if explicit:
+        root = Path(explicit).resolve()
+        if _config_mtime(root) is not None and (root / ".git").is_dir():
+            return root
+
     current = Path.cwd().resolve()
     for parent in [current] + list(current.parents):
-        if (parent / ".git").is_dir() and (parent / "apiscope.ini").is_file():
+        if (parent / ".git").is_dir() and (parent / CONFIG_FILE_NAME).is_file():
             return parent
     return None
 
@@ -46,35 +70,56 @@ class GlobalConfig:
         self._file: Optional[Path] = None
         self._cache: Optional[Path] = None
         self._settings: Optional[configparser.ConfigParser] = None
+        self._settings_mtime: Optional[int] = None  # ini mtime when parsed
         self._specs_cache: Optional[Dict[str, Tuple[str, str]]] = None  # name -> (type, source)
-
-        # Try to auto-discover, but don't fail if not found
-        try:
-            self.load()
-        except RuntimeError:
-            # Not initialized yet, that's okay
-            pass
+        self._load_attempted = False
 
         self._initialized = True
 
+    def _try_load(self) -> None:
+        """
+        Discover and parse the configuration on first use.
+
+        Loading is deferred from import time, so that the CLI can time it
+        as a step of the invocation. Not finding a project is fine here.
+        """
+        if self._settings is None and not self._load_attempted:
+            try:
+                self.load()
+            except RuntimeError:
+                # Not initialized yet, that's okay
+                pass
+
     def _ensure_loaded(self) -> None:
         """Ensure configuration is loaded, or raise RuntimeError."""
+        self._try_load()
         if self._settings is None:
             raise RuntimeError(
                 "Configuration not loaded. Run 'apiscope init' first or call load() manually."
             )
 
     def load(self) -> None:
-        """Load configuration from disk. Raises RuntimeError if not found."""
+        """
+        Load configuration from disk. Raises RuntimeError if not found.
+
+        apiscope.ini is parsed once per process: later calls keep the parsed
+        settings unless the project root or the file's mtime changed.
+        """
+        self._load_attempted = True
         root = find_project_root()
         if root is None:
             raise RuntimeError("Project root not found. Run 'apiscope init' first.")
 
+        mtime = _config_mtime(root)
+        if self._settings is not None and root == self._root and mtime == self._settings_mtime:
+            return
+
         self._root = root
         self._home = self._root / ".apiscope"
-        self._file = self._root / "apiscope.ini"
+        self._file = self._root / CONFIG_FILE_NAME
         self._cache = self._home / "cache"
         self._settings = self._load_settings(self._file)
+        self._settings_mtime = mtime
         self._specs_cache = None  # Clear cache
 
     def reload(self) -> None:
@@ -147,6 +192,21 @@ class GlobalConfig:
         """Path to HTTP cache database."""
         return self.cache / "http.db"
 
+    @property
+    def describe_store_path(self) -> Path:
+        """Path to the precomputed describe output database."""
+        return self.cache / "describe.db"
+
+    @property
+    def snapshot_dir(self) -> Path:
+        """Directory holding parsed specification snapshots."""
+        return self.cache / "snapshots"
+
+    @property
+    def index_dir(self) -> Path:
+        """Directory holding per-spec search indexes."""
+        return self.cache / "indexes"
+
     @property
     def settings(self) -> configparser.ConfigParser:
         self._ensure_loaded()
@@ -215,16 +275,19 @@ class GlobalConfig:
         """Save current configuration to disk."""
         with open(self.file, 'w') as f:
             self.settings.write(f)
+        self._settings_mtime = _config_mtime(self.root)
 
     @property
     def is_initialized(self) -> bool:
         """Check if configuration is fully initialized (has [specs] section)."""
+        self._try_load()
         if self._settings is None:
             return False
         return self.settings.has_section(SECTION_NAME)
 
     def ensure_directories(self) -> None:
         """Ensure all required directories exist."""
+        self._try_load()
         if self._home:
             self._home.mkdir(exist_ok=True)
         if self._cache:
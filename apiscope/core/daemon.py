@@ -0,0 +1,160 @@
+# apiscope/core/daemon.py
+
+"""
+Client side of the 'apiscope serve' daemon.
+
+The daemon listens on a Unix domain socket under .apiscope/ and runs CLI
+invocations inside its long-lived process, where parsed specs, search
+indexes and reference caches stay in memory. Each connection carries one
+request and one reply, both a single line of JSON:
+
+    request:  {"argv": [...], "cwd": "...", "stdin": "..." | null}
+              {"control": "ping" | "stop"}
+    reply:    {"stdout": "...", "stderr": "...", "exit_code": 0}
+              {"ok": true}
+
+This module only uses the standard library so that forwarding does not pay
+for importing the parser stack.
+"""
+
+# Standard library
+import hashlib
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Local modules
+from .config import find_project_root
+
+
+# Constants
+FORWARDED_COMMANDS = ("search", "describe", "list")
+GROUP_OPTIONS_WITH_VALUE = ("--format", "--trace")  # 'apiscope --format json search ...'
+NO_DAEMON_ENV = "APISCOPE_NO_DAEMON"  # Set to run commands locally
+FORMAT_ENV = "APISCOPE_FORMAT"  # Default of the group's --format option
+DEFAULT_FORMAT = "text"
+SOCKET_NAME = "daemon.sock"
+MAX_SOCKET_PATH = 100  # sun_path holds 104-108 bytes depending on platform
+CONNECT_TIMEOUT = 0.5
+
+
+def get_socket_path(root: Path) -> Path:
+    """
+    Get the daemon socket path for a project.
+
+    The socket lives in .apiscope/ unless that path is too long for a Unix
+    socket, in which case a per-project name in the temp directory is used.
+    """
+    path = root / ".apiscope" / SOCKET_NAME
+    if len(str(path)) <= MAX_SOCKET_PATH:
+        return path
+
+    digest = hashlib.sha256(str(root).encode()).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"apiscope-{digest}.sock"
+
+
+def request(socket_path: Path, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Send one request to the daemon.
+
+    Args:
+        socket_path: Path from get_socket_path()
+        message: Request object
+
+    Returns:
+        Reply object, or None if no daemon answered.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(socket_path))
+        sock.settimeout(None)  # Building caches may take a while
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+    try:
+        reply = json.loads(line)
+    except ValueError:
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+def _command_name(argv: List[str]) -> Optional[str]:
+    """Get the subcommand of an argument list (first non-option argument)."""
+    args = iter(argv)
+    for arg in args:
+        if arg in GROUP_OPTIONS_WITH_VALUE:
+            next(args, None)  # Skip the option's value
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def _pin_format(argv: List[str]) -> List[str]:
+    """
+    Make the client's output format explicit in a forwarded argument list.
+
+    The daemon does not see the client's environment (and may have its
+    own), so a format chosen with APISCOPE_FORMAT is passed as --format.
+    """
+    args = iter(argv)
+    for arg in args:
+        if arg == "--format" or arg.startswith("--format="):
+            return argv
+        if arg in GROUP_OPTIONS_WITH_VALUE:
+            next(args, None)
+        elif not arg.startswith("-"):
+            break  # Group options end at the subcommand
+    return ["--format", os.environ.get(FORMAT_ENV) or DEFAULT_FORMAT, *argv]
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    """
+    Run a CLI invocation in the daemon if one serves this project.
+
+    Only read-only commands are forwarded. Output is written to this
+    process's stdout/stderr as if the command had run locally.
+
+    Args:
+        argv: Command line arguments (without the program name)
+
+    Returns:
+        Exit code of the command, or None if it must run locally.
+    """
+    if os.environ.get(NO_DAEMON_ENV) or _command_name(argv) not in FORWARDED_COMMANDS:
+        return None
+
+    root = find_project_root()
+    if root is None:
+        return None
+
+    socket_path = get_socket_path(root)
+    if not socket_path.exists():
+        return None
+
+    # Only read stdin when a command was told to ('-' as file argument)
+    stdin = sys.stdin.read() if "-" in argv else None
+
+    reply = request(
+        socket_path, {"argv": _pin_format(argv), "cwd": os.getcwd(), "stdin": stdin}
+    )
+    if reply is None or "exit_code" not in reply:
+        if stdin is not None:
+            sys.stdin = io.StringIO(stdin)  # Hand it to the local run instead
+        return None
+
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stdout.flush()
+    sys.stderr.write(reply.get("stderr", ""))
+    sys.stderr.flush()
+    return int(reply["exit_code"])
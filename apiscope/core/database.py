@@ -0,0 +1,34 @@
+# apiscope/core/database.py
+
+"""
+Connection settings shared by apiscope's SQLite databases.
+
+The HTTP cache, the describe store and the note manifest are all opened
+by several apiscope processes at once: they run in WAL mode so readers
+never block the writer, and wait for a busy database instead of failing.
+"""
+
+# Standard library
+import sqlite3
+from pathlib import Path
+
+
+# Constants
+BUSY_TIMEOUT_MS = 5000
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """
+    Open a SQLite database with the shared connection settings.
+
+    Args:
+        path: Path to the database file (created if missing).
+
+    Returns:
+        Connection in WAL mode with a busy timeout.
+    """
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
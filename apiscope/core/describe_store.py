@@ -0,0 +1,177 @@
+# apiscope/core/describe_store.py
+
+"""
+Precomputed describe output for every operation of a specification.
+
+The store is a SQLite database at .apiscope/cache/describe.db holding the
+serialized describe JSON of each operation, keyed by the spec's content
+hash plus path and method. It is filled in one pass the first time a spec
+version is described (or by 'apiscope fetch'), after which describing an
+operation is a single key lookup without parsing the spec.
+"""
+
+# Standard library
+import marshal
+import time
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple
+
+# Local modules
+from .database import connect
+
+
+# Constants
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS specs (
+    digest TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    built_at REAL NOT NULL,
+    routes BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_specs_name ON specs (name);
+CREATE TABLE IF NOT EXISTS operations (
+    digest TEXT NOT NULL,
+    path TEXT NOT NULL,
+    method TEXT NOT NULL,
+    document BLOB NOT NULL,
+    PRIMARY KEY (digest, path, method)
+) WITHOUT ROWID;
+"""
+
+# (path templates, server base paths), as accepted by PathRouter
+Routes = Tuple[List[str], List[str]]
+
+
+class DescribeStore:
+    """
+    Rendered describe documents stored in a single SQLite database.
+
+    Usage:
+        with DescribeStore(GLOBAL_CONFIG.describe_store_path) as store:
+            if not store.has(digest):
+                store.save(name, digest, documents, routes)
+            document = store.get(digest, "/pets/{petId}", "get")
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open (and create if needed) the store database.
+
+        Args:
+            path: Path to the SQLite database file.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = connect(path)
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        """Create tables on first use."""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "DescribeStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # Lookups
+
+    def has(self, digest: str) -> bool:
+        """Check whether a spec version has been rendered."""
+        row = self._conn.execute(
+            "SELECT 1 FROM specs WHERE digest = ?", (digest,)
+        ).fetchone()
+        return row is not None
+
+    def get(self, digest: str, path: str, method: str) -> Optional[bytes]:
+        """
+        Get the serialized describe document of one operation.
+
+        Args:
+            digest: Content hash of the specification
+            path: Path template
+            method: HTTP method (lowercase)
+
+        Returns:
+            UTF-8 JSON bytes, or None if not stored.
+        """
+        row = self._conn.execute(
+            "SELECT document FROM operations"
+            " WHERE digest = ? AND path = ? AND method = ?",
+            (digest, path, method),
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def routes(self, digest: str) -> Optional[Routes]:
+        """Get the path templates and server base paths of a spec version."""
+        row = self._conn.execute(
+            "SELECT routes FROM specs WHERE digest = ?", (digest,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            templates, base_paths = marshal.loads(row[0])
+        except (EOFError, ValueError, TypeError):
+            return None
+        return templates, base_paths
+
+    def count(self, digest: str) -> int:
+        """Get the number of stored operations of a spec version."""
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM operations WHERE digest = ?", (digest,)
+        ).fetchone()[0]
+
+    # Updates
+
+    def save(
+        self,
+        name: str,
+        digest: str,
+        documents: Iterable[Tuple[str, str, bytes]],
+        routes: Routes
+    ) -> None:
+        """
+        Store the rendered operations of a spec version.
+
+        Older versions of the same spec are removed in the same transaction.
+
+        Args:
+            name: Specification name from configuration
+            digest: Content hash of the specification
+            documents: (path, method, JSON bytes) for every operation
+            routes: Path templates and server base paths for resolving
+                concrete request paths
+        """
+        templates, base_paths = routes
+        with self._conn:
+            stale = [
+                row[0] for row in self._conn.execute(
+                    "SELECT digest FROM specs WHERE name = ? AND digest != ?",
+                    (name, digest),
+                )
+            ]
+            for old_digest in stale + [digest]:
+                self._conn.execute("DELETE FROM operations WHERE digest = ?", (old_digest,))
+                self._conn.execute("DELETE FROM specs WHERE digest = ?", (old_digest,))
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO operations (digest, path, method, document)"
+                " VALUES (?, ?, ?, ?)",
+                ((digest, path, method, document) for path, method, document in documents),
+            )
+            self._conn.execute(
+                "INSERT INTO specs (digest, name, built_at, routes) VALUES (?, ?, ?, ?)",
+                (digest, name, time.time(), marshal.dumps((list(templates), list(base_paths)))),
+            )
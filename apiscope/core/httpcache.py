@@ -0,0 +1,313 @@
+# apiscope/core/httpcache.py
+
+"""
+SQLite-backed HTTP cache store for remote specifications.
+
+Each cached response is one row in .apiscope/cache/http.db: the body as a
+compressed blob (zstd when available, zlib otherwise) plus indexed metadata
+columns (fetch time, validators, size, content hash). The database runs in
+WAL mode so many apiscope processes can read concurrently while one of them
+writes.
+
+A refetch replaces the row of its URL, so the database only grows with the
+number of distinct URLs fetched; entries are never evicted.
+"""
+
+# Standard library
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, Optional
+
+# Local modules
+from .codec import (
+    DEFAULT_CODEC,
+    CodecError,
+    compress,
+    is_available,
+    open_text_reader,
+)
+from .database import connect
+from .snapshot import content_hash
+
+
+# Constants
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    content BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_fetched_at ON responses (fetched_at);
+"""
+
+METADATA_COLUMNS = (
+    "url, fetched_at, etag, last_modified, size, stored_size, content_hash, codec"
+)
+
+
+@dataclass
+class CacheEntry:
+    """Metadata of a cached response (the body is read separately)."""
+
+    url: str
+    fetched_at: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+    size: int
+    stored_size: int
+    content_hash: str
+    codec: str
+
+    def is_fresh(self, max_age_seconds: float) -> bool:
+        """Check whether the entry is younger than max_age_seconds."""
+        return (time.time() - self.fetched_at) < max_age_seconds
+
+    @property
+    def is_readable(self) -> bool:
+        """Check whether the body's codec is available in this environment."""
+        return is_available(self.codec)
+
+    @property
+    def conditional_headers(self) -> Dict[str, str]:
+        """If-None-Match/If-Modified-Since headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    HTTP response cache stored in a single SQLite database.
+
+    Usage:
+        with HttpCache(GLOBAL_CONFIG.http_cache_path) as cache:
+            entry = cache.get(url)
+            if entry is not None and entry.is_fresh(ttl):
+                with cache.open_content(url) as stream:
+                    data = parse(stream)
+    """
+
+    def __init__(self, path: Path, legacy_dir: Optional[Path] = None) -> None:
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path: Path to the SQLite database file.
+            legacy_dir: Directory of old per-URL JSON cache files; entries
+                found there are migrated into the database on lookup.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._path = path
+        self._legacy_dir = legacy_dir
+        self._conn = connect(path)
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        """Create tables on first use."""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "HttpCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # Lookups
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        Get cached metadata for a URL.
+
+        Args:
+            url: Request URL.
+
+        Returns:
+            CacheEntry, or None if the URL has not been cached.
+        """
+        row = self._conn.execute(
+            f"SELECT {METADATA_COLUMNS} FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if row is not None:
+            return CacheEntry(*row)
+
+        if self._migrate_legacy_entry(url):
+            return self.get(url)
+        return None
+
+    def open_content(self, url: str) -> Optional[IO[str]]:
+        """
+        Open the cached body for a URL as a decompressing text stream.
+
+        The blob is read from the database and decompressed incrementally,
+        so it can be handed straight to a parser. The connection must stay
+        open until the stream is closed.
+
+        Returns:
+            Readable text stream, or None if missing or not decodable here.
+        """
+        row = self._conn.execute(
+            "SELECT rowid, codec FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        rowid, codec = row
+        blob = self._conn.blobopen("responses", "content", rowid, readonly=True)
+        try:
+            return open_text_reader(blob, codec)
+        except CodecError:
+            blob.close()
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize the cache.
+
+        Returns:
+            Dictionary with entry count, total body size, total stored
+            (compressed) size and oldest/newest fetch times.
+        """
+        row = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0),"
+            " MIN(fetched_at), MAX(fetched_at) FROM responses"
+        ).fetchone()
+        return {
+            "entries": row[0],
+            "size": row[1],
+            "stored_size": row[2],
+            "oldest": row[3],
+            "newest": row[4],
+        }
+
+    # Updates
+
+    def put(
+        self,
+        url: str,
+        content: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        fetched_at: Optional[float] = None
+    ) -> CacheEntry:
+        """
+        Store a response body and its validators.
+
+        Args:
+            url: Request URL.
+            content: Response text.
+            etag: ETag response header, if any.
+            last_modified: Last-Modified response header, if any.
+            fetched_at: Fetch time (defaults to now).
+
+        Returns:
+            Metadata of the stored entry.
+        """
+        raw = content.encode("utf-8")
+        blob = compress(raw, DEFAULT_CODEC)
+        entry = CacheEntry(
+            url=url,
+            fetched_at=time.time() if fetched_at is None else fetched_at,
+            etag=etag,
+            last_modified=last_modified,
+            size=len(raw),
+            stored_size=len(blob),
+            content_hash=content_hash(raw),
+            codec=DEFAULT_CODEC,
+        )
+
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                f" ({METADATA_COLUMNS}, content)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry.url, entry.fetched_at, entry.etag, entry.last_modified,
+                    entry.size, entry.stored_size, entry.content_hash,
+                    entry.codec, blob,
+                ),
+            )
+        return entry
+
+    def touch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """
+        Mark an entry as freshly fetched after a 304 Not Modified response.
+
+        Validators are only replaced when the server sent new ones.
+        """
+        with self._conn:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?,"
+                " etag = COALESCE(?, etag),"
+                " last_modified = COALESCE(?, last_modified)"
+                " WHERE url = ?",
+                (time.time(), etag, last_modified, url),
+            )
+
+    # Legacy migration
+
+    def _migrate_legacy_entry(self, url: str) -> bool:
+        """
+        Import the old JSON cache file for a URL, then remove it.
+
+        Old files live at <cache>/http/<md5(url)> and hold a JSON object with
+        'content' and optional 'etag'/'last_modified'. The file mtime is used
+        as the fetch time so the original TTL is preserved.
+        """
+        if self._legacy_dir is None:
+            return False
+
+        legacy_path = self._legacy_dir / hashlib.md5(url.encode()).hexdigest()
+        try:
+            fetched_at = legacy_path.stat().st_mtime
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                cache_data = json.load(f)
+            content = cache_data["content"]
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            return False
+
+        if not isinstance(content, str):
+            return False
+
+        self.put(
+            url,
+            content,
+            etag=cache_data.get("etag"),
+            last_modified=cache_data.get("last_modified"),
+            fetched_at=fetched_at,
+        )
+
+        legacy_path.unlink(missing_ok=True)
+        try:
+            self._legacy_dir.rmdir()  # Only succeeds once it is empty
+        except OSError:
+            pass
+        return True
@@ -0,0 +1,445 @@
+# apiscope/core/index.py
+
+"""
+Persistent inverted index for endpoint search.
+
+The index maps every word token of an operation's searchable text (summary,
+description, operationId and path) to the list of operation ids containing
+it. It is built once per spec version and stored under
+.apiscope/cache/indexes/ keyed by the spec's content hash, so searches
+intersect posting lists instead of walking the whole document.
+
+Matches are ranked with BM25F: per-field term frequencies are weighted by
+FIELD_BOOSTS and length-normalized against the field's average length, so an
+endpoint whose operationId, path or summary mentions the keywords ranks
+above one that only mentions them deep in its description.
+
+The index also maps character trigrams to the vocabulary tokens containing
+them. When a query has no exact match, fuzzy_search() uses it to find
+tokens similar to misspelled keywords ("webhok" -> "webhooks") without
+rescanning the vocabulary.
+"""
+
+# Standard library
+import heapq
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+# Local modules
+from .config import GLOBAL_CONFIG
+from .snapshot import SNAPSHOT_SUFFIX, MemoCache, read_marshal, write_marshal
+
+if TYPE_CHECKING:
+    from .parser import SpecSource
+
+
+# Constants
+INDEX_FORMAT = 3  # Bump when the stored layout changes
+TOKEN_PATTERN = re.compile(r"\w+")
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+# Searchable fields, in the order they are stored per operation
+FIELDS = ("summary", "description", "operationId", "path")
+FIELD_BOOSTS = (2.0, 1.0, 3.0, 2.0)
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Minimum share of a keyword's trigrams a token must contain to be similar
+FUZZY_THRESHOLD = 0.5
+
+# (path, METHOD, summary, operationId)
+Operation = Tuple[str, str, str, str]
+
+# Indexes of this process, keyed by spec content hash
+_LOADED_INDEXES = MemoCache()
+
+
+def _trigrams(word: str) -> Set[str]:
+    """Get the padded character trigrams of a word (pg_trgm style)."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class EndpointIndex:
+    """
+    Inverted index over the operations of one specification.
+
+    Matching keeps the substring semantics of the original scan: a keyword
+    matches when it occurs anywhere in the lowercased searchable text. Any
+    run of word characters inside a keyword must lie within a single text
+    token, so candidates come from the tokens containing that run, and only
+    keywords with punctuation need a final check against the text.
+    """
+
+    def __init__(
+        self,
+        operations: List[Operation],
+        field_texts: List[Tuple[str, ...]],
+        field_lengths: List[Tuple[int, ...]],
+        postings: Dict[str, List[int]],
+        trigrams: Dict[str, List[int]]
+    ) -> None:
+        self._operations = operations
+        self._field_texts = field_texts
+        self._field_lengths = field_lengths
+        self._postings = postings
+        self._trigrams = trigrams  # trigram -> positions in self._vocabulary
+        self._vocabulary = list(postings)
+        self._short_fragments: Dict[str, Set[int]] = {}  # See _tokens_containing()
+
+        count = max(len(field_lengths), 1)
+        self._average_lengths = tuple(
+            max(sum(lengths[i] for lengths in field_lengths) / count, 1.0)
+            for i in range(len(FIELDS))
+        )
+
+    @classmethod
+    def build(cls, spec: Any) -> "EndpointIndex":
+        """
+        Build the index from an OpenAPI object.
+
+        Args:
+            spec: OpenAPI object
+
+        Returns:
+            EndpointIndex over every operation, in document order.
+        """
+        operations: List[Operation] = []
+        field_texts: List[Tuple[str, ...]] = []
+        field_lengths: List[Tuple[int, ...]] = []
+        postings: Dict[str, List[int]] = {}
+
+        paths = spec.spec.get("paths", {})
+
+        for path, path_obj in paths.items():
+            for method, operation in path_obj.items():
+                if method not in HTTP_METHODS:
+                    continue  # Path-level keys such as parameters/servers
+
+                summary = str(operation["summary"]) if "summary" in operation else ""
+                operation_id = (
+                    str(operation["operationId"]) if "operationId" in operation else ""
+                )
+                description = (
+                    str(operation["description"]) if "description" in operation else ""
+                )
+
+                # Lowercased searchable text per field (same order as FIELDS)
+                texts = (
+                    summary.lower(),
+                    description.lower(),
+                    operation_id.lower(),
+                    path.lower(),
+                )
+                tokens = [TOKEN_PATTERN.findall(text) for text in texts]
+
+                op_id = len(operations)
+                operations.append((path, method.upper(), summary, operation_id))
+                field_texts.append(texts)
+                field_lengths.append(tuple(len(field) for field in tokens))
+                for token in set().union(*tokens):
+                    postings.setdefault(token, []).append(op_id)
+
+        trigrams: Dict[str, List[int]] = {}
+        for token_id, token in enumerate(postings):
+            for trigram in _trigrams(token):
+                trigrams.setdefault(trigram, []).append(token_id)
+
+        return cls(operations, field_texts, field_lengths, postings, trigrams)
+
+    @classmethod
+    def from_data(cls, data: Any) -> Optional["EndpointIndex"]:
+        """Restore an index from to_data() output, or None if incompatible."""
+        if not isinstance(data, tuple) or len(data) != 6 or data[0] != INDEX_FORMAT:
+            return None
+        return cls(*data[1:])
+
+    def to_data(self) -> Tuple[Any, ...]:
+        """Export the index as plain marshal-friendly data."""
+        return (
+            INDEX_FORMAT,
+            self._operations,
+            self._field_texts,
+            self._field_lengths,
+            self._postings,
+            self._trigrams,
+        )
+
+    def __len__(self) -> int:
+        """Get the number of indexed operations."""
+        return len(self._operations)
+
+    def operation(self, op_id: int) -> Dict[str, str]:
+        """Get display fields of an operation."""
+        path, method, summary, operation_id = self._operations[op_id]
+        return {
+            "path": path,
+            "method": method,
+            "summary": summary,
+            "operation_id": operation_id,
+        }
+
+    def _tokens_containing(self, fragment: str) -> Set[int]:
+        """
+        Vocabulary positions of the tokens that contain fragment.
+
+        A token containing a fragment of three or more characters has all of
+        its trigrams, so candidates are the intersection of their trigram
+        postings, verified against the token. A shorter fragment lies within
+        one of the token's padded trigrams, so the tokens of the trigrams
+        containing it are exact; single characters are looked up in the
+        vocabulary directly. Short fragments are memoized per index.
+        """
+        if len(fragment) < 3:
+            token_ids = self._short_fragments.get(fragment)
+            if token_ids is None:
+                if len(fragment) == 1:
+                    token_ids = {
+                        token_id for token_id, token in enumerate(self._vocabulary)
+                        if fragment in token
+                    }
+                else:
+                    token_ids = set()
+                    for trigram, posting in self._trigrams.items():
+                        if fragment in trigram:
+                            token_ids.update(posting)
+                self._short_fragments[fragment] = token_ids
+            return token_ids
+
+        postings = sorted(
+            (self._trigrams.get(trigram, ()) for trigram in
+             {fragment[i:i + 3] for i in range(len(fragment) - 2)}),
+            key=len
+        )
+        token_ids = set(postings[0])
+        for posting in postings[1:]:
+            if not token_ids:
+                break
+            token_ids.intersection_update(posting)
+        vocabulary = self._vocabulary
+        return {token_id for token_id in token_ids if fragment in vocabulary[token_id]}
+
+    def _fragment_candidates(self, fragment: str) -> Set[int]:
+        """Operations with a token that contains fragment."""
+        candidates: Set[int] = set()
+        for token_id in self._tokens_containing(fragment):
+            candidates.update(self._postings[self._vocabulary[token_id]])
+        return candidates
+
+    def _keyword_matches(self, keyword: str) -> Set[int]:
+        """Operations whose searchable text contains keyword."""
+        fragments = TOKEN_PATTERN.findall(keyword)
+
+        candidates: Optional[Set[int]] = None
+        for fragment in fragments:
+            found = self._fragment_candidates(fragment)
+            candidates = found if candidates is None else candidates & found
+            if not candidates:
+                return set()
+
+        if candidates is None:
+            candidates = set(range(len(self._operations)))
+
+        if len(fragments) == 1 and fragments[0] == keyword:
+            return candidates
+
+        return {
+            op_id for op_id in candidates
+            if any(keyword in text for text in self._field_texts[op_id])
+        }
+
+    def _score(self, op_id: int, weights: List[Tuple[str, float]]) -> float:
+        """BM25F score of an operation for (keyword, idf) pairs."""
+        texts = self._field_texts[op_id]
+        lengths = self._field_lengths[op_id]
+
+        score = 0.0
+        for keyword, idf in weights:
+            weighted_tf = 0.0
+            for i, text in enumerate(texts):
+                tf = text.count(keyword)
+                if tf:
+                    norm = 1 - BM25_B + BM25_B * lengths[i] / self._average_lengths[i]
+                    weighted_tf += FIELD_BOOSTS[i] * tf / norm
+            score += idf * weighted_tf / (BM25_K1 + weighted_tf)
+        return score
+
+    def search(
+        self,
+        keywords: List[str],
+        limit: Optional[int] = None
+    ) -> Tuple[int, List[int]]:
+        """
+        Find operations matching all keywords, best matches first.
+
+        Args:
+            keywords: Lowercased keywords (all must match)
+            limit: Number of top-ranked results to return (None for all)
+
+        Returns:
+            Tuple of (total number of matches, ranked operation ids).
+            Equal scores keep document order.
+        """
+        total, scored = self.search_scored(keywords, limit)
+        return total, [op_id for op_id, _ in scored]
+
+    def search_scored(
+        self,
+        keywords: List[str],
+        limit: Optional[int] = None
+    ) -> Tuple[int, List[Tuple[int, float]]]:
+        """
+        Same as search(), with the BM25F score of every returned operation.
+
+        Returns:
+            Tuple of (total number of matches, ranked (operation id, score)).
+            Without keywords every operation scores 0.
+        """
+        if not keywords:
+            total = len(self._operations)
+            count = total if limit is None else min(limit, total)
+            return total, [(op_id, 0.0) for op_id in range(count)]
+
+        total_ops = len(self._operations)
+        candidates: Optional[Set[int]] = None
+        weights = []
+
+        for keyword in dict.fromkeys(keywords):
+            found = self._keyword_matches(keyword)
+            candidates = found if candidates is None else candidates & found
+            if not candidates:
+                return 0, []
+
+            df = len(found)
+            idf = math.log(1 + (total_ops - df + 0.5) / (df + 0.5))
+            weights.append((keyword, idf))
+
+        scores = {op_id: self._score(op_id, weights) for op_id in candidates}
+        return len(scores), _rank(scores, limit)
+
+    def _similar_tokens(self, term: str) -> Dict[str, float]:
+        """Vocabulary tokens similar to term, with their similarity."""
+        query = _trigrams(term)
+        shared: Counter = Counter()
+        for trigram in query:
+            shared.update(self._trigrams.get(trigram, ()))
+
+        return {
+            self._vocabulary[token_id]: count / len(query)
+            for token_id, count in shared.items()
+            if count / len(query) >= FUZZY_THRESHOLD
+        }
+
+    def fuzzy_search(
+        self,
+        keywords: List[str],
+        limit: Optional[int] = None
+    ) -> Tuple[int, List[int]]:
+        """
+        Find operations with tokens similar to every keyword.
+
+        Similarity is the share of a keyword's trigrams found in a token, so
+        misspellings and partial words still match. An operation scores the
+        sum of its best similarity per keyword word.
+
+        Args:
+            keywords: Lowercased keywords (all must match approximately)
+            limit: Number of top-ranked results to return (None for all)
+
+        Returns:
+            Tuple of (total number of matches, ranked operation ids).
+        """
+        total, scored = self.fuzzy_search_scored(keywords, limit)
+        return total, [op_id for op_id, _ in scored]
+
+    def fuzzy_search_scored(
+        self,
+        keywords: List[str],
+        limit: Optional[int] = None
+    ) -> Tuple[int, List[Tuple[int, float]]]:
+        """
+        Same as fuzzy_search(), with the similarity score of every returned
+        operation.
+        """
+        terms = list(dict.fromkeys(
+            term for keyword in keywords for term in TOKEN_PATTERN.findall(keyword)
+        ))
+        if not terms:
+            return 0, []
+
+        scores: Optional[Dict[int, float]] = None
+        for term in terms:
+            best: Dict[int, float] = {}
+            for token, similarity in self._similar_tokens(term).items():
+                for op_id in self._postings[token]:
+                    if similarity > best.get(op_id, 0.0):
+                        best[op_id] = similarity
+
+            if scores is None:
+                scores = best
+            else:
+                scores = {
+                    op_id: score + best[op_id]
+                    for op_id, score in scores.items() if op_id in best
+                }
+            if not scores:
+                return 0, []
+
+        return len(scores), _rank(scores, limit)
+
+
+def _rank(scores: Dict[int, float], limit: Optional[int]) -> List[Tuple[int, float]]:
+    """
+    Order scored operations, best first and equal scores in document order.
+
+    A bounded heap keeps only the requested top-k in order.
+    """
+    keyed = ((score, -op_id) for op_id, score in scores.items())
+    if limit is None:
+        ranked = sorted(keyed, reverse=True)
+    else:
+        ranked = heapq.nlargest(limit, keyed)
+    return [(-negative_id, score) for score, negative_id in ranked]
+
+
+def _get_index_path(digest: str) -> Path:
+    """Get index file path for a content hash."""
+    return GLOBAL_CONFIG.index_dir / f"{digest}.i{INDEX_FORMAT}{SNAPSHOT_SUFFIX}"
+
+
+def load_index(digest: str) -> Optional[EndpointIndex]:
+    """Load the persisted index for a spec content hash, if any."""
+    index = _LOADED_INDEXES.get(digest)
+    if index is None:
+        index = EndpointIndex.from_data(read_marshal(_get_index_path(digest)))
+        if index is not None:
+            _LOADED_INDEXES.put(digest, index)
+    return index
+
+
+def save_index(digest: str, index: EndpointIndex) -> None:
+    """Persist an index under a spec content hash."""
+    write_marshal(_get_index_path(digest), index.to_data())
+    _LOADED_INDEXES.put(digest, index)
+
+
+def get_endpoint_index(source: "SpecSource") -> EndpointIndex:
+    """
+    Get the search index for a resolved spec, building it on first use.
+
+    Args:
+        source: SpecSource from open_spec()
+
+    Returns:
+        EndpointIndex for the current spec content.
+    """
+    index = load_index(source.digest)
+    if index is None:
+        index = EndpointIndex.build(source.load())
+        save_index(source.digest, index)
+    return index
@@ -3,8 +3,107 @@ apiscope/core/output.py
 
 LogLight-style output builder for consistent, concise command output.
 INFO: docs/loglight-style.md
+
+The builder records events (section, action, result, ...) and JSON payloads
+and renders them in the process-wide output format chosen with
+'apiscope --format':
+
+    text    LogLight lines, then payloads after a blank line (default)
+    json    one JSON document per invocation: {"events": [...], "data": [...]},
+            written when the command finishes (see flush_output())
+    ndjson  one JSON object per event or payload, as they are emitted
+    none    payloads only; error events still go to stderr as LogLight lines
 """
-from typing import List, Optional
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .profiling import Span, StepRecorder, get_recorder
+
+
+# Output formats
+OUTPUT_FORMATS = ("text", "json", "ndjson", "none")
+DEFAULT_OUTPUT_FORMAT = "text"
+
+# LogLight marker of each event type
+MARKERS = {
+    "section": "[=]",
+    "complete": "[=]",
+    "action": "[-]",
+    "progress": "[*]",
+    "result": "[+]",
+    "note": "[?]",
+    "error": "[!]",
+}
+_MARKER_TYPES = {"[-]": "action", "[*]": "progress", "[+]": "result", "[?]": "note", "[!]": "error"}
+
+# (type, marker, message); payloads are ("data", "", serialized JSON)
+Event = Tuple[str, str, str]
+
+_output_format = DEFAULT_OUTPUT_FORMAT
+_pending_events: List[Dict[str, Any]] = []  # json format: events of this invocation
+_pending_data: List[str] = []  # json format: serialized payloads of this invocation
+
+
+def set_output_format(output_format: str) -> None:
+    """
+    Select the output format for this invocation.
+
+    Args:
+        output_format: One of OUTPUT_FORMATS
+    """
+    global _output_format
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    _output_format = output_format
+    _pending_events.clear()
+    _pending_data.clear()
+
+
+def get_output_format() -> str:
+    """Get the output format of this invocation."""
+    return _output_format
+
+
+def flush_output() -> None:
+    """
+    Write the JSON document collected in json format.
+
+    Called once when the command finishes, also when it fails. Does nothing
+    in the other formats, which write events as they are emitted.
+    """
+    import click
+
+    if _output_format != "json":
+        return
+
+    # Payloads are already serialized and are embedded without re-encoding
+    document = (
+        '{"events": ' + json.dumps(_pending_events, ensure_ascii=False)
+        + ', "data": [' + ", ".join(_pending_data) + "]}"
+    )
+    _pending_events.clear()
+    _pending_data.clear()
+    click.echo(document)
+
+
+def _event_object(event: Event) -> Dict[str, Any]:
+    """Convert an event to its JSON form."""
+    event_type, marker, message = event
+    if event_type == "marker":
+        return {"type": event_type, "marker": marker, "message": message}
+    return {"type": event_type, "message": message}
+
+
+def _event_line(event: Event) -> str:
+    """Render an event as a LogLight line."""
+    event_type, marker, message = event
+    if event_type == "section":
+        return f"{marker} {message} Start"
+    if event_type == "complete":
+        return f"{marker} {message} Complete"
+    if event_type in ("raw", "blank"):
+        return message
+    return f"{marker} {message}"
 
 
 class OutputBuilder:
@@ -21,8 +120,33 @@ class OutputBuilder:
     """
 
     def __init__(self) -> None:
-        """Initialize a new output builder with empty lines."""
-        self._lines: List[str] = []
+        """Initialize a new output builder with no events."""
+        self._events: List[Event] = []
+        # Steps timed while 'apiscope --timings' records (see core/profiling.py)
+        self._open_section: Optional[Span] = None
+        self._open_action: Optional[Span] = None
+
+    def _add(self, event_type: str, message: str, marker: str = "") -> "OutputBuilder":
+        """Record one event."""
+        self._events.append((event_type, marker or MARKERS.get(event_type, ""), message))
+        recorder = get_recorder()
+        if recorder is not None:
+            self._track_step(recorder, event_type, message)
+        return self
+
+    def _track_step(self, recorder: StepRecorder, event_type: str, message: str) -> None:
+        """Open and close timed steps: sections and the actions within them."""
+        if event_type in ("action", "complete") and self._open_action is not None:
+            recorder.finish(self._open_action)
+            self._open_action = None
+
+        if event_type == "section":
+            self._open_section = recorder.start(message, "section")
+        elif event_type == "action":
+            self._open_action = recorder.start(message, "action")
+        elif event_type == "complete" and self._open_section is not None:
+            recorder.finish(self._open_section)
+            self._open_section = None
 
     def section(self, title: str) -> "OutputBuilder":
         """
@@ -31,8 +155,7 @@ class OutputBuilder:
         Args:
             title: Section title (will appear in start and complete markers)
         """
-        self._lines.append(f"[=] {title} Start")
-        return self
+        return self._add("section", title)
 
     def action(self, message: str) -> "OutputBuilder":
         """
@@ -41,8 +164,7 @@ class OutputBuilder:
         Args:
             message: Action description (verb phrase recommended)
         """
-        self._lines.append(f"[-] {message}")
-        return self
+        return self._add("action", message)
 
     def result(self, message: str) -> "OutputBuilder":
         """
@@ -51,8 +173,7 @@ class OutputBuilder:
         Args:
             message: Result description
         """
-        self._lines.append(f"[+] {message}")
-        return self
+        return self._add("result", message)
 
     def note(self, message: str) -> "OutputBuilder":
         """
@@ -61,8 +182,7 @@ class OutputBuilder:
         Args:
             message: Note content
         """
-        self._lines.append(f"[?] {message}")
-        return self
+        return self._add("note", message)
 
     def error(self, message: str) -> "OutputBuilder":
         """
@@ -71,8 +191,7 @@ class OutputBuilder:
         Args:
             message: Error description
         """
-        self._lines.append(f"[!] {message}")
-        return self
+        return self._add("error", message)
 
     def complete(self, title: str) -> "OutputBuilder":
         """
@@ -81,8 +200,7 @@ class OutputBuilder:
         Args:
             title: Section title (should match start title)
         """
-        self._lines.append(f"[=] {title} Complete")
-        return self
+        return self._add("complete", title)
 
     def raw(self, line: str) -> "OutputBuilder":
         """
@@ -90,13 +208,11 @@ class OutputBuilder:
 
         Use sparingly for special cases.
         """
-        self._lines.append(line)
-        return self
+        return self._add("raw", line)
 
     def blank(self) -> "OutputBuilder":
         """Add a blank line (use sparingly for visual separation)."""
-        self._lines.append("")
-        return self
+        return self._add("blank", "")
 
     def progress(self, message: str) -> "OutputBuilder":
         """
@@ -105,8 +221,7 @@ class OutputBuilder:
         Args:
             message: Progress description (should include "..." for ongoing work)
         """
-        self._lines.append(f"[*] {message}")
-        return self
+        return self._add("progress", message)
 
     def add(self, marker: str, message: str) -> "OutputBuilder":
         """
@@ -116,42 +231,84 @@ class OutputBuilder:
             marker: Custom marker (e.g., "[*]" for progress)
             message: Line content
         """
-        self._lines.append(f"{marker} {message}")
-        return self
+        return self._add(_MARKER_TYPES.get(marker, "marker"), message, marker)
+
+    def data(self, document: str) -> "OutputBuilder":
+        """
+        Add a JSON payload (the command's result, e.g. describe output).
+
+        Args:
+            document: Serialized JSON value
+        """
+        return self._add("data", document)
 
     def emit(self, to_stderr: bool = False) -> None:
         """
-        Output all collected lines.
+        Output all collected events in the current output format.
 
         Args:
             to_stderr: If True, output to stderr instead of stdout
         """
         import click
 
-        output = "\n".join(self._lines)
-        if to_stderr:
-            click.echo(output, err=True)
-        else:
-            click.echo(output)
+        # Emitting ends the current step
+        recorder = get_recorder()
+        if recorder is not None and self._open_action is not None:
+            recorder.finish(self._open_action)
+            self._open_action = None
+
+        log = [event for event in self._events if event[0] != "data"]
+        payloads = [event[2] for event in self._events if event[0] == "data"]
+
+        if _output_format == "json":
+            _pending_events.extend(
+                _event_object(event) for event in log if event[0] != "blank"
+            )
+            _pending_data.extend(payloads)
+            return
+
+        if _output_format == "ndjson":
+            lines = [
+                json.dumps(_event_object(event), ensure_ascii=False)
+                for event in log if event[0] != "blank"
+            ]
+            lines.extend('{"type": "data", "data": ' + payload + "}" for payload in payloads)
+            if lines:
+                click.echo("\n".join(lines), err=to_stderr)
+            return
+
+        if _output_format == "none":
+            errors = [_event_line(event) for event in log if event[0] == "error"]
+            if errors:
+                click.echo("\n".join(errors), err=True)
+            if payloads:
+                click.echo("\n".join(payloads), err=to_stderr)
+            return
+
+        lines = [_event_line(event) for event in log]
+        if payloads:
+            lines.append("")  # Blank line between the log and the payload
+            lines.extend(payloads)
+        click.echo("\n".join(lines), err=to_stderr)
 
     def clear(self) -> "OutputBuilder":
-        """Clear all collected lines."""
-        self._lines.clear()
+        """Clear all collected events."""
+        self._events.clear()
         return self
 
     @property
     def lines(self) -> List[str]:
-        """Get the current list of output lines."""
-        return self._lines.copy()
+        """Get the collected events as LogLight lines."""
+        return [_event_line(event) for event in self._events]
 
     @property
     def has_content(self) -> bool:
-        """Check if any lines have been added."""
-        return len(self._lines) > 0
+        """Check if any events have been added."""
+        return len(self._events) > 0
 
     def __len__(self) -> int:
-        """Get the number of lines in the builder."""
-        return len(self._lines)
+        """Get the number of events in the builder."""
+        return len(self._events)
 
 
 # Convenience function for one-off output
@@ -168,10 +325,4 @@ def log_output(
         message: Message content
         to_stderr: If True, output to stderr
     """
-    import click
-
-    line = f"{marker} {message}"
-    if to_stderr:
-        click.echo(line, err=True)
-    else:
-        click.echo(line)
+    OutputBuilder().add(marker, message).emit(to_stderr)
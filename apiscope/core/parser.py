@@ -2,138 +2,211 @@
 
 """
 OpenAPI specification parser.
+
+openapi_core (with its jsonschema stack) and httpx are imported where a spec
+is actually parsed or downloaded, not at module level. Importing them costs
+hundreds of milliseconds, which commands such as 'list' or 'note' and specs
+answered from the index or describe store never need to pay.
 """
 
 # Standard library
-import hashlib
-import json
+import asyncio
+import time
+from dataclasses import dataclass, field
 from io import StringIO
 from pathlib import Path
-from typing import Optional, Tuple
-import time
-
-# Third-party libraries
-import httpx
-from openapi_core import OpenAPI
+from typing import IO, TYPE_CHECKING, Iterable, List, Optional
 
 # Local modules
+from .codec import CodecError
 from .config import GLOBAL_CONFIG
+from .httpcache import CacheEntry, HttpCache
+from .profiling import timed
+from .snapshot import MemoCache, content_hash, load_snapshot, save_snapshot
+
+if TYPE_CHECKING:
+    import httpx
+    from openapi_core import OpenAPI
 
 
 # Constants
 DEFAULT_CACHE_TTL = 24 * 3600  # 24 hours in seconds
+DEFAULT_FETCH_CONCURRENCY = 8
 INVALID_SOURCE_MESSAGE = (
     "Use http(s):// for URLs or ./path for local files."
 )
 
+# Parsed specs of this process, keyed by (content hash, base URI)
+_LOADED_SPECS = MemoCache()
+
 
 class ParserError(Exception):
     """Parser-specific errors."""
     pass
 
 
-def _get_cache_key(url: str) -> str:
-    """Generate cache key from URL."""
-    return hashlib.md5(url.encode()).hexdigest()
+@dataclass
+class FetchResult:
+    """Outcome of fetching one remote specification into the HTTP cache."""
 
+    url: str
+    status: str  # cached, downloaded, not-modified, failed
+    seconds: float
+    size: int = 0
+    error: Optional[str] = None
 
-def _get_cache_path(url: str) -> Path:
-    """Get cache file path for URL."""
-    cache_key = _get_cache_key(url)
-    return GLOBAL_CONFIG.cache / "http" / cache_key
+    @property
+    def ok(self) -> bool:
+        return self.status != "failed"
 
 
-def _is_cache_valid(
-    file_path: Path,
-    max_age_seconds: int = DEFAULT_CACHE_TTL
-) -> Tuple[bool, Optional[float]]:
-    """
-    Check if a file cache is valid based on modification time.
+def _open_http_cache() -> HttpCache:
+    """Open the HTTP cache store, migrating old per-URL JSON files on lookup."""
+    return HttpCache(
+        GLOBAL_CONFIG.http_cache_path,
+        legacy_dir=GLOBAL_CONFIG.cache / "http"
+    )
 
-    Args:
-        file_path: Path to the cache file.
-        max_age_seconds: Maximum age in seconds before cache is considered stale.
 
-    Returns:
-        Tuple of (is_valid, modification_time).
-        modification_time is None if file doesn't exist.
-    """
-    if not file_path.exists():
-        return False, None
-
-    try:
-        mtime = file_path.stat().st_mtime
-        is_valid = (time.time() - mtime) < max_age_seconds
-        return is_valid, mtime
-    except OSError:
-        return False, None
+def _spec_from_snapshot(digest: str, base_uri: str = "") -> Optional["OpenAPI"]:
+    """Build OpenAPI object from a parsed snapshot, skipping validation."""
+    with timed("Read snapshot"):
+        data = load_snapshot(digest)
+    if data is None:
+        return None
 
+    with timed("Import openapi_core"):
+        from openapi_core import Config, OpenAPI
 
-def _load_cache_content(cache_path: Path) -> Optional[str]:
-    """
-    Load content from cache file.
+    # Snapshots are only written after validation succeeded
+    with timed("Build OpenAPI object"):
+        return OpenAPI.from_dict(
+            data,
+            config=Config(spec_validator_cls=None),
+            base_uri=base_uri
+        )
 
-    Args:
-        cache_path: Path to cache file.
 
-    Returns:
-        Cache content or None if cache is invalid or corrupted.
+def _spec_from_stream(stream: IO[str], digest: str, base_uri: str = "") -> "OpenAPI":
     """
-    is_valid, _ = _is_cache_valid(cache_path)
-    if not is_valid:
-        return None
-
-    try:
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            cache_data = json.load(f)
-
-        if isinstance(cache_data, dict) and 'content' in cache_data:
-            return cache_data['content']
-    except (json.JSONDecodeError, KeyError, IOError, TypeError):
-        pass
+    Parse and validate specification text read from a stream.
 
-    return None
+    A snapshot of the parsed document is saved under the given content hash
+    so the next load can skip this step.
+    """
+    with timed("Import openapi_core"):
+        from jsonschema_path.handlers import file_handler
+        from openapi_core import OpenAPI
 
+    with timed("Read specification text"):
+        data = file_handler(stream)
+    with timed("Validate and build OpenAPI object"):
+        spec = OpenAPI.from_dict(data, base_uri=base_uri)
+    with timed("Write snapshot"):
+        save_snapshot(digest, data)
+    return spec
 
-def _save_cache_content(cache_path: Path, content: str) -> None:
-    """Save content to cache file."""
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
 
-    cache_data = {
-        'timestamp': time.time(),
-        'content': content
-    }
+def _spec_from_cache(cache: HttpCache, entry: CacheEntry) -> "OpenAPI":
+    """
+    Parse a cached response body.
 
-    with open(cache_path, 'w', encoding='utf-8') as f:
-        json.dump(cache_data, f, ensure_ascii=False)
+    The compressed blob is decompressed straight into the parser as a
+    stream, without materializing the whole text first.
+    """
+    stream = cache.open_content(entry.url)
+    if stream is None:
+        raise ParserError(f"Cached content for {entry.url} cannot be decoded")
 
+    with stream:
+        try:
+            return _spec_from_stream(stream, entry.content_hash)
+        except CodecError as e:
+            raise ParserError(f"Cached content for {entry.url} cannot be decoded: {e}")
 
-def _fallback_to_cache(cache_path: Path) -> Optional[OpenAPI]:
-    """Attempt to load from cache as fallback."""
-    cached_content = _load_cache_content(cache_path)
-    if cached_content is None:
-        return None
 
-    try:
-        with StringIO(cached_content) as f:
-            return OpenAPI.from_file(f)
-    except Exception:
-        return None
+@dataclass
+class SpecSource:
+    """
+    A resolved specification: its current content hash and how to load it.
 
+    Resolving is cheap (a cache lookup, a revalidation request or hashing a
+    local file), so callers can check content-hash keyed caches first and
+    only call load() when they really need the parsed document.
+    """
 
-def get_spec(name: str, force: bool = False) -> OpenAPI:
+    name: str
+    digest: str
+    url: Optional[str] = None
+    path: Optional[Path] = None
+    _content: Optional[bytes] = field(default=None, repr=False)
+    _spec: Optional["OpenAPI"] = field(default=None, repr=False)
+
+    @property
+    def base_uri(self) -> str:
+        return self.path.as_uri() if self.path is not None else ""
+
+    def load(self) -> "OpenAPI":
+        """
+        Load the OpenAPI object (memoized).
+
+        A spec already loaded by this process with the same content is
+        reused. Otherwise a parsed snapshot is used when present, skipping
+        YAML/JSON parsing and validation, and as a last resort the text is
+        parsed, validated and a snapshot is saved for the next call.
+
+        Raises:
+            ParserError: If specification cannot be loaded.
+        """
+        if self._spec is not None:
+            return self._spec
+
+        key = (self.digest, self.base_uri)
+        spec = _LOADED_SPECS.get(key)
+        if spec is None:
+            try:
+                spec = _spec_from_snapshot(self.digest, self.base_uri)
+                if spec is None:
+                    spec = self._parse()
+            except ParserError:
+                raise
+            except Exception as e:
+                raise ParserError(f"Failed to load '{self.name}': {e}")
+            _LOADED_SPECS.put(key, spec)
+
+        self._spec = spec
+        self._content = None
+        return spec
+
+    def _parse(self) -> "OpenAPI":
+        """Parse the raw content of the source."""
+        if self.url is not None:
+            with _open_http_cache() as cache:
+                entry = cache.get(self.url)
+                if entry is None or entry.content_hash != self.digest:
+                    raise ParserError(f"Cached content for {self.url} changed, retry")
+                return _spec_from_cache(cache, entry)
+
+        content = self._content
+        if content is None:
+            content = self.path.read_bytes()
+        with StringIO(content.decode('utf-8')) as f:
+            return _spec_from_stream(f, self.digest, self.base_uri)
+
+
+def open_spec(name: str, force: bool = False) -> SpecSource:
     """
-    Get OpenAPI spec by name.
+    Resolve a configured spec to its current content without parsing it.
 
     Args:
         name: Configuration name of the spec.
         force: Bypass HTTP cache if True.
 
     Returns:
-        OpenAPI object.
+        SpecSource with the content hash of the current spec text.
 
     Raises:
-        ParserError: If specification cannot be loaded.
+        ParserError: If specification cannot be resolved.
     """
     specs = GLOBAL_CONFIG.get_classified_specs()
 
@@ -150,44 +223,172 @@ def get_spec(name: str, force: bool = False) -> OpenAPI:
 
     try:
         if source_type == "URL":
-            return _load_remote(source, force)
+            with _open_http_cache() as cache:
+                entry = _resolve_remote(cache, source, force)
+            return SpecSource(name, entry.content_hash, url=source)
         else:  # FILE
-            return _load_local(source)
+            file_path = (GLOBAL_CONFIG.root / source).resolve()
+            content = file_path.read_bytes()
+            return SpecSource(
+                name, content_hash(content), path=file_path, _content=content
+            )
     except ParserError:
         raise
     except Exception as e:
         raise ParserError(f"Failed to load '{name}': {e}")
 
 
-def _load_remote(url: str, force: bool) -> OpenAPI:
-    """Load remote spec with simple file caching."""
-    cache_path = _get_cache_path(url)
+def get_spec(name: str, force: bool = False) -> "OpenAPI":
+    """
+    Get OpenAPI spec by name.
+
+    Args:
+        name: Configuration name of the spec.
+        force: Bypass HTTP cache if True.
+
+    Returns:
+        OpenAPI object.
+
+    Raises:
+        ParserError: If specification cannot be loaded.
+    """
+    return open_spec(name, force).load()
+
+
+def _resolve_remote(cache: HttpCache, url: str, force: bool) -> CacheEntry:
+    """
+    Make sure the HTTP cache holds a usable copy of a remote spec.
+
+    Within the TTL the cached copy is used directly. Once it expires, the
+    stored ETag/Last-Modified validators are sent with the request, and a
+    304 Not Modified response refreshes the cached copy without a transfer.
+    When the server cannot be reached, a stale copy is served instead.
+    """
+    entry = None if force else cache.get(url)
+    if entry is not None and not entry.is_readable:
+        entry = None  # Undecodable here (e.g. zstd missing), download again
 
-    if not force:
-        cached_content = _load_cache_content(cache_path)
-        if cached_content is not None:
-            with StringIO(cached_content) as f:
-                return OpenAPI.from_file(f)
+    if entry is not None and entry.is_fresh(DEFAULT_CACHE_TTL):
+        return entry
+
+    headers = entry.conditional_headers if entry is not None else {}
+
+    import httpx
 
     try:
         with httpx.Client(timeout=30.0) as client:
-            response = client.get(url)
-            response.raise_for_status()
-            content = response.text
+            response = client.get(url, headers=headers)
 
-            _save_cache_content(cache_path, content)
+        if response.status_code == 304 and entry is not None:
+            cache.touch(
+                url,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+            return entry
 
-            with StringIO(content) as f:
-                return OpenAPI.from_file(f)
+        response.raise_for_status()
     except (httpx.HTTPError, httpx.RequestError) as e:
-        if not force:
-            cached_spec = _fallback_to_cache(cache_path)
-            if cached_spec is not None:
-                return cached_spec
+        if entry is not None:
+            # Serve the stale copy rather than failing offline
+            return entry
         raise ParserError(f"Failed to load from {url}: {e}")
 
+    return cache.put(
+        url,
+        response.text,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified')
+    )
+
+
+async def _fetch_one(
+    client: "httpx.AsyncClient",
+    cache: HttpCache,
+    semaphore: asyncio.Semaphore,
+    url: str,
+    force: bool
+) -> FetchResult:
+    """Bring one URL into the HTTP cache, revalidating like _resolve_remote()."""
+    import httpx
+
+    start = time.perf_counter()
+    entry = None if force else cache.get(url)
+    if entry is not None and not entry.is_readable:
+        entry = None
+
+    if entry is not None and entry.is_fresh(DEFAULT_CACHE_TTL):
+        return FetchResult(url, "cached", time.perf_counter() - start, entry.size)
+
+    headers = entry.conditional_headers if entry is not None else {}
+
+    try:
+        async with semaphore:
+            response = await client.get(url, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            cache.touch(
+                url,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+            return FetchResult(
+                url, "not-modified", time.perf_counter() - start, entry.size
+            )
+
+        response.raise_for_status()
+    except (httpx.HTTPError, httpx.RequestError) as e:
+        return FetchResult(url, "failed", time.perf_counter() - start, error=str(e))
+
+    stored = cache.put(
+        url,
+        response.text,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified')
+    )
+    return FetchResult(url, "downloaded", time.perf_counter() - start, stored.size)
+
+
+async def _fetch_all(
+    urls: List[str],
+    force: bool,
+    concurrency: int
+) -> List[FetchResult]:
+    """Fetch all URLs on one async client with bounded concurrency."""
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    with _open_http_cache() as cache:
+        async with httpx.AsyncClient(timeout=30.0, limits=limits) as client:
+            return await asyncio.gather(*(
+                _fetch_one(client, cache, semaphore, url, force)
+                for url in urls
+            ))
+
+
+def fetch_remote_specs(
+    urls: Iterable[str],
+    force: bool = False,
+    concurrency: int = DEFAULT_FETCH_CONCURRENCY
+) -> List[FetchResult]:
+    """
+    Download remote specifications into the HTTP cache concurrently.
+
+    Fresh cache entries are kept as they are, and expired ones are
+    revalidated with their ETag/Last-Modified validators. Nothing is parsed
+    here. Use get_spec() afterwards to build the parsed snapshots.
 
-def _load_local(source: str) -> OpenAPI:
-    """Load local spec file."""
-    file_path = (GLOBAL_CONFIG.root / source).resolve()
-    return OpenAPI.from_path(file_path)
+    Args:
+        urls: Specification URLs.
+        force: Download even if the cached copy is still fresh.
+        concurrency: Maximum number of requests in flight.
+
+    Returns:
+        One FetchResult per distinct URL, in input order.
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return []
+    return asyncio.run(_fetch_all(urls, force, max(1, concurrency)))
@@ -0,0 +1,265 @@
+# apiscope/core/profiling.py
+
+"""
+Per-step timings and profiling of one CLI invocation.
+
+While recording ('apiscope --timings' or '--trace FILE'), every OutputBuilder
+section and action becomes a timed step: an action lasts until the next
+action, the completion of its section or emit(), and a section until its
+completion. Work that is not an OutputBuilder step (parsing a spec, reading
+a snapshot) adds nested spans with timed(). Each step records monotonic wall
+time and how much the peak resident set size of the process grew.
+
+Steps are reported as LogLight lines on stderr and can be written as a
+Chrome trace (chrome://tracing, https://ui.perfetto.dev). '--profile' also
+runs the command under cProfile and writes a .prof dump for pstats or
+snakeviz.
+"""
+
+# Standard library
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore[assignment]
+
+# Local modules
+from .config import GLOBAL_CONFIG
+
+if TYPE_CHECKING:
+    from .output import OutputBuilder
+
+
+# Constants
+PROFILE_DIR_NAME = "profiles"
+REPORT_INDENT = {"section": "", "action": "  ", "span": "    "}
+
+
+def _peak_rss_kb() -> int:
+    """Get the peak resident set size of this process in KiB (0 if unknown)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+@dataclass
+class Span:
+    """One timed step."""
+
+    name: str
+    category: str  # section, action or span
+    start_ns: int
+    rss_start_kb: int
+    thread_id: int
+    end_ns: int = 0
+    rss_end_kb: int = 0
+
+    @property
+    def milliseconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    @property
+    def rss_growth_mb(self) -> float:
+        """Growth of the process's peak RSS, not memory allocated by the step."""
+        return (self.rss_end_kb - self.rss_start_kb) / 1024
+
+
+class StepRecorder:
+    """Collects the spans of one invocation."""
+
+    def __init__(self) -> None:
+        self.origin_ns = time.perf_counter_ns()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def start(self, name: str, category: str) -> Span:
+        """Open a span."""
+        return Span(name, category, time.perf_counter_ns(), _peak_rss_kb(), threading.get_ident())
+
+    def finish(self, span: Span) -> None:
+        """Close a span and keep it."""
+        span.end_ns = time.perf_counter_ns()
+        span.rss_end_kb = _peak_rss_kb()
+        with self._lock:
+            self.spans.append(span)
+
+    def report(self, output: "OutputBuilder") -> None:
+        """
+        Add the recorded steps to an OutputBuilder, in start order.
+
+        The text format gets aligned LogLight lines; the structured formats
+        get one {"timings": {...}} payload with numeric fields.
+        """
+        # Imported here: output imports this module
+        from .output import get_output_format
+
+        total_ms = (time.perf_counter_ns() - self.origin_ns) / 1e6
+        spans = sorted(self.spans, key=lambda span: span.start_ns)
+        output.section("Timings")
+        if get_output_format() == "text":
+            # The memory column is how much the peak RSS grew: a step that
+            # allocates less than an earlier peak shows +0.0
+            output.note("Wall time, peak RSS growth, step")
+            for span in spans:
+                indent = REPORT_INDENT.get(span.category, "")
+                output.result(
+                    f"{span.milliseconds:9.1f} ms {span.rss_growth_mb:+7.1f} MB  {indent}{span.name}"
+                )
+            output.result(f"{total_ms:9.1f} ms total, peak RSS {_peak_rss_kb() / 1024:.1f} MB")
+        else:
+            steps = [
+                {
+                    "name": span.name,
+                    "category": span.category,
+                    "ms": round(span.milliseconds, 3),
+                    "rss_growth_kb": span.rss_end_kb - span.rss_start_kb,
+                }
+                for span in spans
+            ]
+            output.data(json.dumps({
+                "timings": {
+                    "steps": steps,
+                    "total_ms": round(total_ms, 3),
+                    "peak_rss_kb": _peak_rss_kb(),
+                }
+            }, ensure_ascii=False))
+        output.complete("Timings")
+
+    def write_trace(self, path: Path) -> None:
+        """
+        Write the spans as a Chrome trace event file.
+
+        Args:
+            path: Destination JSON file
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start_ns - self.origin_ns) / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {"peak_rss_growth_kb": span.rss_end_kb - span.rss_start_kb},
+            }
+            for span in self.spans
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}),
+            encoding="utf-8"
+        )
+
+
+# Recorder of the running invocation (None when timings are off)
+_recorder: Optional[StepRecorder] = None
+
+
+def get_recorder() -> Optional[StepRecorder]:
+    """Get the active recorder, or None if nothing is being recorded."""
+    return _recorder
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """
+    Record a block as a nested span (does nothing unless recording).
+
+    Usage:
+        with timed("Parse specification"):
+            data = file_handler(stream)
+    """
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+
+    span = recorder.start(name, "span")
+    try:
+        yield
+    finally:
+        recorder.finish(span)
+
+
+def _profile_path(command: str) -> Path:
+    """Get a new cProfile dump path under .apiscope/profiles/."""
+    base = GLOBAL_CONFIG.home if GLOBAL_CONFIG.is_initialized else Path.cwd()
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return base / PROFILE_DIR_NAME / f"{command}-{stamp}-{os.getpid()}.prof"
+
+
+def instrument(
+    command: str,
+    timings: bool,
+    trace: Optional[Path],
+    profile: bool
+) -> Callable[[], None]:
+    """
+    Start recording an invocation.
+
+    Args:
+        command: Subcommand name, used for the profile file name
+        timings: Report step timings on stderr
+        trace: Chrome trace file to write, if any
+        profile: Run under cProfile and write a .prof dump
+
+    Returns:
+        Function that stops recording and writes the report and files.
+        It must run before the output of the invocation is flushed.
+    """
+    # Imported here: output imports this module
+    from .output import OutputBuilder
+
+    global _recorder
+    _recorder = StepRecorder() if timings or trace is not None else None
+
+    profiler = None
+    if profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def finish() -> None:
+        global _recorder
+        if profiler is not None:
+            profiler.disable()
+
+        recorder, _recorder = _recorder, None
+        output = OutputBuilder()
+
+        if recorder is not None and timings:
+            recorder.report(output)
+        if recorder is not None and trace is not None:
+            try:
+                recorder.write_trace(trace)
+                output.result(f"Trace written: {trace}")
+            except OSError as e:
+                output.error(f"Failed to write trace {trace}: {e}")
+        if profiler is not None:
+            path = _profile_path(command)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(path)
+                output.result(f"Profile written: {path}")
+            except OSError as e:
+                output.error(f"Failed to write profile {path}: {e}")
+
+        if output.has_content:
+            output.emit(to_stderr=True)
+
+    return finish
@@ -0,0 +1,113 @@
+# apiscope/core/refs.py
+
+"""
+Per-spec cache for $ref resolution.
+
+Large specs reference the same components from hundreds of operations.
+RefCache remembers where each reference points and what was extracted from
+it, so every component is resolved once per loaded spec, no matter how many
+operations or describe calls use it. It also tracks the references being
+resolved so self-referential schemas stop at the first repetition.
+"""
+
+# Standard library
+import weakref
+from typing import Any, Dict, List, Optional
+
+
+class RefCache:
+    """
+    Resolved references and extracted summaries of one OpenAPI object.
+
+    Summaries are only stored when they do not depend on the reference
+    chain they were resolved from: a summary that was cut short at an outer
+    reference (A -> B -> A seen from A) would differ when resolved directly,
+    so only the outermost reference of a cycle is stored.
+    """
+
+    def __init__(self) -> None:
+        self._targets: Dict[str, Any] = {}
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._stack: List[str] = []
+        self._low: List[int] = []  # Shallowest cycle target seen per frame
+
+    def resolve(self, root: Any, ref: str) -> Any:
+        """
+        Resolve a local JSON pointer ('#/components/schemas/Pet').
+
+        Args:
+            root: Root SchemaPath of the spec (spec.spec)
+            ref: Reference string
+
+        Returns:
+            Referenced node.
+
+        Raises:
+            KeyError: If the pointer does not resolve.
+        """
+        if ref not in self._targets:
+            pointer = ref[2:] if ref.startswith("#/") else ref
+            node = root
+            for part in pointer.split("/"):
+                node = node / part.replace("~1", "/").replace("~0", "~")
+            self._targets[ref] = node
+        return self._targets[ref]
+
+    def get_summary(self, ref: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of the stored summary for a reference, if any."""
+        summary = self._summaries.get(ref)
+        return dict(summary) if summary is not None else None
+
+    def is_active(self, ref: str) -> bool:
+        """
+        Check whether ref is already being resolved further up the chain.
+
+        A True result means the caller is about to enter a cycle and should
+        stop; the summaries of the references in between are then not
+        stored.
+        """
+        if ref not in self._stack:
+            return False
+        depth = self._stack.index(ref)
+        if self._low:
+            self._low[-1] = min(self._low[-1], depth)
+        return True
+
+    def enter(self, ref: str) -> None:
+        """Mark ref as being resolved."""
+        self._stack.append(ref)
+        self._low.append(len(self._stack))
+
+    def leave(self, ref: str, summary: Optional[Dict[str, Any]]) -> None:
+        """
+        Finish resolving ref, storing its summary when it is context-free.
+
+        Args:
+            ref: Reference passed to enter()
+            summary: Extracted summary of the referenced node, or None if
+                extraction failed
+        """
+        depth = len(self._stack) - 1
+        low = self._low.pop()
+        self._stack.pop()
+
+        if summary is not None and low >= depth:
+            self._summaries[ref] = dict(summary)
+        if self._low:
+            self._low[-1] = min(self._low[-1], low)
+
+
+_CACHES: "weakref.WeakKeyDictionary[Any, RefCache]" = weakref.WeakKeyDictionary()
+
+
+def get_ref_cache(spec: Any) -> RefCache:
+    """
+    Get the reference cache of a loaded spec.
+
+    The cache lives as long as the OpenAPI object, so it is shared by every
+    operation and describe call that uses the same loaded spec.
+    """
+    cache = _CACHES.get(spec)
+    if cache is None:
+        cache = _CACHES[spec] = RefCache()
+    return cache
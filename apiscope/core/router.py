@@ -0,0 +1,214 @@
+# apiscope/core/router.py
+
+"""
+Resolve concrete request paths to OpenAPI path templates.
+
+The router compiles the keys of a spec's 'paths' object into a tree keyed by
+path segment. Literal segments are dictionary edges, a segment that is a
+single template ('{owner}') is a wildcard edge, and mixed segments
+('{name}.{ext}') are compiled to regexes. Resolving '/repos/acme/api' walks
+one edge per segment, so the cost depends on the request path, not on the
+number of paths in the spec.
+"""
+
+# Standard library
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+
+# Constants
+PARAM_PATTERN = re.compile(r"\{([^{}]+)\}")
+
+
+@dataclass
+class RouteMatch:
+    """A request path resolved to its template."""
+
+    template: str
+    params: Dict[str, str]
+
+
+class _Node:
+    """Tree node for one path segment position."""
+
+    __slots__ = ("literals", "wildcard", "patterns", "template", "param_names")
+
+    def __init__(self) -> None:
+        self.literals: Dict[str, "_Node"] = {}
+        self.wildcard: Optional["_Node"] = None
+        self.patterns: Dict[str, Tuple["re.Pattern[str]", "_Node"]] = {}
+        self.template: Optional[str] = None  # Set on nodes that end a path
+        self.param_names: List[str] = []
+
+
+def _split_path(path: str) -> List[str]:
+    """Split a path into segments, ignoring leading/trailing slashes."""
+    path = path.strip("/")
+    return path.split("/") if path else []
+
+
+def _compile_segment(segment: str) -> "re.Pattern[str]":
+    """Compile a mixed literal/template segment to a regex."""
+    parts = []
+    position = 0
+    for match in PARAM_PATTERN.finditer(segment):
+        parts.append(re.escape(segment[position:match.start()]))
+        parts.append("([^/]+?)")
+        position = match.end()
+    parts.append(re.escape(segment[position:]))
+    return re.compile("".join(parts))
+
+
+class PathRouter:
+    """
+    Compiled router over the path templates of one specification.
+
+    Literal segments win over templated ones, as required by OpenAPI, and
+    the router backtracks when a literal branch does not lead to a complete
+    path (so '/users/me' and '/users/{id}/posts' can coexist).
+
+    Usage:
+        router = PathRouter.from_spec(spec)
+        match = router.resolve("/repos/acme/api")
+        # RouteMatch(template='/repos/{owner}/{repo}',
+        #            params={'owner': 'acme', 'repo': 'api'})
+    """
+
+    def __init__(self, templates: Iterable[str], base_paths: Iterable[str] = ()) -> None:
+        """
+        Compile path templates.
+
+        Args:
+            templates: Path templates (keys of the spec's 'paths' object)
+            base_paths: Server base paths ('/v3') that requests may carry
+        """
+        self._root = _Node()
+        self._base_paths = sorted(
+            {base.rstrip("/") for base in base_paths if base.strip("/")},
+            key=len,
+            reverse=True,
+        )
+
+        for template in templates:
+            self._add(template)
+
+    @staticmethod
+    def spec_routes(spec: Any) -> Tuple[List[str], List[str]]:
+        """
+        Collect the path templates and server base paths of an OpenAPI object.
+
+        Server URLs with variables are ignored for base path stripping.
+        """
+        templates = [str(path) for path in spec.spec.get("paths", {}).keys()]
+
+        base_paths = []
+        for server in spec.spec.get("servers", []):
+            if "url" in server:
+                url = str(server["url"])
+                if "{" not in url:
+                    base_paths.append(urlsplit(url).path)
+
+        return templates, base_paths
+
+    @classmethod
+    def from_spec(cls, spec: Any) -> "PathRouter":
+        """Build a router from an OpenAPI object."""
+        return cls(*cls.spec_routes(spec))
+
+    def _add(self, template: str) -> None:
+        """Insert one path template into the tree."""
+        node = self._root
+        param_names: List[str] = []
+
+        for segment in _split_path(template):
+            names = PARAM_PATTERN.findall(segment)
+            if not names:
+                node = node.literals.setdefault(segment, _Node())
+            elif PARAM_PATTERN.fullmatch(segment):
+                if node.wildcard is None:
+                    node.wildcard = _Node()
+                node = node.wildcard
+            else:
+                # Share nodes between segments that differ only in names
+                key = PARAM_PATTERN.sub("{}", segment)
+                if key not in node.patterns:
+                    node.patterns[key] = (_compile_segment(segment), _Node())
+                node = node.patterns[key][1]
+            param_names.extend(names)
+
+        if node.template is None:  # First declaration wins
+            node.template = template
+            node.param_names = param_names
+
+    def _match(
+        self,
+        node: _Node,
+        segments: List[str],
+        position: int,
+        values: List[str]
+    ) -> Optional[_Node]:
+        """Depth-first match preferring literal, then mixed, then wildcard edges."""
+        if position == len(segments):
+            return node if node.template is not None else None
+
+        segment = segments[position]
+
+        child = node.literals.get(segment)
+        if child is not None:
+            found = self._match(child, segments, position + 1, values)
+            if found is not None:
+                return found
+
+        for regex, child in node.patterns.values():
+            match = regex.fullmatch(segment)
+            if match is None:
+                continue
+            values.extend(match.groups())
+            found = self._match(child, segments, position + 1, values)
+            if found is not None:
+                return found
+            del values[len(values) - len(match.groups()):]
+
+        if node.wildcard is not None and segment:
+            values.append(segment)
+            found = self._match(node.wildcard, segments, position + 1, values)
+            if found is not None:
+                return found
+            values.pop()
+
+        return None
+
+    def resolve(self, path: str) -> Optional[RouteMatch]:
+        """
+        Resolve a concrete request path or URL to its template.
+
+        Scheme, host, query string and fragment are ignored, and a server
+        base path prefix is stripped if the path does not match as-is.
+
+        Args:
+            path: Request path ('/repos/acme/api') or full URL
+
+        Returns:
+            RouteMatch with the template and decoded path parameters,
+            or None if no template matches.
+        """
+        request_path = urlsplit(path).path or "/"
+
+        candidates = [request_path]
+        for base in self._base_paths:
+            if request_path == base or request_path.startswith(base + "/"):
+                candidates.append(request_path[len(base):] or "/")
+
+        for candidate in candidates:
+            values: List[str] = []
+            node = self._match(self._root, _split_path(candidate), 0, values)
+            if node is not None:
+                params = {
+                    name: unquote(value)
+                    for name, value in zip(node.param_names, values)
+                }
+                return RouteMatch(node.template, params)  # type: ignore[arg-type]
+
+        return None
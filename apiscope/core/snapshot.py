@@ -0,0 +1,123 @@
+# apiscope/core/snapshot.py
+
+"""
+Parsed specification snapshots.
+
+A snapshot is the already-parsed (and already-validated) specification
+document stored under .apiscope/cache/snapshots/, keyed by the content hash
+of the raw text it was parsed from. Loading a snapshot is a single marshal
+read, which skips YAML/JSON parsing and spec validation entirely.
+
+Objects built from content-addressed data (parsed specs, search indexes)
+can also be kept in a MemoCache, so a long-lived process such as
+'apiscope serve' reuses them until the content hash changes.
+"""
+
+# Standard library
+import hashlib
+import marshal
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional
+
+# Local modules
+from .config import GLOBAL_CONFIG
+
+
+# Marshal output is only guaranteed stable for a given format version
+SNAPSHOT_SUFFIX = f".m{marshal.version}"
+MEMO_CACHE_SIZE = 8  # Spec versions kept in memory per cache
+
+
+class MemoCache:
+    """
+    Small in-process LRU cache for objects keyed by content hash.
+
+    Content-addressed entries never go stale, so no invalidation is needed;
+    the size bound only limits memory when specs keep changing. Safe to
+    share between threads.
+    """
+
+    def __init__(self, size: int = MEMO_CACHE_SIZE) -> None:
+        self._size = size
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached object, or None."""
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache an object, evicting the least recently used one if full."""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self._size:
+                self._items.popitem(last=False)
+
+
+def content_hash(content: bytes) -> str:
+    """Compute the content hash used to key snapshots."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def _get_snapshot_path(digest: str) -> Path:
+    """Get snapshot file path for a content hash."""
+    return GLOBAL_CONFIG.snapshot_dir / f"{digest}{SNAPSHOT_SUFFIX}"
+
+
+def read_marshal(path: Path) -> Optional[Any]:
+    """
+    Read a marshal-encoded cache file.
+
+    Returns:
+        Decoded data, or None if the file is missing or unreadable.
+    """
+    try:
+        return marshal.loads(path.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def write_marshal(path: Path, data: Any) -> None:
+    """
+    Write a marshal-encoded cache file.
+
+    The file is written to a temporary name first and then moved into place,
+    so concurrent readers never observe a partially written file. The
+    temporary name is unique per thread, as threads of one process (rpc
+    requests, search's index pool) may write the same file at once.
+    Failures are ignored: a missing cache file only costs a rebuild.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(marshal.dumps(data))
+        os.replace(tmp_path, path)
+    except (OSError, ValueError):
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_snapshot(digest: str) -> Optional[Any]:
+    """
+    Load a parsed document snapshot.
+
+    Args:
+        digest: Content hash of the raw specification text.
+
+    Returns:
+        Parsed document, or None if no usable snapshot exists.
+    """
+    return read_marshal(_get_snapshot_path(digest))
+
+
+def save_snapshot(digest: str, data: Any) -> None:
+    """Save a parsed document snapshot."""
+    write_marshal(_get_snapshot_path(digest), data)
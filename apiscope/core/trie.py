@@ -1,5 +1,229 @@
-"""Generic trie (prefix tree) implementation for pattern matching."""
-from typing import Dict, List, Any
+"""Generic trie (prefix tree) implementation for pattern matching.
+
+build_pattern_trie() builds the plain dict trie. Matching runs on a
+PatternAutomaton compiled from the same patterns (get_automaton() returns
+the one compiled for a trie): an Aho-Corasick automaton
+over integer-coded elements, with the failure links folded into a flat
+transition table so that each element costs one list lookup. The automaton
+also keeps the trie edges as a flat table, for prefix walks (which patterns
+a partial sequence may still complete).
+
+Sequences can be coded once with encode() into bytes of small ints and
+matched with find_codes(), so repeated matching over slices of the same
+history does no per-element string hashing.
+"""
+from collections import deque
+from typing import Dict, Hashable, List, Any, Sequence, Tuple
+
+
+# Match modes of PatternAutomaton.find()
+MODE_LONGEST = "longest"    # Leftmost-longest, non-overlapping
+MODE_OVERLAPS = "overlaps"  # Every occurrence of every pattern
+
+# Automaton compiled for each trie, by id() of the trie root. The entry keeps
+# the root alive so that its id cannot be reused by another trie.
+_AUTOMATONS: Dict[int, Tuple[Dict[str, Any], 'PatternAutomaton']] = {}
+
+
+class PatternAutomaton:
+    """Aho-Corasick automaton over a fixed set of element sequences.
+
+    Elements are coded as integers at compile time; elements that appear in
+    no pattern share one extra code that leads back to the root. States are
+    numbered by their row offset in the flat transition table, so a step is
+    state = transitions[state + code]. Every state lists the patterns ending
+    there, including those reached through suffix (failure) links, as
+    (length, pattern index) pairs, longest first.
+
+    Usage:
+        automaton = PatternAutomaton({"Induction": ["OBS", "REA", "REF"]})
+        automaton.find(["OBS", "REA", "REF"])   # [(0, 3, "Induction")]
+
+        codes = automaton.encode(history)       # bytes, coded once
+        automaton.find_codes(codes[start:end])
+    """
+
+    __slots__ = (
+        'names', 'codes', 'width', 'row', 'transitions', 'outputs',
+        'edges', 'complete', 'prefixes', 'children'
+    )
+
+    def __init__(self, patterns: Dict[str, List[Hashable]]):
+        self.names: List[str] = list(patterns)
+        self.codes: Dict[Hashable, int] = {}
+        for seq in patterns.values():
+            for element in seq:
+                self.codes.setdefault(element, len(self.codes))
+        self.width = width = len(self.codes)
+
+        # Trie over element codes: goto[state][code] -> state (-1 if none),
+        # with the same per-node data as the dict trie
+        goto: List[List[int]] = [[-1] * width]
+        own: List[List[Tuple[int, int]]] = [[]]
+        prefixes: List[List[str]] = [[]]
+        children: List[List[Hashable]] = [[]]
+        for index, (name, seq) in enumerate(patterns.items()):
+            state = 0
+            for element in seq:
+                code = self.codes[element]
+                if goto[state][code] < 0:
+                    goto[state][code] = len(goto)
+                    goto.append([-1] * width)
+                    own.append([])
+                    prefixes.append([])
+                    children.append([])
+                    children[state].append(element)
+                state = goto[state][code]
+                prefixes[state].append(name)
+            if seq:
+                own[state].append((len(seq), index))
+
+        # Breadth-first: resolve failure links into a full transition table
+        # and merge the outputs of each state's failure chain. The last
+        # column is the code of elements that are in no pattern.
+        row = width + 1
+        state_count = len(goto)
+        transitions = [0] * (state_count * row)
+        outputs: List[Tuple[Tuple[int, int], ...]] = [()] * (state_count * row)
+        fail = [0] * state_count
+        queue = deque()
+        for code in range(width):
+            child = goto[0][code]
+            if child > 0:
+                transitions[code] = child * row
+                queue.append(child)
+        while queue:
+            state = queue.popleft()
+            outputs[state * row] = tuple(sorted(
+                own[state] + list(outputs[fail[state] * row]), key=lambda out: (-out[0], out[1])
+            ))
+            base = state * row
+            fail_base = fail[state] * row
+            for code in range(width):
+                child = goto[state][code]
+                if child > 0:
+                    fail[child] = transitions[fail_base + code] // row
+                    transitions[base + code] = child * row
+                    queue.append(child)
+                else:
+                    transitions[base + code] = transitions[fail_base + code]
+
+        self.row = row
+        self.transitions = transitions
+        self.outputs = outputs
+
+        # Trie edges only (no failure links), for prefix walks
+        edges = [-1] * (state_count * row)
+        for state, targets in enumerate(goto):
+            for code, child in enumerate(targets):
+                if child > 0:
+                    edges[state * row + code] = child * row
+        self.edges = edges
+        self.complete = [tuple(self.names[index] for _, index in names) for names in own]
+        self.prefixes = [tuple(names) for names in prefixes]
+        self.children = [tuple(elements) for elements in children]
+
+    def encode(self, seq: List[Hashable]) -> Sequence[int]:
+        """Code a sequence of elements (width for elements in no pattern).
+
+        Returns:
+            bytes when the codes fit in one byte, else a list of ints
+        """
+        codes = self.codes
+        other = self.width
+        coded = [codes.get(element, other) for element in seq]
+        return bytes(coded) if other < 256 else coded
+
+    def find(self, seq: List[Hashable], mode: str = MODE_LONGEST) -> List[Tuple[int, int, str]]:
+        """Find pattern occurrences in one pass over a sequence of elements.
+
+        See find_codes() for the modes and the result.
+        """
+        return self.find_codes(self.encode(seq), mode)
+
+    def find_codes(self, codes: Sequence[int], mode: str = MODE_LONGEST) -> List[Tuple[int, int, str]]:
+        """Find pattern occurrences in one pass over a coded sequence.
+
+        Args:
+            codes: Sequence coded with encode() (or a slice of one)
+            mode: MODE_LONGEST for leftmost-longest non-overlapping matches
+                (at each position the longest pattern starting there, then
+                continue after it), MODE_OVERLAPS for every occurrence
+
+        Returns:
+            (start, end, name) tuples with end exclusive, ordered by start;
+            patterns with identical sequences report the first one only in
+            MODE_LONGEST
+        """
+        if mode not in (MODE_LONGEST, MODE_OVERLAPS):
+            raise ValueError(f"Unknown match mode: {mode}")
+
+        transitions = self.transitions
+        outputs = self.outputs
+        longest = mode == MODE_LONGEST
+
+        # Longest pattern starting at each position that has one
+        # (MODE_LONGEST): start -> (length, pattern index)
+        best: Dict[int, Tuple[int, int]] = {}
+        found: List[Tuple[int, int, int]] = []
+
+        state = 0
+        end = 0
+        for code in codes:
+            state = transitions[state + code]
+            end += 1
+            ended = outputs[state]
+            if not ended:
+                continue
+            for length, index in ended:
+                start = end - length
+                if not longest:
+                    found.append((start, end, index))
+                elif length > best.get(start, (0, 0))[0]:
+                    best[start] = (length, index)
+
+        names = self.names
+        if not longest:
+            found.sort(key=lambda match: (match[0], -match[1], match[2]))
+            return [(start, end, names[index]) for start, end, index in found]
+
+        # Greedy sweep: take a start unless an earlier match covers it
+        matches = []
+        free = 0
+        for start in sorted(best):
+            if start >= free:
+                length, index = best[start]
+                free = start + length
+                matches.append((start, free, names[index]))
+        return matches
+
+    def walk(self, codes: Sequence[int]) -> int:
+        """Follow trie edges from the root until an element has none.
+
+        Returns:
+            State reached (0 is the root), for patterns_at(), prefixes_at()
+            and next_elements()
+        """
+        edges = self.edges
+        state = 0
+        for code in codes:
+            child = edges[state + code]
+            if child < 0:
+                break
+            state = child
+        return state
+
+    def patterns_at(self, state: int) -> Tuple[str, ...]:
+        """Names of the patterns that end exactly at a trie state."""
+        return self.complete[state // self.row]
+
+    def prefixes_at(self, state: int) -> Tuple[str, ...]:
+        """Names of the patterns passing through a trie state."""
+        return self.prefixes[state // self.row]
+
+    def next_elements(self, state: int) -> Tuple[Hashable, ...]:
+        """Elements that extend a trie state, in pattern order."""
+        return self.children[state // self.row]
 
 
 def build_pattern_trie(patterns: Dict[str, List[Any]]) -> Dict[str, Any]:
@@ -24,9 +248,37 @@ def build_pattern_trie(patterns: Dict[str, List[Any]]) -> Dict[str, Any]:
             node = node['children'][element]
             node['prefix_patterns'].append(name)
         node['patterns'].append(name)
+    _AUTOMATONS[id(root)] = (root, PatternAutomaton(patterns))
     return root
 
 
+def _patterns_from_trie(trie_root: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Recover the pattern sequences of a hand-built trie."""
+    patterns: Dict[str, List[Any]] = {}
+    stack = [(trie_root, [])]
+    while stack:
+        node, path = stack.pop()
+        for name in node['patterns']:
+            patterns.setdefault(name, path)
+        for element, child in reversed(list(node['children'].items())):
+            stack.append((child, path + [element]))
+    return patterns
+
+
+def get_automaton(trie_root: Dict[str, Any]) -> PatternAutomaton:
+    """Return the PatternAutomaton compiled for a trie.
+
+    Tries built by hand are compiled on first use. The automaton is not
+    recompiled if the trie is modified afterwards.
+    """
+    entry = _AUTOMATONS.get(id(trie_root))
+    if entry is None:
+        entry = _AUTOMATONS[id(trie_root)] = (
+            trie_root, PatternAutomaton(_patterns_from_trie(trie_root))
+        )
+    return entry[1]
+
+
 def match_patterns_in_sequence(seq: List[Any], trie_root: Dict[str, Any]) -> List[str]:
     """Greedy longest matching of patterns in a sequence.
 
@@ -37,23 +289,5 @@ def match_patterns_in_sequence(seq: List[Any], trie_root: Dict[str, Any]) -> Lis
     Returns:
         List of matched pattern names in order of appearance
     """
-    i = 0
-    matches = []
-    n = len(seq)
-    while i < n:
-        node = trie_root
-        last_match = None
-        last_match_pos = -1
-        j = i
-        while j < n and seq[j] in node['children']:
-            node = node['children'][seq[j]]
-            if node['patterns']:
-                last_match = node['patterns'][0]
-                last_match_pos = j
-            j += 1
-        if last_match is not None:
-            matches.append(last_match)
-            i = last_match_pos + 1
-        else:
-            i += 1
-    return matches
+    automaton = get_automaton(trie_root)
+    return [name for _, _, name in automaton.find(seq, MODE_LONGEST)]
@@ -0,0 +1,139 @@
+# scripts/bench_patterns.py
+"""
+Micro-benchmark of cognitive pattern matching for 'note stats'.
+
+Runs the stats workload (the whole note history, then every temporal
+segment) on a synthetic history of random note types with three matchers:
+
+    dict-trie   the dict-based trie walk, restarted at every position
+    automaton   PatternAutomaton.find() on lists of type strings
+    codes       PatternAutomaton.find_codes() on one bytes encoding of the
+                history, sliced per segment
+
+All matchers must return the same patterns; the script exits with status 1
+otherwise.
+
+Usage:
+    python scripts/bench_patterns.py [--notes N] [--runs N] [--seed N]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from apiscope.commands.note.constants import PATTERNS, TYPE_NAMES
+from apiscope.core.trie import build_pattern_trie, get_automaton
+
+MAX_SEGMENT = 30
+
+def dict_trie_match(seq, trie_root):
+    """Greedy longest matching by walking the dict trie from every position."""
+    i = 0
+    matches = []
+    n = len(seq)
+    while i < n:
+        node = trie_root
+        last_match = None
+        last_match_pos = -1
+        j = i
+        while j < n and seq[j] in node['children']:
+            node = node['children'][seq[j]]
+            if node['patterns']:
+                last_match = node['patterns'][0]
+                last_match_pos = j
+            j += 1
+        if last_match is not None:
+            matches.append(last_match)
+            i = last_match_pos + 1
+        else:
+            i += 1
+    return matches
+
+def generate_history(notes, seed):
+    """Random note types cut into segments of 1..MAX_SEGMENT notes."""
+    rng = random.Random(seed)
+    types = [rng.choice(list(TYPE_NAMES)) for _ in range(notes)]
+    bounds = []
+    start = 0
+    while start < notes:
+        end = min(notes, start + rng.randint(1, MAX_SEGMENT))
+        bounds.append((start, end))
+        start = end
+    return types, bounds
+
+def run_dict_trie(types, bounds, trie_root):
+    results = [dict_trie_match(types, trie_root)]
+    for start, end in bounds:
+        results.append(dict_trie_match(types[start:end], trie_root))
+    return results
+
+def run_automaton(types, bounds, automaton):
+    results = [[name for _, _, name in automaton.find(types)]]
+    for start, end in bounds:
+        results.append([name for _, _, name in automaton.find(types[start:end])])
+    return results
+
+def run_codes(types, bounds, automaton):
+    codes = automaton.encode(types)
+    results = [[name for _, _, name in automaton.find_codes(codes)]]
+    for start, end in bounds:
+        results.append([name for _, _, name in automaton.find_codes(codes[start:end])])
+    return results
+
+def time_matcher(function, runs, *args):
+    """Run a matcher repeatedly, returning (wall times in ms, last result)."""
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, result
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--notes", type=int, default=100000, help="Notes in the history")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per matcher")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    options = parser.parse_args()
+
+    print("[=] Pattern Benchmark Start")
+    types, bounds = generate_history(options.notes, options.seed)
+    print(f"[-] {options.notes} notes in {len(bounds)} segments, {len(PATTERNS)} patterns")
+
+    trie_root = build_pattern_trie(PATTERNS)
+    automaton = get_automaton(trie_root)
+    matchers = [
+        ("dict-trie", run_dict_trie, trie_root),
+        ("automaton", run_automaton, automaton),
+        ("codes", run_codes, automaton),
+    ]
+
+    reference = None
+    baseline = None
+    failed = False
+    for label, function, matcher in matchers:
+        timings, result = time_matcher(function, options.runs, types, bounds, matcher)
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"[-] {label}: best {min(timings):.1f} ms, median {median:.1f} ms "
+              f"({baseline / median:.2f}x)")
+        if reference is None:
+            reference = result
+        elif result != reference:
+            print(f"[!] {label} results differ from dict-trie")
+            failed = True
+
+    print("[=] Pattern Benchmark Complete")
+    if failed:
+        sys.exit(1)
+    print("[+] All matchers agree")
+
+if __name__ == "__main__":
+    main()
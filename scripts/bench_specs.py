@@ -0,0 +1,377 @@
+# scripts/bench_specs.py
+"""
+Benchmark search and describe on synthetic OpenAPI specifications.
+
+A deterministic generator builds OpenAPI 3 specs of a given operation count
+with deep $ref chains, a recursive schema and a large enum. For every size,
+a throwaway project is created in a temp directory and each phase runs in a
+fresh interpreter, so process-level caches never leak between measurements:
+
+    cold   parse and validate the spec text (no snapshot), build the search
+           index, time _search_endpoints() per query and
+           _extract_operation_info() throughput, record peak RSS
+    warm   load the same spec again from its snapshot
+
+Everything runs offline. Results are written as JSON and compared against
+a baseline metric by metric. Store one on the machine that runs the check
+with --update-baseline: a missing baseline, or a size it does not cover,
+fails the run like a regression does.
+
+Usage:
+    python scripts/bench_specs.py [--sizes 100,1000,10000] [--output FILE]
+                                  [--baseline FILE] [--update-baseline]
+                                  [--threshold 0.2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_SIZES = [100, 1000, 5000]
+MAX_SIZE = 50000
+SEED = 20240101
+SPEC_NAME = "synthetic"
+REF_DEPTH = 8  # Schemas chained through $ref per resource
+ENUM_SIZE = 500
+DESCRIBE_SAMPLE = 2000  # Operations described per size
+DEFAULT_THRESHOLD = 0.2  # Relative change reported as a regression
+
+NOUNS = [
+    "account", "address", "alert", "invoice", "order", "payment", "product",
+    "customer", "shipment", "warehouse", "report", "session", "token",
+    "webhook", "subscription", "coupon", "review", "ticket", "message",
+    "channel", "project", "member", "role", "policy", "device", "sensor",
+    "job", "pipeline", "artifact", "release", "dataset", "model", "metric",
+    "dashboard", "folder", "file", "comment", "label", "event", "region",
+]
+ADJECTIVES = [
+    "public", "private", "shared", "archived", "pending", "active", "legacy",
+    "internal", "external", "scheduled", "draft", "verified", "global",
+    "local", "primary", "backup", "temporary", "custom", "default", "billing",
+]
+FILLER = [
+    "returns", "the", "matching", "records", "for", "a", "given", "identifier",
+    "including", "nested", "details", "pagination", "filters", "sorting",
+    "permissions", "audit", "history", "status", "metadata", "links",
+]
+OPERATIONS = [
+    # (path suffix, method, verb)
+    ("", "get", "List"),
+    ("", "post", "Create"),
+    ("/{id}", "get", "Get"),
+    ("/{id}", "put", "Replace"),
+    ("/{id}", "patch", "Update"),
+    ("/{id}", "delete", "Delete"),
+    ("/{id}/history", "get", "History"),
+]
+QUERIES = [
+    "invoice", "list orders", "payment", "delete token", "archived report",
+    "webhook history", "customer address", "update device", "billing",
+    "get pipeline", "sensor metric", "create release", "dataset model",
+    "private channel message", "status", "nonexistent",
+]
+
+# Metrics where a larger value is better; all others are costs
+HIGHER_IS_BETTER = {"describe_ops_per_s"}
+
+def camel(*words):
+    """Join words as a CamelCase identifier."""
+    return "".join(word.capitalize() for word in words)
+
+def generate_spec(operations, seed=SEED):
+    """
+    Build a synthetic OpenAPI 3 document with the given operation count.
+
+    Every resource gets a chain of REF_DEPTH schemas linked by $ref, whose
+    last link refers to a large enum and to a recursive tree schema.
+    """
+    rng = random.Random(seed)
+    schemas = {
+        "Status": {
+            "type": "string",
+            "enum": [f"status_{i:04d}" for i in range(ENUM_SIZE)],
+        },
+        "TreeNode": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "string"},
+                "children": {
+                    "type": "array",
+                    "items": {"$ref": "#/components/schemas/TreeNode"},
+                },
+                "parent": {"$ref": "#/components/schemas/TreeNode"},
+            },
+        },
+    }
+    paths = {}
+    count = 0
+    resource = 0
+
+    while count < operations:
+        noun = NOUNS[resource % len(NOUNS)]
+        adjective = ADJECTIVES[(resource // len(NOUNS)) % len(ADJECTIVES)]
+        generation = resource // (len(NOUNS) * len(ADJECTIVES))
+        base = f"/v{generation + 1}/{adjective}-{noun}s"
+        schema_name = camel(adjective, noun, str(resource))
+
+        # $ref chain: Name -> NameLevel1 -> ... -> NameLevel<depth>
+        chain = [schema_name] + [f"{schema_name}Level{i}" for i in range(1, REF_DEPTH)]
+        for i, name in enumerate(chain):
+            properties = {
+                "id": {"type": "string", "format": "uuid"},
+                "name": {"type": "string", "description": f"Name of the {noun}"},
+                "createdAt": {"type": "string", "format": "date-time"},
+            }
+            if i + 1 < len(chain):
+                properties["details"] = {"$ref": f"#/components/schemas/{chain[i + 1]}"}
+            else:
+                properties["status"] = {"$ref": "#/components/schemas/Status"}
+                properties["tree"] = {"$ref": "#/components/schemas/TreeNode"}
+            schemas[name] = {"type": "object", "required": ["id"], "properties": properties}
+        ref = {"$ref": f"#/components/schemas/{schema_name}"}
+
+        for suffix, method, verb in OPERATIONS:
+            if count >= operations:
+                break
+            operation = {
+                "operationId": f"{verb.lower()}{schema_name}",
+                "summary": f"{verb} {adjective} {noun}",
+                "description": " ".join(rng.sample(FILLER, 8)),
+                "tags": [noun],
+                "responses": {
+                    "200": {
+                        "description": "Success",
+                        "content": {"application/json": {"schema": ref}},
+                    },
+                    "404": {"description": "Not found"},
+                },
+            }
+            if "{id}" in suffix:
+                operation["parameters"] = [{
+                    "name": "id",
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                }]
+            if method == "get" and not suffix:
+                operation["parameters"] = [
+                    {"name": "limit", "in": "query", "schema": {"type": "integer"}},
+                    {"name": "status", "in": "query",
+                     "schema": {"$ref": "#/components/schemas/Status"}},
+                ]
+            if method in ("post", "put", "patch"):
+                operation["requestBody"] = {
+                    "required": True,
+                    "content": {"application/json": {"schema": ref}},
+                }
+            paths.setdefault(base + suffix, {})[method] = operation
+            count += 1
+        resource += 1
+
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": f"Synthetic API ({operations} operations)", "version": "1.0.0"},
+        "servers": [{"url": "https://api.example.com"}],
+        "paths": paths,
+        "components": {"schemas": schemas},
+    }
+
+def create_project(directory, operations):
+    """Write a minimal apiscope project holding one synthetic spec."""
+    (directory / ".git").mkdir()
+    (directory / "spec.json").write_text(json.dumps(generate_spec(operations)))
+    (directory / "apiscope.ini").write_text(f"[specs]\n{SPEC_NAME} = ./spec.json\n")
+
+# Worker side: runs inside the throwaway project
+
+def _peak_rss_mb():
+    """Get the peak resident set size of this process in MiB."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_phase(phase):
+    """Measure one phase in this process and return its metrics."""
+    start = time.perf_counter()
+    import openapi_core  # noqa: F401  Timed separately from parsing
+    metrics = {"import_openapi_core_s": time.perf_counter() - start}
+
+    from apiscope.commands.describe import _extract_operation_info
+    from apiscope.commands.search import _search_endpoints
+    from apiscope.core.index import EndpointIndex
+    from apiscope.core.output import OutputBuilder
+    from apiscope.core.parser import open_spec
+
+    start = time.perf_counter()
+    spec = open_spec(SPEC_NAME).load()
+    metrics[f"{phase}_load_s"] = time.perf_counter() - start
+
+    if phase == "warm":
+        return metrics
+
+    start = time.perf_counter()
+    index = EndpointIndex.build(spec)
+    metrics["index_build_s"] = time.perf_counter() - start
+    metrics["operations"] = len(index)
+
+    latencies = []
+    for query in QUERIES:
+        start = time.perf_counter()
+        _search_endpoints(index, query, OutputBuilder())
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    metrics["search_median_ms"] = statistics.median(latencies)
+    metrics["search_p95_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    sample = [
+        (str(path), str(method))
+        for path, item in spec.spec.get("paths", {}).items()
+        for method in item.keys()
+    ][:DESCRIBE_SAMPLE]
+    start = time.perf_counter()
+    for path, method in sample:
+        _extract_operation_info(spec, path, method)
+    elapsed = time.perf_counter() - start
+    metrics["describe_ops_per_s"] = len(sample) / elapsed if elapsed else 0.0
+
+    metrics["peak_rss_mb"] = _peak_rss_mb()
+    return metrics
+
+# Driver side
+
+def run_worker(project, phase):
+    """Run one phase in a fresh interpreter inside the project."""
+    env = dict(os.environ)
+    env["APISCOPE_NO_DAEMON"] = "1"
+    env["APISCOPE_ROOT"] = str(project)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(Path(__file__).resolve().parent.parent), env.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--worker", phase],
+        cwd=project,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "worker failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def benchmark_size(operations):
+    """Measure all phases for one spec size."""
+    with tempfile.TemporaryDirectory(prefix="apiscope-bench-") as temp:
+        project = Path(temp)
+        start = time.perf_counter()
+        create_project(project, operations)
+        metrics = {"generate_s": time.perf_counter() - start}
+        metrics["spec_bytes"] = (project / "spec.json").stat().st_size
+        metrics.update(run_worker(project, "cold"))
+        warm = run_worker(project, "warm")
+        metrics["warm_load_s"] = warm["warm_load_s"]
+    return metrics
+
+def compare(results, baseline, threshold):
+    """Print changes against a baseline; return the number of failed checks."""
+    regressions = 0
+    for size, metrics in results.items():
+        base_metrics = baseline.get("results", {}).get(size)
+        if base_metrics is None:
+            print(f"[!] No baseline for {size} operations")
+            regressions += 1
+            continue
+        for name, value in metrics.items():
+            base = base_metrics.get(name)
+            if not isinstance(value, (int, float)) or not isinstance(base, (int, float)) or not base:
+                continue
+            if name in ("operations", "spec_bytes"):
+                continue
+            change = (value - base) / base
+            worse = -change if name in HIGHER_IS_BETTER else change
+            marker = "[!]" if worse > threshold else "[+]"
+            regressions += marker == "[!]"
+            print(f"{marker} {size} ops {name}: {base:.4g} -> {value:.4g} ({change:+.0%})")
+    return regressions
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help=f"Comma-separated operation counts (max {MAX_SIZE})")
+    parser.add_argument("--output", type=Path, default=Path("bench-results.json"),
+                        help="Where to write the results")
+    parser.add_argument("--baseline", type=Path,
+                        default=Path(__file__).with_name("bench_baseline.json"),
+                        help="Baseline results to compare against")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative change counted as a regression")
+    parser.add_argument("--worker", choices=["cold", "warm"], help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.worker:
+        print(json.dumps(run_phase(options.worker)))
+        return
+
+    sizes = [int(size) for size in options.sizes.split(",") if size.strip()]
+    if any(size < 1 or size > MAX_SIZE for size in sizes):
+        parser.error(f"sizes must be between 1 and {MAX_SIZE}")
+
+    print("[=] Spec Benchmark Start")
+    results = {}
+    failures = 0
+    for size in sizes:
+        print(f"[-] Benchmarking {size} operations")
+        try:
+            metrics = benchmark_size(size)
+        except RuntimeError as error:
+            print(f"[!] {size} operations failed: {error}")
+            failures += 1
+            continue
+        results[str(size)] = metrics
+        print(f"[+] cold {metrics['cold_load_s']:.2f} s, warm {metrics['warm_load_s']:.2f} s, "
+              f"search median {metrics['search_median_ms']:.2f} ms, "
+              f"describe {metrics['describe_ops_per_s']:.0f} ops/s, "
+              f"peak RSS {metrics['peak_rss_mb'] or 0:.0f} MB")
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": SEED,
+        "results": results,
+    }
+    options.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"[+] Results written: {options.output}")
+
+    if options.update_baseline:
+        options.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"[+] Baseline updated: {options.baseline}")
+    elif options.baseline.is_file():
+        print(f"[-] Comparing with {options.baseline}")
+        failures += compare(results, json.loads(options.baseline.read_text()), options.threshold)
+    else:
+        # Passing here would make the regression check a no-op
+        print(f"[!] No baseline at {options.baseline}; use --update-baseline to store one")
+        failures += 1
+
+    print("[=] Spec Benchmark Complete")
+    if failures:
+        print(f"[!] {failures} check(s) failed (threshold {options.threshold:.0%})")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
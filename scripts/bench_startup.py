@@ -0,0 +1,127 @@
+# scripts/bench_startup.py
+"""
+Measure CLI startup time and guard against heavy imports creeping back.
+
+Each scenario runs 'python -m apiscope.cli <args>' in a fresh interpreter
+several times and reports the best and median wall time. A second, in-process
+run checks that commands which never parse a spec do not import the parser
+stack (openapi_core, jsonschema_path, httpx). The script exits with status 1
+if such an import is found or a scenario is slower than --max-ms.
+
+Run from inside an initialized project:
+    python scripts/bench_startup.py [--runs N] [--max-ms MS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Invocations that must start without loading the parser stack
+SCENARIOS = [
+    ["--help"],
+    ["list"],
+    ["note", "readme"],
+    ["note", "--help"],
+]
+
+# Top-level modules that only spec parsing and downloading may import
+HEAVY_MODULES = ["openapi_core", "jsonschema_path", "httpx"]
+
+MARKER = "heavy-imports:"
+
+PROBE = """
+import sys
+MARKER = {marker!r}
+from apiscope.cli import cli
+try:
+    cli.main(args=sys.argv[1:], prog_name="apiscope", standalone_mode=False)
+except SystemExit:
+    pass
+heavy = sorted({{name.split(".")[0] for name in sys.modules}} & set({heavy!r}))
+sys.__stdout__.write("\\n" + MARKER + ",".join(heavy) + "\\n")
+"""
+
+def get_project_root():
+    """Get project root directory (parent of scripts/)."""
+    return Path(__file__).parent.parent
+
+def get_env():
+    """Environment for child processes: local runs, package importable."""
+    env = dict(os.environ)
+    env["APISCOPE_NO_DAEMON"] = "1"
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(get_project_root()), env.get("PYTHONPATH")])
+    )
+    return env
+
+def time_command(command, runs, env):
+    """Run a command repeatedly, returning wall times in ms."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            command,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def heavy_imports(args, env):
+    """Get the heavy modules imported while running one scenario."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(marker=MARKER, heavy=HEAVY_MODULES), *args],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith(MARKER):
+            return [name for name in line[len(MARKER):].split(",") if name]
+    raise RuntimeError(f"Probe failed: {result.stderr.strip()}")
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Runs per scenario")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="Fail if a scenario's median exceeds this")
+    options = parser.parse_args()
+
+    print("[=] Startup Benchmark Start")
+    env = get_env()
+    failed = False
+
+    # Interpreter baseline, to tell apiscope's share from Python's
+    baseline = time_command([sys.executable, "-c", "pass"], options.runs, env)
+    print(f"[-] python -c pass: best {min(baseline):.1f} ms, "
+          f"median {statistics.median(baseline):.1f} ms")
+
+    for args in SCENARIOS:
+        label = "apiscope " + " ".join(args)
+        timings = time_command(
+            [sys.executable, "-m", "apiscope.cli", *args], options.runs, env
+        )
+        median = statistics.median(timings)
+        print(f"[-] {label}: best {min(timings):.1f} ms, median {median:.1f} ms")
+
+        heavy = heavy_imports(args, env)
+        if heavy:
+            print(f"[!] {label} imports {', '.join(heavy)}")
+            failed = True
+        if options.max_ms is not None and median > options.max_ms:
+            print(f"[!] {label} is slower than {options.max_ms:.0f} ms")
+            failed = True
+
+    print("[=] Startup Benchmark Complete")
+    if failed:
+        sys.exit(1)
+    print("[+] No heavy imports on startup")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# scripts/check_daemon.py
+"""
+Check that commands forwarded to 'apiscope serve' behave like local runs.
+
+Starts a daemon for the current project, then runs 'apiscope list' under
+each output format, chosen both with --format and with APISCOPE_FORMAT,
+once through the daemon and once locally (APISCOPE_NO_DAEMON=1). The
+script exits with status 1 if any pair of outputs differs.
+
+Run from inside an initialized project:
+    python scripts/check_daemon.py
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+FORMATS = ["text", "json", "ndjson", "none"]
+COMMAND = ["list"]
+START_TIMEOUT = 10.0
+
+def get_project_root():
+    """Get project root directory (parent of scripts/)."""
+    return Path(__file__).parent.parent
+
+def get_env(**overrides):
+    """Environment for child processes, with the package importable."""
+    env = dict(os.environ)
+    env.pop("APISCOPE_NO_DAEMON", None)
+    env.pop("APISCOPE_FORMAT", None)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(get_project_root()), env.get("PYTHONPATH")])
+    )
+    env.update(overrides)
+    return env
+
+def run(args, **env):
+    """Run apiscope, returning (exit code, stdout, stderr)."""
+    result = subprocess.run(
+        [sys.executable, "-m", "apiscope.cli", *args],
+        env=get_env(**env),
+        capture_output=True,
+        text=True,
+    )
+    return result.returncode, result.stdout, result.stderr
+
+def wait_for_daemon():
+    """Wait until the daemon answers, returning whether it did."""
+    sys.path.insert(0, str(get_project_root()))
+    from apiscope.core.config import find_project_root
+    from apiscope.core.daemon import get_socket_path, request
+
+    socket_path = get_socket_path(find_project_root())
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if request(socket_path, {"control": "ping"}) is not None:
+            return True
+        time.sleep(0.1)
+    return False
+
+def main():
+    """Main execution."""
+    print("[=] Daemon Check Start")
+    daemon = subprocess.Popen(
+        [sys.executable, "-m", "apiscope.cli", "serve"],
+        env=get_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    failed = False
+    try:
+        if not wait_for_daemon():
+            print("[!] Daemon did not start")
+            sys.exit(1)
+        print("[+] Daemon started")
+
+        for output_format in FORMATS:
+            cases = [
+                (f"--format {output_format}", ["--format", output_format, *COMMAND], {}),
+                (f"APISCOPE_FORMAT={output_format}", COMMAND, {"APISCOPE_FORMAT": output_format}),
+            ]
+            for label, args, env in cases:
+                forwarded = run(args, **env)
+                local = run(args, APISCOPE_NO_DAEMON="1", **env)
+                if forwarded == local:
+                    print(f"[+] {label}: daemon output matches local run")
+                else:
+                    print(f"[!] {label}: daemon output differs from local run")
+                    failed = True
+    finally:
+        run(["serve", "--stop"])
+        try:
+            daemon.wait(timeout=START_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            daemon.kill()
+
+    print("[=] Daemon Check Complete")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()